@@ -0,0 +1,129 @@
+"""
+Answer Cache for Medical Search
+===============================
+
+In-memory cache placed in front of `search_medical_query`.
+
+- Keys are the normalized query text + routing intent + tool set.
+- TTL and LRU eviction, with separate TTLs for web and database answers.
+- Database answers are dropped as soon as PatientsDB.db changes on disk.
+"""
+
+import copy
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from db_engine import database_signature
+
+# Words that do not change the meaning of a medical question
+FILLER_WORDS = {"please", "kindly", "hey", "hi", "hello", "thanks", "thank"}
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query so trivially different phrasings share a cache entry.
+    - lowercase
+    - drop punctuation and filler words
+    - collapse whitespace
+    """
+    query_clean = re.sub(r"[^0-9a-z]+", " ", query.lower())
+    words = [word for word in query_clean.split() if word not in FILLER_WORDS]
+    return " ".join(words)
+
+
+class AnswerCache:
+    """
+    Thread-safe TTL + LRU cache for search answers.
+
+    Entries are tagged with a kind:
+    - "web": only depends on web search, expires after web_ttl
+    - "database" / "mixed": depends on the patient database, expires after
+      db_ttl or as soon as the database file changes
+    """
+
+    def __init__(self, db_path: str = None, max_entries: int = 256,
+                 web_ttl: float = 6 * 60 * 60, db_ttl: float = 10 * 60):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.web_ttl = web_ttl
+        self.db_ttl = db_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(query: str, intent: str, tools, routing_mode: str = None) -> tuple:
+        """
+        Build the cache key from the normalized query, routing intent, tool set and
+        routing mode ("fast" may answer from the rule engine where "full" runs the agent)
+        """
+        return normalize_query(query), intent, tuple(sorted(tools)), routing_mode
+
+    def _db_signature(self):
+        """
+        Fingerprint of the database files; changes whenever the DB is rewritten
+        """
+        if not self.db_path:
+            return None
+        return database_signature(self.db_path)
+
+    def get(self, key: tuple):
+        """
+        Return a copy of the cached value and its age in seconds, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                now = time.time()
+                expired = now >= entry["expires_at"]
+                stale_db = entry["db_signature"] is not None and entry["db_signature"] != self._db_signature()
+                if expired or stale_db:
+                    del self._entries[key]
+                    entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry["value"]), now - entry["created_at"]
+
+    def set(self, key: tuple, value, kind: str) -> None:
+        """
+        Store a value; kind is "web", "database" or "mixed"
+        """
+        ttl = self.web_ttl if kind == "web" else min(self.web_ttl, self.db_ttl)
+        now = time.time()
+        with self._lock:
+            self._entries[key] = {
+                "value": copy.deepcopy(value),
+                "created_at": now,
+                "expires_at": now + ttl,
+                "db_signature": None if kind == "web" else self._db_signature(),
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Drop every cached answer
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Hit/miss counters and current size
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
@@ -5,8 +5,9 @@ Flask Backend for Medical Search Interface
 Provides REST API endpoints for the medical search tools.
 """
 
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, Response, request, jsonify, render_template, stream_with_context
 from flask_cors import CORS
+import json
 import sys
 import os
 
@@ -14,7 +15,9 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # Import the search function from main.py
-from main import search_medical_query
+from main import SEARCH_DEBUG_TIMINGS, search_medical_query, stream_medical_query
+from metrics import REGISTRY
+from batch_search import DEFAULT_BATCH_CONCURRENCY, parse_query_lines, run_batch
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for frontend requests
@@ -24,6 +27,115 @@ def index():
     """Serve the main HTML page"""
     return render_template('index.html')
 
+VALID_TOOLS = ["MedicalWebSearchTool", "heart_disease_query", "cancer_query", "diabetes_query"]
+VALID_ROUTING_MODES = ["fast", "full"]
+MAX_SESSION_ID_LENGTH = 128
+MAX_BATCH_QUERIES = 1000
+
+TOOLS_INFO = [
+    {
+        'name': 'MedicalWebSearchTool',
+        'description': 'Use this tool for general medical knowledge (definitions, symptoms, cures).',
+        'type': 'web_search'
+    },
+    {
+        'name': 'heart_disease_query',
+        'description': 'Query the Heart Disease database for patient statistics and insights.',
+        'type': 'database'
+    },
+    {
+        'name': 'cancer_query',
+        'description': 'Query the Cancer database for patient statistics and insights.',
+        'type': 'database'
+    },
+    {
+        'name': 'diabetes_query',
+        'description': 'Query the Diabetes database for patient statistics and insights.',
+        'type': 'database'
+    }
+]
+
+def parse_search_request(data):
+    """
+    Validate a search payload.
+    
+    Shared by the Flask app and the ASGI app (asgi_app.py).
+    
+    Returns:
+        tuple: (search kwargs, None) when valid, or (None, (error dict, status code))
+    """
+    if not data or 'query' not in data:
+        return None, ({
+            'error': 'Query is required',
+            'status': 'error'
+        }, 400)
+    
+    query = data['query'].strip()
+    if not query:
+        return None, ({
+            'error': 'Query cannot be empty',
+            'status': 'error'
+        }, 400)
+    
+    # Get intelligent routing preference (default: True)
+    use_intelligent_routing = data.get('use_intelligent_routing', True)
+    
+    # Get selected tools (only used if intelligent routing is disabled)
+    selected_tools = data.get('tools', None)
+    
+    # Validate tools if provided and intelligent routing is disabled
+    if not use_intelligent_routing and selected_tools:
+        invalid_tools = [tool for tool in selected_tools if tool not in VALID_TOOLS]
+        if invalid_tools:
+            return None, ({
+                'error': f'Invalid tools: {", ".join(invalid_tools)}',
+                'valid_tools': VALID_TOOLS,
+                'status': 'error'
+            }, 400)
+    
+    # "fast" skips the LLM intent analysis when keyword routing is confident
+    routing_mode = data.get('routing_mode', 'fast')
+    if routing_mode not in VALID_ROUTING_MODES:
+        return None, ({
+            'error': f'Invalid routing mode: {routing_mode}',
+            'valid_routing_modes': VALID_ROUTING_MODES,
+            'status': 'error'
+        }, 400)
+    
+    # Conversation thread; requests without one are answered without history
+    session_id = data.get('session_id')
+    if session_id is not None and not (isinstance(session_id, str) and 0 < len(session_id) <= MAX_SESSION_ID_LENGTH):
+        return None, ({
+            'error': f'session_id must be a non-empty string of at most {MAX_SESSION_ID_LENGTH} characters',
+            'status': 'error'
+        }, 400)
+    
+    # Per-stage timing breakdown in the response
+    debug = data.get('debug', SEARCH_DEBUG_TIMINGS)
+    if not isinstance(debug, bool):
+        return None, ({
+            'error': 'debug must be true or false',
+            'status': 'error'
+        }, 400)
+    
+    # Run manually selected tools concurrently unless the client opts out
+    parallel = data.get('parallel', True)
+    if not isinstance(parallel, bool):
+        return None, ({
+            'error': 'parallel must be true or false',
+            'status': 'error'
+        }, 400)
+    
+    return {
+        'query': query,
+        'selected_tools': selected_tools,
+        'use_intelligent_routing': use_intelligent_routing,
+        'routing_mode': routing_mode,
+        'session_id': session_id,
+        'debug': debug,
+        'parallel': parallel,
+    }, None
+
 @app.route('/api/search', methods=['POST'])
 def search():
     """
@@ -33,44 +145,23 @@ def search():
     {
         "query": "search query string",
         "tools": ["tool1", "tool2", ...],  # optional, if not provided uses intelligent routing
-        "use_intelligent_routing": true  # optional, defaults to true
+        "use_intelligent_routing": true,  # optional, defaults to true
+        "parallel": true,  # optional, run selected tools concurrently (default: true)
+        "routing_mode": "fast",  # optional, "fast" (default) or "full"
+        "session_id": "...",  # optional, conversation thread for follow-up questions
+        "debug": false  # optional, add a per-stage "timings" breakdown to the response
     }
     """
     try:
         data = request.get_json()
-        
-        if not data or 'query' not in data:
-            return jsonify({
-                'error': 'Query is required',
-                'status': 'error'
-            }), 400
-        
-        query = data['query'].strip()
-        if not query:
-            return jsonify({
-                'error': 'Query cannot be empty',
-                'status': 'error'
-            }), 400
-        
-        # Get intelligent routing preference (default: True)
-        use_intelligent_routing = data.get('use_intelligent_routing', True)
-        
-        # Get selected tools (only used if intelligent routing is disabled)
-        selected_tools = data.get('tools', None)
-        
-        # Validate tools if provided and intelligent routing is disabled
-        valid_tools = ["MedicalWebSearchTool", "heart_disease_query", "cancer_query", "diabetes_query"]
-        if not use_intelligent_routing and selected_tools:
-            invalid_tools = [tool for tool in selected_tools if tool not in valid_tools]
-            if invalid_tools:
-                return jsonify({
-                    'error': f'Invalid tools: {", ".join(invalid_tools)}',
-                    'valid_tools': valid_tools,
-                    'status': 'error'
-                }), 400
+        params, error = parse_search_request(data)
+        if error:
+            return jsonify(error[0]), error[1]
         
         # Perform the search with intelligent routing
-        results = search_medical_query(query, selected_tools, use_intelligent_routing)
+        results = search_medical_query(params['query'], params['selected_tools'], params['use_intelligent_routing'],
+                                       parallel=params['parallel'], routing_mode=params['routing_mode'],
+                                       session_id=params['session_id'], debug=params['debug'])
         
         return jsonify({
             'data': results,
@@ -83,34 +174,135 @@ def search():
             'status': 'error'
         }), 500
 
+def format_sse(event: str, data) -> str:
+    """
+    Encode one Server-Sent Event
+    """
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+@app.route('/api/search/stream', methods=['GET', 'POST'])
+def search_stream():
+    """
+    Streaming search endpoint (Server-Sent Events)
+    
+    Accepts the same JSON payload as /api/search via POST, or query string
+    parameters via GET (for EventSource): ?query=...&use_intelligent_routing=false&tools=a,b&session_id=...&debug=true
+    
+    Events:
+        routing      the routing decision
+        tool_call    a tool the agent is calling
+        tool_result  a tool's output
+        token        a chunk of the final answer
+        final        the full response, same shape as /api/search "data"
+        error        the search failed
+    """
+    if request.method == 'GET':
+        data = {
+            'query': request.args.get('query', ''),
+            'use_intelligent_routing': request.args.get('use_intelligent_routing', 'true').lower() != 'false',
+            'routing_mode': request.args.get('routing_mode', 'fast'),
+            'session_id': request.args.get('session_id'),
+        }
+        if request.args.get('debug'):
+            data['debug'] = request.args['debug'].lower() == 'true'
+        if request.args.get('tools'):
+            data['tools'] = request.args['tools'].split(',')
+    else:
+        data = request.get_json(silent=True)
+    
+    params, error = parse_search_request(data)
+    if error:
+        return jsonify(error[0]), error[1]
+    
+    def generate():
+        try:
+            for event, payload in stream_medical_query(params['query'], params['selected_tools'],
+                                                       params['use_intelligent_routing'],
+                                                       routing_mode=params['routing_mode'],
+                                                       session_id=params['session_id'],
+                                                       debug=params['debug']):
+                yield format_sse(event, payload)
+        except Exception as e:
+            yield format_sse('error', {'error': f'Internal server error: {str(e)}', 'status': 'error'})
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
+
+def batch_item_error(options: dict):
+    """
+    Validation error message for one batch query, or None when it is valid
+    """
+    _, error = parse_search_request(options)
+    return error[0]['error'] if error else None
+
+@app.route('/api/search/batch', methods=['POST'])
+def search_batch():
+    """
+    Batch search endpoint: many queries in one request, answered as NDJSON
+    
+    Accepts either a JSON payload:
+    {
+        "queries": ["query 1", {"query": "query 2", "tools": [...]}, ...],
+        "concurrency": 4,  # optional, queries in flight at once
+        "routing_mode": "fast",  # optional, default for every query
+        "use_intelligent_routing": true  # optional, default for every query
+    }
+    or a JSONL / plain-text body (one query per line, application/x-ndjson).
+    
+    Each line of the response is one query's result as it finishes:
+    {"index", "query", "status", "queue_seconds", "seconds", "data" | "error"},
+    followed by a final {"summary": {...}} line.
+    """
+    if request.is_json:
+        data = request.get_json(silent=True) or {}
+        items = data.get('queries')
+    else:
+        data = {}
+        items = parse_query_lines(request.get_data(as_text=True).splitlines())
+    
+    if not isinstance(items, list) or not items:
+        return jsonify({
+            'error': 'A non-empty list of queries is required',
+            'status': 'error'
+        }), 400
+    if len(items) > MAX_BATCH_QUERIES:
+        return jsonify({
+            'error': f'At most {MAX_BATCH_QUERIES} queries per batch',
+            'status': 'error'
+        }), 400
+    
+    concurrency = data.get('concurrency', DEFAULT_BATCH_CONCURRENCY)
+    if not isinstance(concurrency, int) or concurrency < 1:
+        return jsonify({
+            'error': 'concurrency must be a positive integer',
+            'status': 'error'
+        }), 400
+    
+    defaults = {key: data[key] for key in ('routing_mode', 'use_intelligent_routing') if key in data}
+    
+    def generate():
+        for record in run_batch(items, concurrency, validate=batch_item_error, **defaults):
+            yield json.dumps(record, default=str) + "\n"
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """
+    Latency histograms and LLM call / token counters in the Prometheus text format
+    """
+    return Response(REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 @app.route('/api/tools', methods=['GET'])
 def get_tools():
     """Get available tools information"""
-    tools_info = [
-        {
-            'name': 'MedicalWebSearchTool',
-            'description': 'Use this tool for general medical knowledge (definitions, symptoms, cures).',
-            'type': 'web_search'
-        },
-        {
-            'name': 'heart_disease_query',
-            'description': 'Query the Heart Disease database for patient statistics and insights.',
-            'type': 'database'
-        },
-        {
-            'name': 'cancer_query',
-            'description': 'Query the Cancer database for patient statistics and insights.',
-            'type': 'database'
-        },
-        {
-            'name': 'diabetes_query',
-            'description': 'Query the Diabetes database for patient statistics and insights.',
-            'type': 'database'
-        }
-    ]
-    
     return jsonify({
-        'tools': tools_info,
+        'tools': TOOLS_INFO,
         'status': 'success'
     })
 
@@ -0,0 +1,95 @@
+"""
+ASGI Backend for Medical Search Interface
+=========================================
+
+Async serving mode for the same REST API as app.py, built on Quart
+(the asyncio re-implementation of the Flask API).
+
+Each request is a coroutine instead of a blocking worker thread: while one
+conversation waits on the LLM or Tavily, the event loop serves the others,
+so a single process can keep hundreds of agent conversations in flight.
+
+Run with:
+    hypercorn asgi_app:app --bind 0.0.0.0:5000
+"""
+
+from quart import Quart, Response, request, jsonify, render_template
+from quart_cors import cors
+import sys
+import os
+
+# Add the current directory to Python path to import main.py
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Request validation and tool metadata are shared with the Flask app
+from app import parse_search_request, TOOLS_INFO
+from main import asearch_medical_query
+from metrics import REGISTRY
+
+app = Quart(__name__)
+app = cors(app)  # Enable CORS for frontend requests
+
+@app.route('/')
+async def index():
+    """Serve the main HTML page"""
+    return await render_template('index.html')
+
+@app.route('/api/search', methods=['POST'])
+async def search():
+    """
+    Search endpoint for medical queries with intelligent routing
+
+    Same JSON payload as the Flask /api/search endpoint. Manually selected
+    tools always run concurrently.
+    """
+    try:
+        data = await request.get_json()
+        params, error = parse_search_request(data)
+        if error:
+            return jsonify(error[0]), error[1]
+
+        results = await asearch_medical_query(params['query'], params['selected_tools'],
+                                              params['use_intelligent_routing'],
+                                              routing_mode=params['routing_mode'],
+                                              session_id=params['session_id'], debug=params['debug'])
+
+        return jsonify({
+            'data': results,
+            'status': 'success'
+        })
+
+    except Exception as e:
+        return jsonify({
+            'error': f'Internal server error: {str(e)}',
+            'status': 'error'
+        }), 500
+
+@app.route('/api/metrics', methods=['GET'])
+async def metrics():
+    """Latency histograms and LLM call / token counters in the Prometheus text format"""
+    return Response(REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/api/tools', methods=['GET'])
+async def get_tools():
+    """Get available tools information"""
+    return jsonify({
+        'tools': TOOLS_INFO,
+        'status': 'success'
+    })
+
+@app.errorhandler(404)
+async def not_found(error):
+    return jsonify({
+        'error': 'Endpoint not found',
+        'status': 'error'
+    }), 404
+
+@app.errorhandler(500)
+async def internal_error(error):
+    return jsonify({
+        'error': 'Internal server error',
+        'status': 'error'
+    }), 500
+
+if __name__ == '__main__':
+    app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,182 @@
+"""
+Batch Medical Search
+====================
+
+Answers many questions in one job (e.g. a column of a spreadsheet) instead
+of one POST to /api/search per question:
+
+- Queries run through `search_medical_query` on a bounded thread pool, so
+  they share the answer cache, the web search cache and in-flight
+  coalescing with the rest of the server
+- LLM, Tavily and SQLite calls are throttled by the shared per-backend rate
+  limiters (rate_limits.py)
+- Results are produced as they finish, one JSON object per query with its
+  timing, followed by a summary line: suitable for NDJSON streaming
+
+Served as POST /api/search/batch (app.py), or from the command line:
+
+    python batch_search.py questions.jsonl --concurrency 4 --llm-rps 2 > answers.ndjson
+    cat questions.txt | python batch_search.py - --output answers.ndjson
+
+Input is JSONL (one query string or {"query": ..., "tools": [...], ...}
+object per line) or plain text with one question per line.
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+DEFAULT_BATCH_CONCURRENCY = 4
+MAX_BATCH_CONCURRENCY = 16
+
+# Per-query options passed through to search_medical_query
+QUERY_OPTIONS = ("tools", "use_intelligent_routing", "routing_mode", "session_id")
+
+
+def parse_query_lines(lines) -> list:
+    """
+    Batch items from JSONL or plain-text lines; blank lines are skipped
+    """
+    items = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError:
+            item = line
+        if not isinstance(item, (str, dict)):
+            # e.g. a bare number on a plain-text line
+            item = line
+        items.append(item)
+    return items
+
+
+def _normalize_item(item, defaults: dict) -> dict:
+    """
+    {"query", "tools", "use_intelligent_routing", "routing_mode", "session_id"} for one batch item
+    """
+    if isinstance(item, str):
+        item = {"query": item}
+    options = dict(defaults)
+    options.update({key: item[key] for key in ("query", *QUERY_OPTIONS) if key in item})
+    return options
+
+
+def run_batch(items: list, concurrency: int = DEFAULT_BATCH_CONCURRENCY, use_cache: bool = True,
+              validate=None, **defaults):
+    """
+    Run a batch of queries and yield one record per query as it finishes, then a summary.
+
+    Args:
+        items (list): Query strings or dicts with "query" and optional QUERY_OPTIONS
+        concurrency (int): Queries in flight at once (capped at MAX_BATCH_CONCURRENCY)
+        use_cache (bool): Serve and store answers in the answer cache
+        validate (callable): Optional check of a normalized item; returns an
+            error message to reject it, or None
+        **defaults: QUERY_OPTIONS applied to items that do not set them
+
+    Yields:
+        dict: {"index", "query", "status", "queue_seconds", "seconds", "data"}
+        per query (completion order; "error" instead of "data" on failure),
+        then {"summary": {...}}
+    """
+    from main import search_medical_query
+
+    concurrency = max(1, min(int(concurrency), MAX_BATCH_CONCURRENCY))
+    batch_start = time.perf_counter()
+    counts = {"success": 0, "error": 0}
+    counts_lock = threading.Lock()
+
+    def run_one(index: int, options: dict, submitted: float) -> dict:
+        start_time = time.perf_counter()
+        record = {"index": index, "query": options.get("query"),
+                  "queue_seconds": round(start_time - submitted, 3)}
+        try:
+            if not isinstance(options.get("query"), str) or not options["query"].strip():
+                raise ValueError("Query is required")
+            error = validate(options) if validate is not None else None
+            if error is not None:
+                raise ValueError(error)
+            data = search_medical_query(
+                options["query"], options.get("tools"), options.get("use_intelligent_routing", True),
+                routing_mode=options.get("routing_mode", "fast"), use_cache=use_cache,
+                session_id=options.get("session_id"),
+            )
+            record["status"] = "error" if data.get("status") == "error" else "success"
+            record["data"] = data
+        except Exception as e:
+            record["status"] = "error"
+            record["error"] = str(e)
+        record["seconds"] = round(time.perf_counter() - start_time, 3)
+        with counts_lock:
+            counts[record["status"]] += 1
+        return record
+
+    pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="batch")
+    try:
+        submitted = time.perf_counter()
+        futures = [pool.submit(run_one, index, _normalize_item(item, defaults), submitted)
+                   for index, item in enumerate(items)]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        # A consumer that stops early (client disconnected) drops the queued queries
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    elapsed = time.perf_counter() - batch_start
+    yield {"summary": {
+        "queries": len(items),
+        "succeeded": counts["success"],
+        "failed": counts["error"],
+        "concurrency": concurrency,
+        "elapsed_seconds": round(elapsed, 3),
+        "queries_per_second": round(len(items) / elapsed, 3) if elapsed > 0 else None,
+    }}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="JSONL or plain-text file of queries, or - for stdin")
+    parser.add_argument("--output", "-o", help="NDJSON output file (default: stdout)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_BATCH_CONCURRENCY)
+    parser.add_argument("--routing-mode", choices=["fast", "full"], default="fast")
+    parser.add_argument("--no-cache", action="store_true", help="Do not use the answer cache")
+    parser.add_argument("--llm-rps", type=float, help="LLM requests per second (0 = unlimited)")
+    parser.add_argument("--web-rps", type=float, help="Tavily requests per second (0 = unlimited)")
+    parser.add_argument("--sql-rps", type=float, help="SQL agent queries per second (0 = unlimited)")
+    args = parser.parse_args()
+
+    from rate_limits import set_rate_limit
+
+    for backend, rate in (("llm", args.llm_rps), ("web_search", args.web_rps), ("sqlite", args.sql_rps)):
+        if rate is not None:
+            set_rate_limit(backend, rate)
+
+    if args.input == "-":
+        items = parse_query_lines(sys.stdin)
+    else:
+        with open(args.input, encoding="utf-8") as f:
+            items = parse_query_lines(f)
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for record in run_batch(items, args.concurrency, use_cache=not args.no_cache,
+                                routing_mode=args.routing_mode):
+            output.write(json.dumps(record, default=str) + "\n")
+            output.flush()
+            if "summary" in record:
+                summary = record["summary"]
+                print(f"✅ {summary['succeeded']}/{summary['queries']} queries answered in "
+                      f"{summary['elapsed_seconds']}s", file=sys.stderr)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
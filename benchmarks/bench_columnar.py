@@ -0,0 +1,129 @@
+"""
+Analytics Benchmark: SQLite vs Column Store
+===========================================
+
+Scales the bundled patient CSVs (data/*.csv) up by resampling their rows,
+loads each scaled table into a temporary SQLite database, then times the
+aggregate questions the DB tools answer:
+
+- count with a filter  (age > 60 AND target = 1)
+- AVG(age) GROUP BY sex
+- MAX(age)
+- COUNT(*) GROUP BY target
+
+on three backends: SQLite (shared engine, indexed as after ingestion), an
+in-memory ColumnStore, and the same store saved and memory-mapped back.
+Only the columns the questions touch are kept, so 10M rows fit in memory.
+
+Usage:
+    python benchmarks/bench_columnar.py --rows 100000 1000000 10000000
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from columnar import ColumnStore  # noqa: E402
+from db_engine import dispose_engines, get_engine  # noqa: E402
+
+TABLE = "heart_disease_patients"
+COLUMNS = ["age", "sex", "chol", "target"]
+
+# (label, SQL, column-store call)
+QUERIES = [
+    ("count where", f"SELECT COUNT(*) FROM {TABLE} WHERE age > 60 AND target = 1",
+     lambda store: store.count(TABLE, where=[("age", ">", 60), ("target", "=", 1)])),
+    ("avg group by", f"SELECT sex, AVG(age) FROM {TABLE} GROUP BY sex",
+     lambda store: store.group_aggregate(TABLE, "sex", "age", "avg")),
+    ("max", f"SELECT MAX(age) FROM {TABLE}",
+     lambda store: store.aggregate(TABLE, "age", "max")),
+    ("count group by", f"SELECT target, COUNT(*) FROM {TABLE} GROUP BY target",
+     lambda store: store.group_count(TABLE, "target")),
+]
+
+
+def write_scaled_db(db_path: str, rows: int, seed: int = 0) -> None:
+    """
+    Resample the bundled heart disease extract to `rows` rows, in chunks
+    """
+    source = pd.read_csv(os.path.join(ROOT_DIR, "data", "heart_disease_patients.csv"), usecols=COLUMNS)
+    rng = np.random.default_rng(seed)
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute(f"CREATE TABLE {TABLE} (age INTEGER, sex INTEGER, chol INTEGER, target INTEGER)")
+        with conn:
+            for start in range(0, rows, 1_000_000):
+                sample = source.iloc[rng.integers(0, len(source), min(1_000_000, rows - start))]
+                conn.executemany(
+                    f"INSERT INTO {TABLE} VALUES (?, ?, ?, ?)",
+                    zip(*(sample[column].tolist() for column in COLUMNS)),
+                )
+        # Same single-column indexes PrepareSQLFromTabularData creates
+        for column in ("age", "sex", "target"):
+            conn.execute(f"CREATE INDEX idx_{TABLE}_{column} ON {TABLE} ({column})")
+        conn.execute("ANALYZE")
+        conn.execute("PRAGMA journal_mode=WAL")
+    finally:
+        conn.close()
+
+
+def median_ms(function, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start_time) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    print("📊 Aggregate query benchmark (median ms)")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "PatientsDB.db")
+            write_scaled_db(db_path, rows)
+
+            start_time = time.perf_counter()
+            store = ColumnStore.from_sqlite(db_path, tables=[TABLE])
+            load_seconds = time.perf_counter() - start_time
+            store.save(os.path.join(tmp_dir, "columnar"))
+            start_time = time.perf_counter()
+            mapped = ColumnStore.load(os.path.join(tmp_dir, "columnar"))
+            map_seconds = time.perf_counter() - start_time
+
+            engine = get_engine(db_path)
+            print(f"\n{rows:,} rows (store build {load_seconds:.2f}s, mmap open {map_seconds * 1000:.1f} ms)")
+            print(f"{'query':<16}{'sqlite':>10}{'columnar':>10}{'mmap':>10}{'speedup':>9}")
+            with engine.connect() as conn:
+                for label, sql, columnar_query in QUERIES:
+                    expected = [tuple(row) for row in conn.exec_driver_sql(sql).fetchall()]
+                    result = columnar_query(store)
+                    rows_out = result if isinstance(result, list) else [(result,)]
+                    assert np.allclose(np.array(rows_out, dtype=float), np.array(expected, dtype=float)), label
+
+                    sqlite_ms = median_ms(lambda: conn.exec_driver_sql(sql).fetchall(), args.repeats)
+                    columnar_ms = median_ms(lambda: columnar_query(store), args.repeats)
+                    mapped_ms = median_ms(lambda: columnar_query(mapped), args.repeats)
+                    print(f"{label:<16}{sqlite_ms:>10.2f}{columnar_ms:>10.2f}{mapped_ms:>10.2f}"
+                          f"{sqlite_ms / columnar_ms:>8.1f}x")
+            del store, mapped
+            dispose_engines()
+
+
+if __name__ == "__main__":
+    main()
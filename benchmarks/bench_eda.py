@@ -0,0 +1,96 @@
+"""
+EDA Benchmark: pandas describe vs Streaming Sketches
+====================================================
+
+Builds a SQLite database with the bundled heart disease extract scaled up by
+resampling, then profiles it in a fresh interpreter per run with:
+
+- pandas:    SELECT * into a DataFrame + describe(include="all")
+- streaming: SQLiteEDA.profile_tables (chunked cursor, mergeable sketches,
+             rowid ranges in N processes)
+
+and reports wall time and peak RSS (VmHWM of the parent plus its workers).
+Streaming memory stays flat as the table grows; pandas grows with it.
+
+Usage:
+    python benchmarks/bench_eda.py --rows 1000000 5000000 --workers 1 4
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import contextlib, importlib.util, io, json, re, resource, sys, time
+sys.path.insert(0, {root!r})
+import pandas as pd, sqlite3
+def peak_rss_kb():
+    return int(re.search(r"VmHWM:\\s+(\\d+)", open("/proc/self/status").read()).group(1))
+spec = importlib.util.spec_from_file_location("eda_sqlite", {root!r} + "/src/2. Eda_sqlite.py")
+module = importlib.util.module_from_spec(spec)
+sys.modules["eda_sqlite"] = module
+spec.loader.exec_module(module)
+baseline_kb = peak_rss_kb()
+start_time = time.perf_counter()
+if {method!r} == "pandas":
+    conn = sqlite3.connect({db!r})
+    pd.read_sql("SELECT * FROM heart_disease_patients", conn).describe(include="all")
+else:
+    with contextlib.redirect_stdout(io.StringIO()):
+        eda = module.SQLiteEDA({db!r}, use_snapshots=False)
+    eda.profile_tables(["heart_disease_patients"], workers={workers})
+seconds = time.perf_counter() - start_time
+# Workers are separate processes: add their peak (ru_maxrss is KiB on Linux)
+children_kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+print(json.dumps({{"seconds": seconds, "rss_mb": (peak_rss_kb() - baseline_kb + children_kb) / 1024}}))
+"""
+
+
+def probe(db_path: str, method: str, workers: int = 1) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(root=ROOT_DIR, db=db_path, method=method, workers=workers)],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def write_db(db_path: str, rows: int, seed: int = 0) -> None:
+    source = pd.read_csv(os.path.join(ROOT_DIR, "data", "heart_disease_patients.csv"))
+    rng = np.random.default_rng(seed)
+    conn = sqlite3.connect(db_path)
+    for start in range(0, rows, 1_000_000):
+        sample = source.iloc[rng.integers(0, len(source), min(1_000_000, rows - start))]
+        sample.to_sql("heart_disease_patients", conn, index=False, if_exists="append")
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 5_000_000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count()])
+    args = parser.parse_args()
+
+    print("🔬 EDA benchmark (fresh interpreter per run)")
+    print(f"{'rows':>10}  {'method':<14}{'seconds':>10}{'peak RSS MB':>13}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "PatientsDB.db")
+            write_db(db_path, rows)
+            runs = [("pandas", probe(db_path, "pandas"))]
+            runs += [(f"streaming x{workers}", probe(db_path, "streaming", workers))
+                     for workers in sorted(set(args.workers))]
+            for label, run in runs:
+                print(f"{rows:>10,}  {label:<14}{run['seconds']:>10.2f}{run['rss_mb']:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Ingestion Benchmark: to_sql vs Streaming
+========================================
+
+Generates synthetic heart-disease-shaped CSV extracts of growing size and
+loads each one with PrepareSQLFromTabularData in both modes:
+
+- to_sql:    full DataFrame + df.to_sql(if_exists="replace")
+- streaming: typed chunks + executemany in one transaction
+
+Reports rows per second (load + index build) per file size, then the wall
+time to load a directory of many extracts with 1..N parsing processes
+(workers=N: process-pool parsing, single writer).
+
+Usage:
+    python benchmarks/bench_ingestion.py --rows 10000 100000 1000000
+    python benchmarks/bench_ingestion.py --rows --files 24 --file-rows 100000 --workers 1 2 4 8
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_prepare_module():
+    """
+    Import "src/1. Prepare_db.py" (not importable by name)
+    """
+    spec = importlib.util.spec_from_file_location("prepare_db", os.path.join(ROOT_DIR, "src", "1. Prepare_db.py"))
+    module = importlib.util.module_from_spec(spec)
+    # Registered so the process-pool worker function can be pickled by name
+    sys.modules["prepare_db"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def write_extract(path: str, rows: int, seed: int = 0):
+    """
+    Write a synthetic patient extract with heart_disease_patients' columns
+    """
+    rng = np.random.default_rng(seed)
+    pd.DataFrame({
+        "Age": rng.integers(20, 81, rows),
+        "Sex": rng.integers(0, 2, rows),
+        "Chest Pain": rng.integers(0, 4, rows),
+        "Resting BP": rng.integers(90, 200, rows),
+        "Cholesterol": rng.integers(120, 560, rows),
+        "Max Heart Rate": rng.integers(70, 210, rows),
+        "Old Peak": rng.random(rows).round(1) * 6,
+        "Target": rng.integers(0, 2, rows),
+    }).to_csv(path, index=False)
+
+
+def time_load(prepare_module, files_dir: str, work_dir: str, streaming: bool, workers: int = 1) -> float:
+    os.chdir(work_dir)
+    with contextlib.redirect_stdout(io.StringIO()):
+        pipeline = prepare_module.PrepareSQLFromTabularData(
+            files_dir, db_name=f"bench_{'streaming' if streaming else 'to_sql'}_{workers}.db",
+            streaming=streaming, workers=workers,
+        )
+        start_time = time.perf_counter()
+        pipeline._prepare_db()
+        elapsed = time.perf_counter() - start_time
+    pipeline.engine.dispose()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="*", default=[10_000, 100_000, 1_000_000],
+                        help="Single-file sizes for to_sql vs streaming (none to skip)")
+    parser.add_argument("--files", type=int, default=0, help="Extracts for the multi-file benchmark (0 to skip)")
+    parser.add_argument("--file-rows", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count()])
+    args = parser.parse_args()
+
+    prepare_module = load_prepare_module()
+    original_dir = os.getcwd()
+
+    try:
+        if args.rows:
+            print("📥 Ingestion benchmark (rows/s, load + indexes)")
+            print(f"{'rows':>10}{'to_sql':>14}{'streaming':>14}{'speedup':>10}")
+        for rows in args.rows:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                files_dir = os.path.join(tmp_dir, "extracts")
+                os.makedirs(files_dir)
+                write_extract(os.path.join(files_dir, "heart_disease_patients.csv"), rows)
+
+                to_sql_seconds = time_load(prepare_module, files_dir, tmp_dir, streaming=False)
+                streaming_seconds = time_load(prepare_module, files_dir, tmp_dir, streaming=True)
+                os.chdir(original_dir)
+
+            print(f"{rows:>10,}{rows / to_sql_seconds:>14,.0f}{rows / streaming_seconds:>14,.0f}"
+                  f"{to_sql_seconds / streaming_seconds:>9.1f}x")
+
+        if args.files:
+            print(f"\n🗂️  Multi-file ingestion ({args.files} extracts x {args.file_rows:,} rows, "
+                  f"{os.cpu_count()} cores)")
+            print(f"{'workers':>8}{'wall s':>10}{'rows/s':>14}{'speedup':>10}")
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                files_dir = os.path.join(tmp_dir, "extracts")
+                os.makedirs(files_dir)
+                for i in range(args.files):
+                    write_extract(os.path.join(files_dir, f"extract_{i:03d}.csv"), args.file_rows, seed=i)
+
+                baseline = None
+                for workers in sorted(set(args.workers)):
+                    seconds = time_load(prepare_module, files_dir, tmp_dir, streaming=True, workers=workers)
+                    os.chdir(original_dir)
+                    baseline = baseline or seconds
+                    total_rows = args.files * args.file_rows
+                    print(f"{workers:>8}{seconds:>10.2f}{total_rows / seconds:>14,.0f}{baseline / seconds:>9.1f}x")
+    finally:
+        os.chdir(original_dir)
+
+
+if __name__ == "__main__":
+    main()
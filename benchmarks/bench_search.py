@@ -0,0 +1,243 @@
+"""
+Search Benchmark: Offline End-to-End Latency
+============================================
+
+Drives the real search stack with the stub LLM and web search from
+stubs.py (configurable latency, no network) at three layers:
+
+- agent:  MedicalRoutingAgent.route_and_execute
+- search: search_medical_query (answer cache, coalescing, manual fan-out)
+- flask:  POST /api/search through the Flask test client
+
+for each query type:
+
+- web:      definitions and symptoms, answered by the web search tool
+- stats:    templated statistics the rule engine answers in fast mode
+- database: questions that need an SQL agent
+- manual:   all four tools selected by hand (search and flask only)
+
+and reports p50/p95/p99 latency, throughput and LLM / web search calls per
+query. Queries are distinct so the answer cache does not short-circuit them
+(stats queries cycle through their 24 phrasings).
+
+`--json results.json` saves the report; `--baseline results.json` compares
+a run against a saved one and exits non-zero when p95 latency or LLM calls
+per query regress, so the suite can gate changes without API keys.
+
+Usage:
+    python benchmarks/bench_search.py --requests 50 --concurrency 8 --llm-latency 0.05
+    python benchmarks/bench_search.py --json baseline.json
+    python benchmarks/bench_search.py --baseline baseline.json --tolerance 0.25
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from stubs import install_stubs, STUB_CALLS
+
+LAYERS = ("agent", "search", "flask")
+
+# Rule-engine templates only match whole questions, so stats queries are made
+# distinct by phrasing rather than by a request suffix
+STATS_QUERIES = tuple(
+    template.format(disease=disease)
+    for template in ("How many {disease} patients are there?", "How many {disease} patients do we have?",
+                     "What is the total number of {disease} patients?", "What is the average age of {disease} patients?",
+                     "What is the maximum age of {disease} patients?", "What is the minimum age of {disease} patients?",
+                     "Show me the youngest age of {disease} patients", "Show me the oldest age of {disease} patients")
+    for disease in ("heart disease", "cancer", "diabetes")
+)
+
+QUERY_TYPES = {
+    "web": ("What are the symptoms of diabetes?", "What causes heart disease?", "How is cancer treated?"),
+    "stats": STATS_QUERIES,
+    "database": ("Which age group has the most heart disease cases in the records?",
+                 "List cancer patients grouped by smoking history from the records",
+                 "Compare glucose levels of diabetes patients in the records"),
+    "manual": ("Summarize the patient records",),
+}
+
+MANUAL_TOOLS = ["MedicalWebSearchTool", "heart_disease_query", "cancer_query", "diabetes_query"]
+
+LLM_CALL_KINDS = ("llm_analysis", "llm_routing_agent", "llm_sql_agent")
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list
+    """
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))]
+
+
+def make_query(query_type: str, index: int) -> str:
+    templates = QUERY_TYPES[query_type]
+    if query_type == "stats":
+        return templates[index % len(templates)]
+    return f"{templates[index % len(templates)]} (request {index})"
+
+
+def _succeeded(result: dict) -> bool:
+    if result.get("status", "success") != "success":
+        return False
+    return all(item.get("status") == "success" for item in result.get("results", []))
+
+
+def make_runner(layer: str, query_type: str, routing_mode: str, use_cache: bool):
+    """
+    Function running one query at the given layer; returns True on success
+    """
+    import main as medical_main
+
+    manual = query_type == "manual"
+
+    if layer == "agent":
+        agent = medical_main.intelligent_medical_agent
+        return lambda query: _succeeded(agent.route_and_execute(query, routing_mode=routing_mode))
+
+    if layer == "search":
+        return lambda query: _succeeded(medical_main.search_medical_query(
+            query, MANUAL_TOOLS if manual else None, not manual,
+            routing_mode=routing_mode, use_cache=use_cache))
+
+    from app import app
+
+    local = threading.local()
+
+    def run_flask(query: str) -> bool:
+        if not hasattr(local, "client"):
+            local.client = app.test_client()
+        payload = {"query": query, "routing_mode": routing_mode}
+        if manual:
+            payload.update({"use_intelligent_routing": False, "tools": MANUAL_TOOLS})
+        response = local.client.post("/api/search", json=payload)
+        body = response.get_json() or {}
+        return response.status_code == 200 and body.get("status") == "success" and _succeeded(body["data"])
+
+    return run_flask
+
+
+def run_cell(run, query_type: str, requests: int, concurrency: int, offset: int) -> dict:
+    """
+    Run `requests` distinct queries with at most `concurrency` in flight
+    """
+    def one(index: int):
+        start_time = time.perf_counter()
+        try:
+            ok = run(make_query(query_type, offset + index))
+        except Exception:
+            ok = False
+        return ok, time.perf_counter() - start_time
+
+    STUB_CALLS.reset()
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(one, range(requests)))
+    wall_seconds = time.perf_counter() - wall_start
+    calls = STUB_CALLS.snapshot()
+
+    latencies = sorted(seconds for _, seconds in outcomes)
+    llm_calls = sum(calls.get(kind, 0) for kind in LLM_CALL_KINDS)
+    return {
+        "requests": requests,
+        "errors": sum(1 for ok, _ in outcomes if not ok),
+        "throughput": requests / wall_seconds,
+        "p50": percentile(latencies, 0.50),
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99),
+        "llm_calls_per_query": llm_calls / requests,
+        "web_searches_per_query": calls.get("web_search", 0) / requests,
+        "calls": calls,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_delta: float = 0.01) -> list:
+    """
+    Regressions of p95 latency (beyond tolerance and min_delta seconds) or LLM calls per query
+    against a saved run
+    """
+    regressions = []
+    for key, cell in results.items():
+        before = baseline.get(key)
+        if before is None:
+            continue
+        # Sub-millisecond cells (rule engine) would otherwise flag scheduler noise
+        if cell["p95"] > max(before["p95"] * (1 + tolerance), before["p95"] + min_delta):
+            regressions.append(f"{key}: p95 {before['p95']:.3f}s -> {cell['p95']:.3f}s")
+        if cell["llm_calls_per_query"] > before["llm_calls_per_query"] + 1e-9:
+            regressions.append(f"{key}: LLM calls/query {before['llm_calls_per_query']:.2f} -> "
+                               f"{cell['llm_calls_per_query']:.2f}")
+        if cell["errors"] > before["errors"]:
+            regressions.append(f"{key}: errors {before['errors']} -> {cell['errors']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--layers", nargs="+", choices=LAYERS, default=list(LAYERS))
+    parser.add_argument("--query-types", nargs="+", choices=list(QUERY_TYPES), default=list(QUERY_TYPES))
+    parser.add_argument("--requests", type=int, default=30, help="Queries per layer and query type")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--llm-latency", type=float, default=0.05)
+    parser.add_argument("--search-latency", type=float, default=0.05)
+    parser.add_argument("--routing-mode", choices=["fast", "full"], default="fast")
+    parser.add_argument("--use-cache", action="store_true", help="Keep the answer cache on (queries are still distinct)")
+    parser.add_argument("--json", help="Write the results to this file")
+    parser.add_argument("--baseline", help="Compare against results saved with --json")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p95 slowdown vs the baseline")
+    parser.add_argument("--min-delta", type=float, default=0.01, help="Smallest p95 slowdown in seconds to report")
+    args = parser.parse_args()
+
+    install_stubs(llm_latency=args.llm_latency, search_latency=args.search_latency)
+
+    print(f"🏁 Search benchmark: routing_mode={args.routing_mode}, llm_latency={args.llm_latency}s, "
+          f"search_latency={args.search_latency}s, concurrency={args.concurrency}, requests={args.requests}")
+    print(f"{'layer':<8}{'type':<10}{'reqs':>6}{'errors':>8}{'req/s':>9}{'p50 s':>8}{'p95 s':>8}"
+          f"{'p99 s':>8}{'llm/q':>7}{'web/q':>7}")
+
+    results = {}
+    offset = 0
+    for layer in args.layers:
+        for query_type in args.query_types:
+            if layer == "agent" and query_type == "manual":
+                continue
+            run = make_runner(layer, query_type, args.routing_mode, args.use_cache)
+            # Build the lazily created components outside the measurement
+            run(make_query(query_type, offset))
+            offset += 1
+            cell = run_cell(run, query_type, args.requests, args.concurrency, offset)
+            offset += args.requests
+            results[f"{layer}/{query_type}"] = cell
+            print(f"{layer:<8}{query_type:<10}{cell['requests']:>6}{cell['errors']:>8}{cell['throughput']:>9.1f}"
+                  f"{cell['p50']:>8.3f}{cell['p95']:>8.3f}{cell['p99']:>8.3f}"
+                  f"{cell['llm_calls_per_query']:>7.2f}{cell['web_searches_per_query']:>7.2f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"settings": vars(args), "results": results}, f, indent=2)
+        print(f"\n💾 Results written to {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance, args.min_delta)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"\n✅ No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Snapshot Benchmark: Cold Load Time and Resident Memory
+======================================================
+
+Scales the bundled heart disease extract up by resampling, writes it as a CSV,
+a SQLite table and a columnar snapshot, then measures in fresh interpreters
+(cold process, warm OS page cache) what it costs to answer:
+
+- max age:   one column (the get_maximum_age question)
+- full load: every column (the SQLiteEDA.basic_statistics workload)
+
+with pd.read_csv, pd.read_sql and the memory-mapped snapshot. Reported memory
+is the peak RSS (VmHWM) increase over an interpreter that has only imported
+pandas; mapped snapshot pages count only once they are touched.
+
+Usage:
+    python benchmarks/bench_snapshot.py --rows 100000 1000000 5000000
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from snapshot import snapshot_from_file  # noqa: E402
+
+PROBE = """
+import json, re, sys, time
+sys.path.insert(0, {root!r})
+import numpy as np, pandas as pd, sqlite3
+from snapshot import Snapshot
+def peak_rss_kb():
+    return int(re.search(r"VmHWM:\\s+(\\d+)", open("/proc/self/status").read()).group(1))
+baseline_kb = peak_rss_kb()
+start_time = time.perf_counter()
+method, workload = {method!r}, {workload!r}
+if method == "read_csv":
+    df = pd.read_csv({csv!r})
+    result = df["age"].max() if workload == "max_age" else df.describe()
+elif method == "read_sql":
+    conn = sqlite3.connect({db!r})
+    df = pd.read_sql("SELECT * FROM heart_disease_patients", conn)
+    result = df["age"].max() if workload == "max_age" else df.describe()
+else:
+    snapshot = Snapshot({snap!r})
+    result = snapshot.column("age").max() if workload == "max_age" else snapshot.to_frame().describe()
+seconds = time.perf_counter() - start_time
+peak_kb = peak_rss_kb()
+print(json.dumps({{"seconds": seconds, "rss_mb": (peak_kb - baseline_kb) / 1024}}))
+"""
+
+
+def probe(paths: dict, method: str, workload: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(root=ROOT_DIR, method=method, workload=workload, **paths)],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def write_sources(tmp_dir: str, rows: int, seed: int = 0) -> dict:
+    source = pd.read_csv(os.path.join(ROOT_DIR, "data", "heart_disease_patients.csv"))
+    df = source.iloc[np.random.default_rng(seed).integers(0, len(source), rows)].reset_index(drop=True)
+    paths = {
+        "csv": os.path.join(tmp_dir, "heart_disease_patients.csv"),
+        "db": os.path.join(tmp_dir, "PatientsDB.db"),
+        "snap": os.path.join(tmp_dir, "heart_disease_patients.snap"),
+    }
+    df.to_csv(paths["csv"], index=False)
+    conn = sqlite3.connect(paths["db"])
+    df.to_sql("heart_disease_patients", conn, index=False, chunksize=100_000)
+    conn.close()
+    snapshot_from_file(paths["csv"], paths["snap"])
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000, 5_000_000])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    print("🗜️  Snapshot benchmark (fresh interpreter per run, median)")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths = write_sources(tmp_dir, rows)
+            sizes = {name: os.path.getsize(path) / 2**20 for name, path in paths.items()}
+            print(f"\n{rows:,} rows (csv {sizes['csv']:.1f} MB, sqlite {sizes['db']:.1f} MB, "
+                  f"snapshot {sizes['snap']:.1f} MB)")
+            print(f"{'workload':<11}{'method':<10}{'seconds':>10}{'peak RSS MB':>13}")
+            for workload in ("max_age", "full_load"):
+                for method in ("read_csv", "read_sql", "snapshot"):
+                    runs = [probe(paths, method, workload) for _ in range(args.repeats)]
+                    seconds = statistics.median(run["seconds"] for run in runs)
+                    rss_mb = statistics.median(run["rss_mb"] for run in runs)
+                    print(f"{workload:<11}{method:<10}{seconds:>10.3f}{rss_mb:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
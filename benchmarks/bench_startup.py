@@ -0,0 +1,73 @@
+"""
+Startup Benchmark: `import main`
+================================
+
+Measures worker startup cost in fresh interpreters:
+
+- lazy:  `import main` as it is now (components are built on first use)
+- eager: `import main` followed by `components.build_all()`, i.e. the work
+  the module used to do at import time (LLM client, three SQL agents with
+  schema reflection, Tavily tool, ReAct agents)
+
+It also reports what each component costs on its first use.
+
+Usage:
+    python benchmarks/bench_startup.py --repeats 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+start_time = time.perf_counter()
+import main
+import_seconds = time.perf_counter() - start_time
+build_times = {{}}
+if {eager}:
+    build_times = main.components.build_all()
+print(json.dumps({{"import": import_seconds, "total": time.perf_counter() - start_time, "build_times": build_times}}))
+"""
+
+
+def probe(eager: bool) -> dict:
+    """
+    Import main in a fresh interpreter and return its timings
+    """
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(root=ROOT_DIR, eager=eager)],
+        cwd=ROOT_DIR, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    lazy = [probe(eager=False) for _ in range(args.repeats)]
+    eager = [probe(eager=True) for _ in range(args.repeats)]
+
+    lazy_seconds = statistics.median(run["total"] for run in lazy)
+    eager_seconds = statistics.median(run["total"] for run in eager)
+
+    print(f"🚀 Startup benchmark ({args.repeats} fresh interpreters each, median)")
+    print(f"  eager (import + build all components): {eager_seconds:.2f}s")
+    print(f"  lazy  (import main):                   {lazy_seconds:.2f}s")
+    print(f"  speedup: {eager_seconds / lazy_seconds:.1f}x")
+    print("\n  First-use cost per component (eager runs, median):")
+    for name in eager[0]["build_times"]:
+        seconds = statistics.median(run["build_times"][name] for run in eager)
+        print(f"    {name:<28}{seconds:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
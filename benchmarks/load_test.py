@@ -0,0 +1,202 @@
+"""
+Load Test: Flask vs ASGI Serving
+================================
+
+Starts both servers in-process on local ports, with the stub LLM and web
+search from stubs.py, and fires increasing numbers of concurrent
+/api/search requests at each:
+
+- flask: app.py behind a WSGI server with a fixed pool of blocking worker
+  threads (like `gunicorn --threads N`)
+- asgi:  asgi_app.py on hypercorn, one event loop, ainvoke all the way down
+
+Every request gets a distinct query so the answer cache never short-circuits it.
+
+Usage:
+    python benchmarks/load_test.py --concurrency 10 50 200 --llm-latency 0.2 --flask-workers 8
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from stubs import install_stubs, STUB_CALLS
+
+import httpx
+from werkzeug.serving import BaseWSGIServer
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    """
+    WSGI server that handles requests on a fixed pool of worker threads
+    """
+
+    request_queue_size = 2048
+
+    def __init__(self, host: str, port: int, app, workers: int):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wsgi-worker")
+        super().__init__(host, port, app)
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._process_request_in_worker, request, client_address)
+
+    def _process_request_in_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+def start_flask_server(port: int, workers: int):
+    from app import app
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = PooledWSGIServer("127.0.0.1", port, app, workers)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.shutdown
+
+
+def start_asgi_server(port: int):
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+    from asgi_app import app
+
+    config = Config()
+    config.bind = [f"127.0.0.1:{port}"]
+    config.backlog = 2048
+    config.accesslog = None
+    loop = asyncio.new_event_loop()
+    stop_event = None
+    started = threading.Event()
+
+    def run():
+        nonlocal stop_event
+        asyncio.set_event_loop(loop)
+        stop_event = asyncio.Event()
+        started.set()
+        loop.run_until_complete(serve(app, config, shutdown_trigger=stop_event.wait))
+
+    threading.Thread(target=run, daemon=True).start()
+    started.wait()
+    return lambda: loop.call_soon_threadsafe(stop_event.set)
+
+
+async def wait_until_ready(base_url: str, timeout: float = 30.0):
+    async with httpx.AsyncClient() as client:
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            try:
+                if (await client.get(f"{base_url}/api/tools")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"Server at {base_url} did not start")
+
+
+def build_payload(mode: str, index: int) -> dict:
+    if mode == "manual":
+        return {
+            "query": f"Summarize the patient records, request {index}",
+            "use_intelligent_routing": False,
+            "tools": ["MedicalWebSearchTool", "heart_disease_query", "cancer_query", "diabetes_query"],
+        }
+    return {"query": f"What are the symptoms of diabetes? (request {index})"}
+
+
+async def run_level(base_url: str, concurrency: int, requests_per_level: int, mode: str, offset: int) -> dict:
+    """
+    Send requests_per_level requests with at most `concurrency` in flight
+    """
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(timeout=600, limits=limits) as client:
+        async def one(index: int):
+            nonlocal errors
+            async with semaphore:
+                start_time = time.perf_counter()
+                try:
+                    response = await client.post(f"{base_url}/api/search", json=build_payload(mode, offset + index))
+                    if response.status_code != 200 or response.json().get("status") != "success":
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start_time)
+
+        wall_start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests_per_level)))
+        wall_seconds = time.perf_counter() - wall_start
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": requests_per_level,
+        "errors": errors,
+        "wall_seconds": wall_seconds,
+        "throughput": requests_per_level / wall_seconds,
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(0.95 * (len(latencies) - 1))],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50, 100])
+    parser.add_argument("--requests-per-level", type=int, default=None,
+                        help="Requests per concurrency level (default: 2x the concurrency)")
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    parser.add_argument("--search-latency", type=float, default=0.3)
+    parser.add_argument("--flask-workers", type=int, default=8)
+    parser.add_argument("--mode", choices=["manual", "intelligent"], default="manual",
+                        help="manual: fan out to all four tools; intelligent: routing agent")
+    parser.add_argument("--servers", nargs="+", choices=["flask", "asgi"], default=["flask", "asgi"])
+    args = parser.parse_args()
+
+    install_stubs(llm_latency=args.llm_latency, search_latency=args.search_latency)
+    import main as medical_main
+
+    # Size the manual fan-out pool so the Flask worker count is the only bottleneck
+    medical_main._tool_executor = ThreadPoolExecutor(max_workers=args.flask_workers * 4)
+
+    servers = {
+        "flask": (5101, lambda: start_flask_server(5101, args.flask_workers)),
+        "asgi": (5102, lambda: start_asgi_server(5102)),
+    }
+
+    print(f"🏁 Load test: mode={args.mode}, llm_latency={args.llm_latency}s, "
+          f"search_latency={args.search_latency}s, flask_workers={args.flask_workers}")
+    print(f"{'server':<7}{'conc':>6}{'reqs':>6}{'errors':>8}{'req/s':>9}{'p50 s':>8}{'p95 s':>8}")
+
+    offset = 0
+    for name in args.servers:
+        port, start = servers[name]
+        stop = start()
+        base_url = f"http://127.0.0.1:{port}"
+        asyncio.run(wait_until_ready(base_url))
+        for concurrency in args.concurrency:
+            requests_per_level = args.requests_per_level or 2 * concurrency
+            STUB_CALLS.reset()
+            level = asyncio.run(run_level(base_url, concurrency, requests_per_level, args.mode, offset))
+            offset += requests_per_level
+            print(f"{name:<7}{level['concurrency']:>6}{level['requests']:>6}{level['errors']:>8}"
+                  f"{level['throughput']:>9.1f}{level['p50']:>8.2f}{level['p95']:>8.2f}")
+        stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Offline Stand-ins for the LLM and Web Search
+============================================
+
+Deterministic replacements for `ChatOpenAI` and `TavilySearch` with
+configurable latency, so benchmarks can drive the real agents, tools and
+web apps without any network access.
+
+Usage (must run before `main` is imported):
+
+    from stubs import install_stubs
+    install_stubs(llm_latency=0.2, search_latency=0.3)
+    import main
+"""
+
+import asyncio
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.tools import BaseTool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+# Simulated latency in seconds, shared by every stub instance
+STUB_LATENCY = {"llm": 0.0, "search": 0.0}
+
+
+class CallCounter:
+    """
+    Thread-safe call counter (e.g. LLM calls per kind)
+    """
+
+    def __init__(self):
+        self._counts = Counter()
+        self._lock = threading.Lock()
+
+    def add(self, kind: str) -> None:
+        with self._lock:
+            self._counts[kind] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._counts)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+STUB_CALLS = CallCounter()
+
+# Keywords the stub LLM uses to pick a tool (mirrors the routing keywords in main.py)
+WEB_WORDS = ("what is", "symptom", "cause", "treat", "cure", "prevent", "explain", "describe", "tell me about")
+DISEASE_TOOLS = (("heart", "heart_disease_query"), ("cancer", "cancer_query"), ("diabet", "diabetes_query"))
+
+
+class StubChatModel(BaseChatModel):
+    """
+    Deterministic chat model that speaks the tool-calling protocol.
+
+    - Intent-analysis prompts get a JSON routing decision.
+    - With SQL toolkit tools bound: list tables (unless the schema is in the
+      prompt) → run a COUNT query → answer.
+    - With routing tools bound: call one tool picked by keyword → answer.
+    """
+
+    # Accept the ChatOpenAI constructor arguments used in main.py
+    model_name: str = "stub-llm"
+    openai_api_key: Optional[str] = None
+    openai_api_base: Optional[str] = None
+    temperature: float = 0.0
+    tool_names: List[str] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub-chat"
+
+    def bind_tools(self, tools, **kwargs):
+        names = [convert_to_openai_tool(t)["function"]["name"] for t in tools]
+        return self.model_copy(update={"tool_names": names})
+
+    def _tool_call(self, name: str, args: dict) -> AIMessage:
+        return AIMessage(content="", tool_calls=[{"name": name, "args": args, "id": f"call_{time.perf_counter_ns()}"}])
+
+    def _called_tool(self, messages) -> str:
+        # Name of the tool that produced the trailing ToolMessage
+        for message in reversed(messages):
+            if isinstance(message, AIMessage) and message.tool_calls:
+                return message.tool_calls[-1]["name"]
+        return None
+
+    def _respond(self, messages, tool_names: list) -> AIMessage:
+        last = messages[-1]
+        question = next((str(m.content) for m in reversed(messages) if isinstance(m, HumanMessage)), "")
+        question_lower = question.lower()
+
+        if "Analyze this medical query" in question:
+            STUB_CALLS.add("llm_analysis")
+            analysed = re.search(r'Query: "(.*?)"', question, re.DOTALL)
+            analysed_lower = analysed.group(1).lower() if analysed else question_lower
+            is_web = any(word in analysed_lower for word in WEB_WORDS)
+            return AIMessage(content=json.dumps({
+                "intent": "web" if is_web else "database",
+                "confidence": 0.9,
+                "reasoning": "stub analysis",
+                "recommended_tools": ["MedicalWebSearchTool"] if is_web else ["heart_disease_query"],
+            }))
+
+        if "sql_db_query" in tool_names:
+            STUB_CALLS.add("llm_sql_agent")
+            if isinstance(last, ToolMessage) and self._called_tool(messages) == "sql_db_list_tables":
+                table_name = str(last.content).split(",")[0].strip()
+                return self._tool_call("sql_db_query", {"query": f"SELECT COUNT(*) FROM {table_name}"})
+            if isinstance(last, ToolMessage):
+                return AIMessage(content=f"The database query returned {last.content}.")
+            if "sql_db_list_tables" in tool_names:
+                return self._tool_call("sql_db_list_tables", {"tool_input": ""})
+            # Schema is already in the system prompt (cached table_info)
+            system = next((str(m.content) for m in messages if isinstance(m, SystemMessage)), "")
+            table_name = re.search(r"CREATE TABLE \"?(\w+)", system).group(1)
+            return self._tool_call("sql_db_query", {"query": f"SELECT COUNT(*) FROM {table_name}"})
+
+        STUB_CALLS.add("llm_routing_agent")
+        if isinstance(last, ToolMessage) or not tool_names:
+            evidence = str(last.content)[:120] if isinstance(last, ToolMessage) else ""
+            return AIMessage(content=f"Stub answer to '{question}'. {evidence}".strip())
+
+        tool_name = None
+        if "MedicalWebSearchTool" in tool_names and any(word in question_lower for word in WEB_WORDS):
+            tool_name = "MedicalWebSearchTool"
+        for keyword, name in DISEASE_TOOLS:
+            if tool_name is None and keyword in question_lower and name in tool_names:
+                tool_name = name
+        if tool_name is None:
+            tool_name = "MedicalWebSearchTool" if "MedicalWebSearchTool" in tool_names else tool_names[0]
+        return self._tool_call(tool_name, {"query": question})
+
+    def _bound_tool_names(self, kwargs: dict) -> list:
+        # create_react_agent uses bind_tools(); the SQL agent passes tools=[...] via bind()
+        return self.tool_names or [t["function"]["name"] for t in kwargs.get("tools", [])]
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(STUB_LATENCY["llm"])
+        message = self._respond(messages, self._bound_tool_names(kwargs))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(STUB_LATENCY["llm"])
+        message = self._respond(messages, self._bound_tool_names(kwargs))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+class StubTavilySearch(BaseTool):
+    """
+    Deterministic web search returning Tavily-shaped results
+    """
+
+    name: str = "tavily_search"
+    description: str = "Stub web search"
+    max_results: int = 5
+    topic: str = "general"
+
+    def _results(self, query: str) -> dict:
+        STUB_CALLS.add("web_search")
+        slug = re.sub(r"[^0-9a-z]+", "-", query.lower()).strip("-")
+        return {
+            "query": query,
+            "results": [
+                {
+                    "title": f"Result {i + 1} for {query}",
+                    "url": f"https://example.org/{slug}/{i + 1}",
+                    "content": f"Stub medical reference text {i + 1} about {query}.",
+                }
+                for i in range(self.max_results)
+            ],
+        }
+
+    def _run(self, query: str, **kwargs) -> dict:
+        time.sleep(STUB_LATENCY["search"])
+        return self._results(query)
+
+    async def _arun(self, query: str, **kwargs) -> dict:
+        await asyncio.sleep(STUB_LATENCY["search"])
+        return self._results(query)
+
+
+def install_stubs(llm_latency: float = 0.0, search_latency: float = 0.0) -> None:
+    """
+    Replace ChatOpenAI and TavilySearch with the stubs. Call before importing main.
+    """
+    if "main" in sys.modules:
+        raise RuntimeError("install_stubs() must run before main is imported")
+
+    import langchain_openai
+    import langchain_tavily
+
+    # Measure the stub backend itself; never write stub results to the on-disk web search cache
+    os.environ.setdefault("WEB_SEARCH_CACHE_MODE", "off")
+
+    STUB_LATENCY["llm"] = llm_latency
+    STUB_LATENCY["search"] = search_latency
+    langchain_openai.ChatOpenAI = StubChatModel
+    langchain_tavily.TavilySearch = StubTavilySearch
@@ -0,0 +1,250 @@
+"""
+Columnar Analytics Backend
+==========================
+
+Optional in-memory column store for aggregation-heavy questions over the
+patient tables. Each table is loaded once into compact NumPy arrays (one per
+column, integer columns downcast to the smallest dtype that fits) and queries
+run as vectorized filters and group-bys instead of SQLite row scans.
+
+A store can be saved as one snapshot file per table (snapshot.py) and loaded
+back with mmap, so a worker maps the data from the OS page cache instead of
+rebuilding it from SQLite.
+
+    store = ColumnStore.from_sqlite(db_path)
+    store.count("heart_disease_patients", where=[("age", ">", 60), ("target", "=", 1)])
+    store.group_aggregate("cancer_patients", by="gender", column="age", func="avg")
+
+Enable it for the rule engine and DB tools with ANALYTICS_BACKEND=columnar.
+"""
+
+import glob
+import os
+import sqlite3
+
+import numpy as np
+
+from db_engine import database_signature
+from snapshot import (SNAPSHOT_SUFFIX, Snapshot, begin_read, compact_array, read_sqlite_table, sqlite_source,
+                      write_snapshot)
+
+AGGREGATE_FUNCTIONS = ("count", "sum", "avg", "min", "max")
+
+_OPERATORS = {
+    "=": np.equal, "==": np.equal, "!=": np.not_equal,
+    "<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal,
+}
+
+
+def _group_index(keys: np.ndarray) -> tuple:
+    """
+    (sorted distinct keys, group number per row). Integer keys with a small
+    range (sex, target, outcome, ...) use an offset instead of sorting.
+    """
+    if keys.dtype.kind in "iu" and keys.size:
+        low, high = int(keys.min()), int(keys.max())
+        if high - low < 1 << 16:
+            codes = (keys - low).astype(np.intp)
+            present = np.flatnonzero(np.bincount(codes, minlength=high - low + 1))
+            remap = np.zeros(high - low + 1, dtype=np.intp)
+            remap[present] = np.arange(len(present))
+            return (present + low).astype(keys.dtype), remap[codes]
+    return np.unique(keys, return_inverse=True)
+
+
+class ColumnStore:
+    """
+    Column-oriented copy of the patient tables with vectorized query helpers.
+    """
+
+    def __init__(self, tables: dict, source_path: str = None, source_signature: tuple = None):
+        """
+        Args:
+            tables (dict): {table: {column: 1-D array}}, all columns of a table equally long
+            source_path (str): Database the data was loaded from (for staleness checks)
+            source_signature (tuple): database_signature(source_path) at load time
+        """
+        self.tables = tables
+        self.source_path = source_path
+        self.source_signature = source_signature
+
+    # --------------------------------
+    # Construction and persistence
+    # --------------------------------
+    @classmethod
+    def from_sqlite(cls, db_path: str, tables: list = None) -> "ColumnStore":
+        """
+        Load tables (default: every *_patients table) from a SQLite database
+        """
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            signature = begin_read(conn, db_path)
+            if tables is None:
+                tables = [row[0] for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE '%\\_patients' ESCAPE '\\'"
+                )]
+            loaded = {
+                table: {
+                    name: compact_array(values) if values.dtype.kind == "f" else values
+                    for name, values in read_sqlite_table(conn, table).items()
+                }
+                for table in tables
+            }
+        finally:
+            conn.close()
+        return cls(loaded, source_path=db_path, source_signature=signature)
+
+    def save(self, directory: str) -> None:
+        """
+        Write one snapshot file per table
+        """
+        for table, columns in self.tables.items():
+            write_snapshot(
+                os.path.join(directory, table + SNAPSHOT_SUFFIX), columns,
+                sqlite_source(self.source_path, table, self.source_signature) if self.source_path
+                else {"kind": "memory", "signature": None},
+            )
+
+    @classmethod
+    def load(cls, directory: str) -> "ColumnStore":
+        """
+        Map a saved store; numeric columns are zero-copy read-only views of the files
+        """
+        tables, source = {}, None
+        for path in sorted(glob.glob(os.path.join(directory, "*" + SNAPSHOT_SUFFIX))):
+            snapshot = Snapshot(path)
+            table = os.path.basename(path)[:-len(SNAPSHOT_SUFFIX)]
+            tables[table] = {name: snapshot.column(name) for name in snapshot.columns}
+            source = snapshot.source
+        if not tables:
+            raise FileNotFoundError(f"No column store snapshots in {directory}")
+        if source["kind"] != "sqlite":
+            return cls(tables)
+        return cls(
+            tables,
+            source_path=source["path"],
+            source_signature=tuple(tuple(part) if part else None for part in source["signature"]),
+        )
+
+    def is_current(self) -> bool:
+        """
+        False when the source database changed after the store was loaded
+        """
+        if self.source_path is None:
+            return True
+        return database_signature(self.source_path) == self.source_signature
+
+    # --------------------------------
+    # Queries
+    # --------------------------------
+    def has_table(self, table: str) -> bool:
+        return table in self.tables
+
+    def num_rows(self, table: str) -> int:
+        columns = self.tables[table]
+        return len(next(iter(columns.values()))) if columns else 0
+
+    def _column(self, table: str, column: str) -> np.ndarray:
+        columns = self.tables[table]
+        if column in columns:
+            return columns[column]
+        # Tolerate Age / age style differences
+        for name, values in columns.items():
+            if name.lower() == column.lower():
+                return values
+        raise KeyError(f"Unknown column '{column}' in {table}")
+
+    def _mask(self, table: str, where: list) -> np.ndarray:
+        """
+        Boolean row mask for [(column, operator, value), ...] combined with AND
+        """
+        if not where:
+            return None
+        mask = np.ones(self.num_rows(table), dtype=bool)
+        for column, operator, value in where:
+            if operator not in _OPERATORS:
+                raise ValueError(f"Unsupported operator '{operator}'")
+            mask &= _OPERATORS[operator](self._column(table, column), value)
+        return mask
+
+    def _values(self, table: str, column: str, where: list) -> np.ndarray:
+        values = self._column(table, column)
+        mask = self._mask(table, where)
+        values = values if mask is None else values[mask]
+        if values.dtype.kind == "f":
+            values = values[~np.isnan(values)]
+        return values
+
+    def count(self, table: str, where: list = None) -> int:
+        mask = self._mask(table, where)
+        return self.num_rows(table) if mask is None else int(np.count_nonzero(mask))
+
+    def aggregate(self, table: str, column: str, func: str, where: list = None):
+        """
+        count / sum / avg / min / max of a column over the matching rows (NULLs ignored)
+        """
+        if func not in AGGREGATE_FUNCTIONS:
+            raise ValueError(f"Unsupported aggregate '{func}'")
+        values = self._values(table, column, where)
+        if func == "count":
+            return int(values.size)
+        if values.size == 0:
+            return None
+        if func == "sum":
+            return values.sum(dtype=np.float64).item()
+        if func == "avg":
+            return values.mean(dtype=np.float64).item()
+        return (values.min() if func == "min" else values.max()).item()
+
+    def group_count(self, table: str, by: str, where: list = None) -> list:
+        """
+        [(value, count), ...] ordered by value, like GROUP BY ... ORDER BY value
+        """
+        keys = self._column(table, by)
+        mask = self._mask(table, where)
+        if mask is not None:
+            keys = keys[mask]
+        groups, inverse = _group_index(keys)
+        counts = np.bincount(inverse, minlength=len(groups))
+        return [(group.item(), int(count)) for group, count in zip(groups, counts)]
+
+    def group_aggregate(self, table: str, by: str, column: str, func: str, where: list = None) -> list:
+        """
+        [(group value, aggregate), ...] ordered by group value
+        """
+        if func not in AGGREGATE_FUNCTIONS:
+            raise ValueError(f"Unsupported aggregate '{func}'")
+        keys = self._column(table, by)
+        values = self._column(table, column).astype(np.float64)
+        mask = self._mask(table, where)
+        if mask is not None:
+            keys, values = keys[mask], values[mask]
+        present = ~np.isnan(values)
+        groups, inverse = _group_index(keys)
+        counts = np.bincount(inverse, weights=present, minlength=len(groups))
+        if func == "count":
+            results = counts
+        elif func in ("sum", "avg"):
+            sums = np.bincount(inverse, weights=np.where(present, values, 0.0), minlength=len(groups))
+            with np.errstate(invalid="ignore", divide="ignore"):
+                results = sums if func == "sum" else sums / counts
+        else:
+            fill = np.inf if func == "min" else -np.inf
+            results = np.full(len(groups), fill)
+            reducer = np.minimum if func == "min" else np.maximum
+            reducer.at(results, inverse[present], values[present])
+        return [
+            (group.item(), None if counts[i] == 0 else (int(results[i]) if func == "count" else results[i].item()))
+            for i, group in enumerate(groups)
+        ]
+
+    def age_statistics(self, table: str) -> dict:
+        """
+        min / max / avg age and patient count, as in the src/7 get_age_statistics tool
+        """
+        return {
+            "min_age": self.aggregate(table, "age", "min"),
+            "max_age": self.aggregate(table, "age", "max"),
+            "avg_age": self.aggregate(table, "age", "avg"),
+            "total_patients": self.num_rows(table),
+        }
@@ -0,0 +1,108 @@
+"""
+Lazy Component Registry
+=======================
+
+Named factories for the expensive objects behind the search API (LLM client,
+SQL agents, web search tool, ReAct agents). Nothing is built at import time:
+each component is constructed on first use, memoized, and shared by every
+later caller.
+
+    components = ComponentRegistry()
+
+    @components.component("llm")
+    def _build_llm():
+        return ChatOpenAI(...)
+
+    components.get("llm")   # built now, cached from here on
+
+A factory that raises is not memoized, so a broken dependency fails only the
+requests that need it and is retried on the next use.
+"""
+
+import threading
+import time
+
+
+class ComponentRegistry:
+    """
+    Build-on-first-use, thread-safe registry of named components.
+    """
+
+    def __init__(self):
+        self._factories = {}
+        self._instances = {}
+        self._build_seconds = {}
+        self._locks = {}
+        self._registry_lock = threading.Lock()
+
+    def register(self, name: str, factory) -> None:
+        """
+        Register a zero-argument factory under a name
+        """
+        with self._registry_lock:
+            if name in self._factories:
+                raise ValueError(f"Component '{name}' is already registered")
+            self._factories[name] = factory
+            self._locks[name] = threading.Lock()
+
+    def component(self, name: str):
+        """
+        Decorator form of register()
+        """
+        def decorator(factory):
+            self.register(name, factory)
+            return factory
+        return decorator
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._factories
+
+    def get(self, name: str):
+        """
+        Return the component, building it on first use
+        """
+        try:
+            return self._instances[name]
+        except KeyError:
+            pass
+        if name not in self._factories:
+            raise KeyError(f"Unknown component '{name}'")
+
+        # One lock per component: concurrent first requests build it once,
+        # while unrelated components can still be built in parallel
+        with self._locks[name]:
+            if name not in self._instances:
+                start_time = time.perf_counter()
+                instance = self._factories[name]()
+                self._build_seconds[name] = round(time.perf_counter() - start_time, 3)
+                self._instances[name] = instance
+            return self._instances[name]
+
+    def is_built(self, name: str) -> bool:
+        return name in self._instances
+
+    def build_all(self) -> dict:
+        """
+        Build every registered component (e.g. to warm a worker before it takes traffic)
+
+        Returns:
+            dict: component name → build time in seconds
+        """
+        for name in list(self._factories):
+            self.get(name)
+        return self.build_times()
+
+    def build_times(self) -> dict:
+        return dict(self._build_seconds)
+
+    def reset(self, name: str = None) -> None:
+        """
+        Drop one memoized component (or all of them) so it is rebuilt on next use
+        """
+        with self._registry_lock:
+            if name is None:
+                self._instances.clear()
+                self._build_seconds.clear()
+            else:
+                self._instances.pop(name, None)
+                self._build_seconds.pop(name, None)
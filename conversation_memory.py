@@ -0,0 +1,226 @@
+"""
+Bounded Conversation Memory
+===========================
+
+Keeps per-session agent history from growing with server uptime:
+
+- Every search runs on its own LangGraph thread: the client's session_id, or
+  a throwaway thread that is deleted when the request finishes
+- A pre-model hook keeps the current turn (the latest user message and the
+  tool calls that follow it) plus as many earlier turns as fit in
+  MEMORY_MAX_TOKENS; older turns are removed from the thread state, so the
+  prompt sent to the LLM stays flat however long a session runs
+- BoundedMemorySaver keeps only the latest checkpoint of each thread and
+  evicts threads idle for MEMORY_IDLE_SECONDS (least recently used first once
+  there are more than MEMORY_MAX_THREADS)
+"""
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+
+from langchain_core.messages import HumanMessage, RemoveMessage, SystemMessage, get_buffer_string
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+
+from output_shaping import count_tokens
+
+MEMORY_MAX_TOKENS = int(os.getenv("MEMORY_MAX_TOKENS", "2000"))
+MEMORY_IDLE_SECONDS = float(os.getenv("MEMORY_IDLE_SECONDS", "1800"))
+MEMORY_MAX_THREADS = int(os.getenv("MEMORY_MAX_THREADS", "1000"))
+
+EPHEMERAL_THREAD_PREFIX = "ephemeral-"
+
+
+# --------------------------------
+# Thread IDs
+# --------------------------------
+def session_config(session_id: str = None) -> dict:
+    """
+    LangGraph config for a search: the session's thread, or a new throwaway
+    thread when the client did not send a session_id
+    """
+    if session_id:
+        thread_id = f"session-{session_id}"
+    else:
+        thread_id = f"{EPHEMERAL_THREAD_PREFIX}{uuid.uuid4().hex}"
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def is_ephemeral(config: dict) -> bool:
+    return config["configurable"]["thread_id"].startswith(EPHEMERAL_THREAD_PREFIX)
+
+
+# --------------------------------
+# History window
+# --------------------------------
+def _message_tokens(messages: list) -> int:
+    return count_tokens(get_buffer_string(messages)) if messages else 0
+
+
+def trim_history(messages: list, max_tokens: int = MEMORY_MAX_TOKENS) -> list:
+    """
+    The messages to keep: system messages, whole earlier turns (newest first)
+    while they fit in max_tokens, and the current turn in full
+    """
+    system = [message for message in messages if isinstance(message, SystemMessage)]
+    dialogue = [message for message in messages if not isinstance(message, SystemMessage)]
+    turn_starts = [index for index, message in enumerate(dialogue) if isinstance(message, HumanMessage)]
+    if len(turn_starts) < 2:
+        return messages
+
+    # Turns are cut only at user messages, so tool calls keep their results
+    current = dialogue[turn_starts[-1]:]
+    budget = max_tokens - _message_tokens(system) - _message_tokens(current)
+    kept_start = turn_starts[-1]
+    for start, end in zip(reversed(turn_starts[:-1]), reversed(turn_starts[1:])):
+        budget -= _message_tokens(dialogue[start:end])
+        if budget < 0:
+            break
+        kept_start = start
+    return system + dialogue[kept_start:]
+
+
+def make_history_hook(max_tokens: int = MEMORY_MAX_TOKENS):
+    """
+    pre_model_hook for create_react_agent that applies trim_history to the
+    thread state (dropped turns are removed for good, not just hidden)
+    """
+
+    def trim_thread_history(state: dict) -> dict:
+        messages = state["messages"]
+        kept = trim_history(messages, max_tokens)
+        if len(kept) == len(messages):
+            return {}
+        return {"messages": [RemoveMessage(id=REMOVE_ALL_MESSAGES), *kept]}
+
+    return trim_thread_history
+
+
+# --------------------------------
+# Checkpointer
+# --------------------------------
+class BoundedMemorySaver(MemorySaver):
+    """
+    In-memory checkpointer that holds one checkpoint per thread and forgets idle threads.
+
+    Blob and write keys are indexed by thread, so pruning and deleting a thread
+    touch only that thread's entries. Threads are locked by stripe rather than
+    under one global lock; the global lock only guards the LRU bookkeeping.
+    """
+
+    def __init__(self, idle_seconds: float = MEMORY_IDLE_SECONDS, max_threads: int = MEMORY_MAX_THREADS,
+                 lock_stripes: int = 64, **kwargs):
+        super().__init__(**kwargs)
+        self.idle_seconds = idle_seconds
+        self.max_threads = max_threads
+        self._last_used = OrderedDict()
+        self._lock = threading.Lock()
+        self._stripes = [threading.RLock() for _ in range(lock_stripes)]
+        self._blob_keys = defaultdict(set)
+        self._write_keys = defaultdict(set)
+        self.evictions = 0
+
+    def _thread_lock(self, thread_id: str):
+        return self._stripes[hash(thread_id) % len(self._stripes)]
+
+    def _touch(self, thread_id: str) -> None:
+        """
+        Mark the thread as used and evict stale threads (called before taking any thread lock)
+        """
+        with self._lock:
+            self._last_used[thread_id] = time.monotonic()
+            self._last_used.move_to_end(thread_id)
+            victims = self._evict(keep=thread_id)
+        for victim in victims:
+            with self._thread_lock(victim):
+                with self._lock:
+                    # Used again since it was picked: keep it
+                    if victim in self._last_used:
+                        continue
+                    self.evictions += 1
+                self._delete_entries(victim)
+
+    def _evict(self, keep: str = None) -> list:
+        """
+        Threads idle past idle_seconds, then the least recently used over max_threads;
+        they are dropped from the LRU order here and deleted by the caller
+        """
+        cutoff = time.monotonic() - self.idle_seconds
+        victims = []
+        for thread_id, last_used in list(self._last_used.items()):
+            over_limit = len(self._last_used) > self.max_threads
+            if thread_id == keep or (last_used >= cutoff and not over_limit):
+                break
+            del self._last_used[thread_id]
+            victims.append(thread_id)
+        return victims
+
+    def _keep_latest(self, thread_id: str, checkpoint_ns: str, checkpoint: dict) -> None:
+        """
+        Forget older checkpoints, channel versions and pending writes of this thread
+        """
+        latest_id = checkpoint["id"]
+        live_versions = checkpoint["channel_versions"]
+        checkpoints = self.storage[thread_id][checkpoint_ns]
+        for checkpoint_id in [key for key in checkpoints if key != latest_id]:
+            del checkpoints[checkpoint_id]
+        blob_keys = self._blob_keys[thread_id]
+        for key in [key for key in blob_keys if key[1] == checkpoint_ns and live_versions.get(key[2]) != key[3]]:
+            blob_keys.discard(key)
+            self.blobs.pop(key, None)
+        write_keys = self._write_keys[thread_id]
+        for key in [key for key in write_keys if key[1] == checkpoint_ns and key[2] != latest_id]:
+            write_keys.discard(key)
+            self.writes.pop(key, None)
+
+    def _delete_entries(self, thread_id: str) -> None:
+        self.storage.pop(thread_id, None)
+        for key in self._blob_keys.pop(thread_id, ()):
+            self.blobs.pop(key, None)
+        for key in self._write_keys.pop(thread_id, ()):
+            self.writes.pop(key, None)
+
+    def get_tuple(self, config: dict):
+        thread_id = config["configurable"]["thread_id"]
+        self._touch(thread_id)
+        with self._thread_lock(thread_id):
+            return super().get_tuple(config)
+
+    def put(self, config: dict, checkpoint: dict, metadata: dict, new_versions: dict) -> dict:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        self._touch(thread_id)
+        with self._thread_lock(thread_id):
+            saved = super().put(config, checkpoint, metadata, new_versions)
+            self._blob_keys[thread_id].update(
+                (thread_id, checkpoint_ns, channel, version) for channel, version in new_versions.items())
+            self._keep_latest(thread_id, checkpoint_ns, checkpoint)
+            return saved
+
+    def put_writes(self, config: dict, writes, task_id: str, task_path: str = "") -> None:
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        self._touch(thread_id)
+        with self._thread_lock(thread_id):
+            super().put_writes(config, writes, task_id, task_path)
+            self._write_keys[thread_id].add(
+                (thread_id, configurable.get("checkpoint_ns", ""), configurable["checkpoint_id"]))
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._thread_lock(thread_id):
+            with self._lock:
+                self._last_used.pop(thread_id, None)
+            self._delete_entries(thread_id)
+
+    def stats(self) -> dict:
+        with self._lock:
+            threads = len(self._last_used)
+        return {
+            "threads": threads,
+            "checkpoints": sum(len(checkpoints) for namespaces in list(self.storage.values())
+                               for checkpoints in list(namespaces.values())),
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,123 @@
+"""
+Shared SQLite Engine
+====================
+
+One managed SQLAlchemy engine per database file, shared by every DB tool and
+agent (the three SQL agents, patient_statistics, the rule engine, the EDA and
+agent-tool scripts) instead of one engine or raw connection each.
+
+- Read-only URI (`file:...?mode=ro`) plus `PRAGMA query_only`: agents cannot write
+- Never writes to the file, not even pragmas that persist: the prepare step
+  (src/1. Prepare_db.py) puts the database in WAL mode when it writes it, so
+  readers never block on (or get blocked by) a rebuild
+- mmap_size / cache_size pragmas: pages are shared through the OS page cache
+  and each pooled connection keeps a warm cache between queries
+- Bounded QueuePool sized for the concurrent request threads, so parallel
+  DB queries reuse connections instead of reopening the file
+
+Usage:
+    from db_engine import get_engine, get_sql_database
+
+    with get_engine(db_path).connect() as conn:
+        rows = conn.exec_driver_sql("SELECT COUNT(*) FROM cancer_patients").fetchall()
+
+    db = get_sql_database(db_path, include_tables=["cancer_patients"])
+"""
+
+import os
+import sqlite3
+import threading
+from urllib.parse import quote
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import QueuePool
+
+# Pool sized for the shared tool executor plus streaming/ASGI requests
+POOL_SIZE = 8
+POOL_MAX_OVERFLOW = 8
+POOL_TIMEOUT = 30.0
+
+# Per-connection tuning (bytes for mmap; negative cache_size is KiB)
+SQLITE_PRAGMAS = {
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,
+    "temp_store": "MEMORY",
+}
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def _apply_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA query_only = ON")
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
+
+
+def database_signature(db_path: str) -> tuple:
+    """
+    Fingerprint of a database's files (main file and WAL); changes whenever
+    the database is written. An empty WAL counts as missing: opening a WAL
+    database (even read-only) creates one without changing any data
+    """
+    signature = []
+    for path in (db_path, db_path + "-wal"):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            signature.append(None)
+            continue
+        if path != db_path and stat.st_size == 0:
+            signature.append(None)
+        else:
+            signature.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def get_engine(db_path: str):
+    """
+    Return the shared read-only engine for a database file, creating it on first use
+    """
+    db_path = os.path.abspath(db_path)
+    engine = _engines.get(db_path)
+    if engine is not None:
+        return engine
+
+    with _engines_lock:
+        if db_path not in _engines:
+            # Percent-encode the path so "?", "#" and "%" in it do not break the URI
+            uri = f"file:{quote(db_path)}?mode=ro"
+            engine = create_engine(
+                "sqlite://",
+                creator=lambda: sqlite3.connect(uri, uri=True, check_same_thread=False),
+                poolclass=QueuePool,
+                pool_size=POOL_SIZE,
+                max_overflow=POOL_MAX_OVERFLOW,
+                pool_timeout=POOL_TIMEOUT,
+            )
+            event.listen(engine, "connect", _apply_pragmas)
+            _engines[db_path] = engine
+        return _engines[db_path]
+
+
+def get_sql_database(db_path: str, include_tables: list = None, **kwargs):
+    """
+    LangChain SQLDatabase on top of the shared engine (no engine of its own)
+    """
+    from langchain_community.utilities import SQLDatabase
+
+    return SQLDatabase(get_engine(db_path), include_tables=include_tables, **kwargs)
+
+
+def dispose_engines() -> None:
+    """
+    Close every pooled connection, e.g. after the database file was rebuilt
+    """
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
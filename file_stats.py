@@ -0,0 +1,161 @@
+"""
+File Statistics Service
+=======================
+
+Column statistics for the patient CSV/XLSX extracts behind the
+`get_maximum_age` / `get_column_statistics` tools.
+
+- Reads only the requested column: a zero-copy view of the file's columnar
+  snapshot when the ingest step has written a current one (snapshot.py,
+  shared by every process), otherwise `usecols` parsing. The tools never
+  write snapshots themselves
+- Resolves column names case-insensitively, so "age" finds `Age` in the
+  cancer/diabetes extracts and `age` in the heart disease one
+- Caches each column's sorted values keyed on (path, column) and validated
+  against the file's mtime and size: repeated questions about an unchanged
+  file never touch the disk, and an edited file is re-read
+- min / max / mean / count and any percentile come from the same cache entry
+"""
+
+import csv
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from snapshot import open_snapshot
+
+
+class FileStatsService:
+    """
+    Thread-safe LRU cache of per-column values for tabular files.
+    """
+
+    def __init__(self, max_entries: int = 64, use_snapshots: bool = True):
+        self.max_entries = max_entries
+        self.use_snapshots = use_snapshots
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _file_signature(path: str) -> tuple:
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _header(path: str) -> list:
+        """
+        Column names of a CSV (first line only) or XLSX (no rows) file
+        """
+        if path.lower().endswith((".xlsx", ".xls")):
+            import pandas as pd
+
+            return [str(name) for name in pd.read_excel(path, nrows=0).columns]
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            return next(csv.reader(f), [])
+
+    def resolve_column(self, path: str, column: str) -> str:
+        """
+        Actual column name in the file for a case/whitespace-insensitive name
+
+        Raises:
+            KeyError: when the file has no such column
+        """
+        wanted = column.strip().lower()
+        header = self._header(path)
+        for name in header:
+            if name.strip().lower() == wanted:
+                return name
+        raise KeyError(f"Column '{column}' not found in {os.path.basename(path)} (columns: {', '.join(header)})")
+
+    def _read_column(self, path: str, column: str) -> np.ndarray:
+        """
+        Sorted non-null numeric values of one column, reading only that column
+        """
+        import pandas as pd
+
+        # Snapshots are built at ingest only; a read-only tool never writes next to the file
+        snapshot = open_snapshot(path, build=False) if self.use_snapshots else None
+        if snapshot is not None:
+            try:
+                values = snapshot.column(column)
+                if snapshot.is_text(column):
+                    values = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=np.float64)
+                else:
+                    values = values.astype(np.float64)
+            finally:
+                snapshot.close()
+            return np.sort(values[~np.isnan(values)])
+
+        column = self.resolve_column(path, column)
+        if path.lower().endswith((".xlsx", ".xls")):
+            series = pd.read_excel(path, usecols=[column])[column]
+        else:
+            series = pd.read_csv(path, usecols=[column])[column]
+        values = pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64)
+        return np.sort(values[~np.isnan(values)])
+
+    def column_values(self, path: str, column: str) -> np.ndarray:
+        """
+        Cached sorted values of a column (read-only array)
+        """
+        path = os.path.abspath(path)
+        key = (path, column.strip().lower())
+        signature = self._file_signature(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry["signature"] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry["values"]
+            self.misses += 1
+
+        values = self._read_column(path, column)
+        values.setflags(write=False)
+        with self._lock:
+            self._entries[key] = {"signature": signature, "values": values}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return values
+
+    def summary(self, path: str, column: str, percentiles=(25, 50, 75)) -> dict:
+        """
+        {"count", "min", "max", "mean", "p25", ...}; statistics are None for an empty column
+        """
+        values = self.column_values(path, column)
+        stats = {"count": int(values.size)}
+        empty = values.size == 0
+        stats["min"] = None if empty else values[0].item()
+        stats["max"] = None if empty else values[-1].item()
+        stats["mean"] = None if empty else values.mean().item()
+        for q in percentiles:
+            stats[f"p{q:g}"] = None if empty else np.percentile(values, q).item()
+        return stats
+
+    def maximum(self, path: str, column: str):
+        return self.summary(path, column, percentiles=())["max"]
+
+    def minimum(self, path: str, column: str):
+        return self.summary(path, column, percentiles=())["min"]
+
+    def mean(self, path: str, column: str):
+        return self.summary(path, column, percentiles=())["mean"]
+
+    def percentile(self, path: str, column: str, q: float):
+        return self.summary(path, column, percentiles=(q,))[f"p{q:g}"]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def cache_stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# Shared by the tools in main.py
+file_stats = FileStatsService()
@@ -0,0 +1,400 @@
+"""
+Index Advisor
+=============
+
+Records the SQL the agents actually run and proposes covering indexes for
+the hot filter / group-by columns (age, sex, gender, target, outcome,
+diagnosis, ...), then measures query time before and after creating them.
+
+1. Record: with `SQL_QUERY_LOG_ENABLED=true`, `install_query_recorder()` wraps
+   `SQLDatabase.run`, so every query from the SQL agents and the src/ tool
+   scripts is appended to a JSONL log (`SQL_QUERY_LOG`, default
+   logs/sql_queries.jsonl). Entries are buffered and written in batches; the
+   log rotates at `SQL_QUERY_LOG_MAX_BYTES` keeping `SQL_QUERY_LOG_BACKUPS` files.
+2. Advise and apply:
+
+    python index_advisor.py --db src/databases/PatientsDB.db --apply
+
+Proposed index columns are ordered equality filters → range filters →
+GROUP BY → ORDER BY, followed by the remaining referenced columns so SQLite
+can answer the query from the index alone (a covering index).
+"""
+
+import argparse
+import atexit
+import json
+import os
+import re
+import sqlite3
+import statistics
+import threading
+import time
+from collections import Counter, defaultdict
+
+DEFAULT_QUERY_LOG = os.getenv(
+    "SQL_QUERY_LOG", os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs", "sql_queries.jsonl")
+)
+SQL_QUERY_LOG_ENABLED = os.getenv("SQL_QUERY_LOG_ENABLED", "false").lower() in ("1", "true", "yes")
+SQL_QUERY_LOG_MAX_BYTES = int(os.getenv("SQL_QUERY_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+SQL_QUERY_LOG_BACKUPS = int(os.getenv("SQL_QUERY_LOG_BACKUPS", "3"))
+
+# Entries are written once this many are buffered or the oldest is this old
+QUERY_LOG_BATCH = 200
+QUERY_LOG_FLUSH_SECONDS = 5.0
+
+# Wider indexes are not covering-only anyway and cost more on every write
+MAX_INDEX_COLUMNS = 5
+
+_CLAUSE_PATTERN = re.compile(r"\b(select|from|where|group\s+by|having|order\s+by|limit)\b", re.IGNORECASE)
+_IDENTIFIER_PATTERN = re.compile(r'"([^"]+)"|`([^`]+)`|\b([A-Za-z_][A-Za-z0-9_]*)\b')
+
+_recorder_lock = threading.Lock()
+_recorder_installed = False
+
+
+# --------------------------------
+# Recording
+# --------------------------------
+class QueryLogWriter:
+    """
+    Buffered JSONL appender with size-based rotation (log, log.1, ... log.N).
+    """
+
+    def __init__(self, log_path: str, max_bytes: int = SQL_QUERY_LOG_MAX_BYTES,
+                 backups: int = SQL_QUERY_LOG_BACKUPS, batch: int = QUERY_LOG_BATCH,
+                 flush_seconds: float = QUERY_LOG_FLUSH_SECONDS):
+        self.log_path = log_path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.batch = batch
+        self.flush_seconds = flush_seconds
+        self._lines = []
+        self._oldest = None
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+
+    def append(self, entry: dict) -> None:
+        line = json.dumps(entry) + "\n"
+        with self._lock:
+            if not self._lines:
+                self._oldest = time.monotonic()
+            self._lines.append(line)
+            if len(self._lines) < self.batch and time.monotonic() - self._oldest < self.flush_seconds:
+                return
+            lines, self._lines = self._lines, []
+            self._write(lines)
+
+    def flush(self) -> None:
+        with self._lock:
+            lines, self._lines = self._lines, []
+            if lines:
+                self._write(lines)
+
+    def _write(self, lines: list) -> None:
+        data = "".join(lines)
+        try:
+            size = os.path.getsize(self.log_path)
+        except OSError:
+            size = 0
+        if size and size + len(data) > self.max_bytes:
+            self._rotate()
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(data)
+
+    def _rotate(self) -> None:
+        if self.backups <= 0:
+            os.remove(self.log_path)
+            return
+        for index in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.log_path}.{index}"):
+                os.replace(f"{self.log_path}.{index}", f"{self.log_path}.{index + 1}")
+        os.replace(self.log_path, f"{self.log_path}.1")
+
+
+def install_query_recorder(log_path: str = DEFAULT_QUERY_LOG, enabled: bool = SQL_QUERY_LOG_ENABLED) -> bool:
+    """
+    Wrap SQLDatabase.run so every executed query is logged for the advisor.
+
+    Recording is off unless SQL_QUERY_LOG_ENABLED is set (or enabled=True).
+
+    Returns:
+        bool: True when recording is active
+    """
+    global _recorder_installed
+    if not enabled or not log_path:
+        return False
+
+    from langchain_community.utilities import SQLDatabase
+
+    with _recorder_lock:
+        if _recorder_installed:
+            return True
+        writer = QueryLogWriter(log_path)
+        atexit.register(writer.flush)
+        original_run = SQLDatabase.run
+
+        def recorded_run(self, command, *args, **kwargs):
+            start_time = time.perf_counter()
+            ok = False
+            try:
+                result = original_run(self, command, *args, **kwargs)
+                ok = True
+                return result
+            finally:
+                if isinstance(command, str):
+                    writer.append({
+                        "ts": time.time(),
+                        "sql": command,
+                        "seconds": round(time.perf_counter() - start_time, 6),
+                        "ok": ok,
+                    })
+
+        SQLDatabase.run = recorded_run
+        _recorder_installed = True
+        return True
+
+
+def load_query_log(log_path: str = DEFAULT_QUERY_LOG, backups: int = SQL_QUERY_LOG_BACKUPS) -> list:
+    """
+    Read the successful SELECT statements from a query log and its rotated files, oldest first.
+    """
+    paths = [f"{log_path}.{index}" for index in range(backups, 0, -1)] + [log_path]
+    queries = []
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if entry.get("ok") and entry["sql"].lstrip().lower().startswith(("select", "with")):
+                    queries.append(entry["sql"])
+    return queries
+
+
+# --------------------------------
+# Query analysis
+# --------------------------------
+def _split_clauses(sql: str) -> dict:
+    """
+    Split a statement into its clauses: {"select": ..., "where": ..., "group by": ...}
+    """
+    clauses = defaultdict(str)
+    parts = _CLAUSE_PATTERN.split(sql)
+    for keyword, body in zip(parts[1::2], parts[2::2]):
+        clauses[re.sub(r"\s+", " ", keyword.lower())] += " " + body
+    return clauses
+
+
+def _referenced(text: str, columns: dict) -> list:
+    """
+    Known columns referenced in a clause, in order of first appearance
+    """
+    found = []
+    for match in _IDENTIFIER_PATTERN.finditer(text):
+        name = columns.get(next(group for group in match.groups() if group).lower())
+        if name and name not in found:
+            found.append(name)
+    return found
+
+
+class IndexAdvisor:
+    """
+    Propose, create and evaluate covering indexes from observed queries.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+
+    def _connect(self, read_only: bool = True):
+        if read_only:
+            return sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+        return sqlite3.connect(self.db_path)
+
+    def table_columns(self) -> dict:
+        """
+        {table: {lowercase column: column}} for every table in the database
+        """
+        conn = self._connect()
+        try:
+            tables = [row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+            )]
+            return {
+                table: {row[1].lower(): row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')}
+                for table in tables
+            }
+        finally:
+            conn.close()
+
+    def existing_indexes(self) -> dict:
+        """
+        {table: [index column tuples]}
+        """
+        conn = self._connect()
+        try:
+            indexes = defaultdict(list)
+            for table, index_name in conn.execute(
+                "SELECT tbl_name, name FROM sqlite_master WHERE type = 'index'"
+            ).fetchall():
+                columns = tuple(row[2] for row in conn.execute(f'PRAGMA index_info("{index_name}")'))
+                indexes[table].append(columns)
+            return dict(indexes)
+        finally:
+            conn.close()
+
+    def index_for(self, sql: str, table_columns: dict) -> tuple:
+        """
+        Best covering index for one query.
+
+        Returns:
+            tuple: (table, column tuple) or None when the query touches no
+            known column of a single known table
+        """
+        clauses = _split_clauses(sql)
+        from_tables = [
+            table for table in table_columns
+            if re.search(rf'\b{re.escape(table)}\b', clauses.get("from", ""), re.IGNORECASE)
+        ]
+        if len(from_tables) != 1:
+            return None
+        table = from_tables[0]
+        columns = table_columns[table]
+
+        where = clauses.get("where", "")
+        equality = [
+            col for col in _referenced(where, columns)
+            if re.search(rf'"?\b{re.escape(col)}\b"?\s*(?:=|\bIN\b|\bIS\b)', where, re.IGNORECASE)
+        ]
+        ordered = list(equality)
+        for clause in ("where", "group by", "order by", "select", "having"):
+            for col in _referenced(clauses.get(clause, ""), columns):
+                if col not in ordered:
+                    ordered.append(col)
+        lookup = _referenced(" ".join((where, clauses.get("group by", ""), clauses.get("order by", ""))), columns)
+        key_columns = [col for col in ordered if col in lookup]
+        if not key_columns:
+            return None
+        # Covering when it fits, otherwise just the lookup/grouping columns
+        chosen = ordered if len(ordered) <= MAX_INDEX_COLUMNS else key_columns[:MAX_INDEX_COLUMNS]
+        return table, tuple(chosen)
+
+    def propose(self, queries: list, top: int = 5) -> list:
+        """
+        Rank candidate indexes by how many observed queries they serve.
+
+        Returns:
+            list: [{"table", "columns", "hits", "sql", "example"}] most used first,
+            minus candidates already served by an existing (or larger proposed) index
+        """
+        table_columns = self.table_columns()
+        hits = Counter()
+        examples = {}
+        for sql in queries:
+            candidate = self.index_for(sql, table_columns)
+            if candidate:
+                hits[candidate] += 1
+                examples.setdefault(candidate, sql)
+
+        existing = self.existing_indexes()
+        proposals = []
+        for (table, columns), count in hits.most_common():
+            served = [
+                index for index in existing.get(table, []) + [p["columns"] for p in proposals if p["table"] == table]
+                if tuple(index[:len(columns)]) == columns
+            ]
+            if served:
+                continue
+            index_name = f"idx_advisor_{table}_{'_'.join(columns)}"
+            column_list = ", ".join(f'"{col}"' for col in columns)
+            proposals.append({
+                "table": table,
+                "columns": columns,
+                "hits": count,
+                "sql": f'CREATE INDEX IF NOT EXISTS "{index_name}" ON "{table}" ({column_list})',
+                "example": examples[(table, columns)],
+            })
+            if len(proposals) == top:
+                break
+        return proposals
+
+    def apply(self, proposals: list) -> None:
+        """
+        Create the proposed indexes and refresh the planner statistics
+        """
+        conn = self._connect(read_only=False)
+        try:
+            with conn:
+                for proposal in proposals:
+                    conn.execute(proposal["sql"])
+                for table in {proposal["table"] for proposal in proposals}:
+                    conn.execute(f'ANALYZE "{table}"')
+        finally:
+            conn.close()
+
+    def time_queries(self, queries: list, repeats: int = 5) -> dict:
+        """
+        Median wall time in milliseconds per distinct query
+        """
+        conn = self._connect()
+        try:
+            timings = {}
+            for sql in dict.fromkeys(queries):
+                samples = []
+                for _ in range(repeats):
+                    start_time = time.perf_counter()
+                    conn.execute(sql).fetchall()
+                    samples.append((time.perf_counter() - start_time) * 1000)
+                timings[sql] = statistics.median(samples)
+            return timings
+        finally:
+            conn.close()
+
+    def query_plan(self, sql: str) -> str:
+        conn = self._connect()
+        try:
+            return "; ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"))
+        finally:
+            conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Propose covering indexes from the recorded agent SQL")
+    parser.add_argument("--db", required=True, help="SQLite database path")
+    parser.add_argument("--log", default=DEFAULT_QUERY_LOG, help="JSONL query log")
+    parser.add_argument("--top", type=int, default=5, help="Maximum indexes to propose")
+    parser.add_argument("--apply", action="store_true", help="Create the proposed indexes")
+    parser.add_argument("--repeats", type=int, default=5, help="Timing repeats per query")
+    args = parser.parse_args()
+
+    queries = load_query_log(args.log)
+    print(f"🔎 {len(queries)} recorded queries ({len(set(queries))} distinct) from {args.log}")
+    advisor = IndexAdvisor(args.db)
+    proposals = advisor.propose(queries, top=args.top)
+    if not proposals:
+        print("✅ No new indexes needed")
+        return
+
+    for proposal in proposals:
+        print(f"💡 {proposal['sql']}  -- serves {proposal['hits']} queries")
+
+    distinct = list(dict.fromkeys(queries))
+    before = advisor.time_queries(distinct, args.repeats)
+    if not args.apply:
+        print("\n(dry run: pass --apply to create the indexes and measure the change)")
+        return
+
+    advisor.apply(proposals)
+    after = advisor.time_queries(distinct, args.repeats)
+    print(f"\n{'before ms':>10}{'after ms':>10}{'speedup':>9}  query")
+    for sql in distinct:
+        speedup = before[sql] / after[sql] if after[sql] else float("inf")
+        print(f"{before[sql]:>10.3f}{after[sql]:>10.3f}{speedup:>8.1f}x  {' '.join(sql.split())[:80]}")
+        print(f"{'':>29}plan: {advisor.query_plan(sql)}")
+    print(f"\n⏱️  Total: {sum(before.values()):.2f} ms → {sum(after.values()):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
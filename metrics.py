@@ -0,0 +1,382 @@
+"""
+Latency and Token Metrics
+=========================
+
+Times every stage of a search and exposes the numbers in the Prometheus
+text format (served at /api/metrics), without a Prometheus client
+dependency:
+
+- Stages timed explicitly with `stage(...)`: the whole request, intent
+  analysis, the routing agent's ReAct loop, the rule engine
+- Every LangChain LLM call and tool call in the process (including the SQL
+  agents' iterations, sql_db_query executions and the Tavily call behind the
+  web search cache) via a callback handler registered as a configure hook,
+  so nothing has to pass callbacks around
+- Token counts per LLM call: the provider's usage when it reports one,
+  otherwise an estimate from output_shaping.count_tokens
+
+Each search can also collect a per-request breakdown of the same spans:
+
+    trace = start_trace()
+    ...run the search...
+    result["timings"] = trace.as_dict()
+"""
+
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import get_buffer_string
+
+from output_shaping import count_tokens
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+# --------------------------------
+# Metric types
+# --------------------------------
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labelnames: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    """
+    Monotonic counter with labels.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def render(self) -> list:
+        with self._lock:
+            return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                    for key, value in sorted(self._values.items())]
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram with labels.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {"buckets": [0] * len(self.buckets), "count": 0, "sum": 0.0}
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series["buckets"][index] += 1
+            series["count"] += 1
+            series["sum"] += value
+
+    def count(self, **labels) -> int:
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            return series["count"] if series else 0
+
+    def render(self) -> list:
+        lines = []
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, observed in zip(self.buckets, series["buckets"]):
+                    cumulative += observed
+                    labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{labels} {series['count']}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(series['sum'])}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {series['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    The set of metrics rendered at /api/metrics.
+    """
+
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name: str, documentation: str, labelnames: tuple = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: tuple = (),
+                  buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """
+        Prometheus text exposition format (version 0.0.4)
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    "medical_search_request_seconds", "End-to-end search latency", ("routing", "cache"))
+REQUESTS = REGISTRY.counter(
+    "medical_search_requests_total", "Searches served", ("routing", "status"))
+STAGE_SECONDS = REGISTRY.histogram(
+    "medical_search_stage_seconds", "Latency of one search stage", ("stage",))
+TOOL_SECONDS = REGISTRY.histogram(
+    "medical_search_tool_seconds", "Latency of one tool call", ("tool", "status"))
+LLM_SECONDS = REGISTRY.histogram(
+    "medical_search_llm_seconds", "Latency of one LLM call", ("model",))
+LLM_CALLS = REGISTRY.counter(
+    "medical_search_llm_calls_total", "LLM calls", ("model", "status"))
+LLM_TOKENS = REGISTRY.counter(
+    "medical_search_llm_tokens_total", "LLM tokens (provider usage, estimated when not reported)",
+    ("model", "type"))
+
+
+# --------------------------------
+# Per-request traces
+# --------------------------------
+_current_trace = contextvars.ContextVar("request_trace", default=None)
+
+
+class RequestTrace:
+    """
+    Spans (stages, LLM calls, tool calls) recorded during one request.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self.spans = []
+
+    def add(self, kind: str, name: str, start: float, seconds: float, **extra) -> None:
+        span = {"kind": kind, "name": name, "start": round(start - self.started, 4), "seconds": round(seconds, 4)}
+        span.update(extra)
+        with self._lock:
+            self.spans.append(span)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span["start"])
+        totals = {}
+        for span in spans:
+            key = f"{span['kind']}:{span['name']}"
+            totals[key] = round(totals.get(key, 0.0) + span["seconds"], 4)
+        llm_spans = [span for span in spans if span["kind"] == "llm"]
+        return {
+            "total_seconds": round(time.perf_counter() - self.started, 4),
+            "totals": totals,
+            "llm_calls": len(llm_spans),
+            "prompt_tokens": sum(span.get("prompt_tokens", 0) for span in llm_spans),
+            "completion_tokens": sum(span.get("completion_tokens", 0) for span in llm_spans),
+            "spans": spans,
+        }
+
+
+def start_trace() -> RequestTrace:
+    """
+    Begin collecting spans for a new request in the current context
+    """
+    trace = RequestTrace()
+    _current_trace.set(trace)
+    return trace
+
+
+def current_trace() -> RequestTrace:
+    return _current_trace.get()
+
+
+def record_stage(name: str, start_time: float) -> None:
+    """
+    Record a search stage that started at start_time (perf_counter) and ends now
+    """
+    elapsed = time.perf_counter() - start_time
+    STAGE_SECONDS.observe(elapsed, stage=name)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add("stage", name, start_time, elapsed)
+
+
+@contextmanager
+def stage(name: str):
+    """
+    Time a block as a search stage (histogram + current request trace)
+    """
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, start_time)
+
+
+# --------------------------------
+# LangChain callbacks
+# --------------------------------
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """
+    Times every LLM and tool run and counts LLM tokens.
+    """
+
+    # Cheap and non-blocking: run in the caller's context, also on the async path
+    run_inline = True
+
+    def __init__(self):
+        self._runs = {}
+        self._lock = threading.Lock()
+
+    def _start(self, run_id: UUID, **info) -> None:
+        with self._lock:
+            self._runs[run_id] = dict(info, start=time.perf_counter())
+
+    def _finish(self, run_id: UUID) -> tuple:
+        with self._lock:
+            info = self._runs.pop(run_id, None)
+        if info is None:
+            return None, 0.0
+        return info, time.perf_counter() - info["start"]
+
+    @staticmethod
+    def _model_name(serialized: dict, kwargs: dict) -> str:
+        params = kwargs.get("invocation_params") or {}
+        metadata = kwargs.get("metadata") or {}
+        return str(params.get("model_name") or params.get("model") or metadata.get("ls_model_name")
+                   or (serialized or {}).get("name") or "unknown")
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        prompt = "\n".join(get_buffer_string(batch) for batch in messages)
+        self._start(run_id, model=self._model_name(serialized, kwargs), prompt_estimate=count_tokens(prompt))
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._start(run_id, model=self._model_name(serialized, kwargs),
+                    prompt_estimate=count_tokens("\n".join(prompts)))
+
+    @staticmethod
+    def _usage(response) -> tuple:
+        """
+        (prompt_tokens, completion_tokens) reported by the provider, or None
+        """
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        if usage.get("prompt_tokens") is not None:
+            return usage["prompt_tokens"], usage.get("completion_tokens", 0)
+        for generations in response.generations:
+            for generation in generations:
+                metadata = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if metadata:
+                    return metadata.get("input_tokens", 0), metadata.get("output_tokens", 0)
+        return None
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        info, elapsed = self._finish(run_id)
+        if info is None:
+            return
+        usage = self._usage(response)
+        estimated = usage is None
+        if estimated:
+            text = "".join(generation.text for generations in response.generations for generation in generations)
+            usage = (info["prompt_estimate"], count_tokens(text))
+        model = info["model"]
+        LLM_SECONDS.observe(elapsed, model=model)
+        LLM_CALLS.inc(model=model, status="success")
+        LLM_TOKENS.inc(usage[0], model=model, type="prompt")
+        LLM_TOKENS.inc(usage[1], model=model, type="completion")
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add("llm", model, info["start"], elapsed, prompt_tokens=usage[0],
+                      completion_tokens=usage[1], estimated_tokens=estimated)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        info, elapsed = self._finish(run_id)
+        if info is not None:
+            LLM_SECONDS.observe(elapsed, model=info["model"])
+            LLM_CALLS.inc(model=info["model"], status="error")
+
+    def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        # run_name (kwargs["name"]) distinguishes e.g. the Tavily call inside the cached web search tool
+        self._start(run_id, tool=str(kwargs.get("name") or (serialized or {}).get("name") or "unknown"))
+
+    def _tool_done(self, run_id: UUID, status: str) -> None:
+        info, elapsed = self._finish(run_id)
+        if info is None:
+            return
+        TOOL_SECONDS.observe(elapsed, tool=info["tool"], status=status)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add("tool", info["tool"], info["start"], elapsed, status=status)
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._tool_done(run_id, "success")
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._tool_done(run_id, "error")
+
+
+_handler = MetricsCallbackHandler()
+_install_lock = threading.Lock()
+_installed = False
+
+
+def install_langchain_metrics() -> MetricsCallbackHandler:
+    """
+    Attach the metrics handler to every LangChain run in the process (idempotent)
+    """
+    global _installed
+    from langchain_core.tracers.context import register_configure_hook
+
+    with _install_lock:
+        if not _installed:
+            # The handler is the variable's default, so every thread and task sees it
+            handler_var = contextvars.ContextVar("metrics_callback_handler_hook", default=_handler)
+            register_configure_hook(handler_var, inheritable=True)
+            _installed = True
+    return _handler
@@ -0,0 +1,231 @@
+"""
+Tool Output Shaping
+===================
+
+Keeps database tool results small before they enter an agent's context:
+
+- Row dumps from `SQLDatabase.run` (a Python list of tuples/dicts as text) are
+  re-rendered as compact CSV, capped at TOOL_MAX_ROWS rows; the omitted rows
+  are described by a one-line summary per numeric column (min / max / mean)
+- Any tool output is then held to a token budget (TOOL_TOKEN_BUDGET), cut at
+  a line boundary where possible
+- Token counts use tiktoken when it is installed, len(text) / 4 otherwise
+
+Every shaped output is recorded in the current request's ShapingReport, so a
+search response can say how many prompt tokens shaping saved:
+
+    report = start_shaping_report()
+    ...run the agent...
+    result["output_shaping"] = report.as_dict()
+"""
+
+import ast
+import contextvars
+import csv
+import io
+import os
+import threading
+from functools import lru_cache
+
+TOOL_MAX_ROWS = int(os.getenv("TOOL_MAX_ROWS", "20"))
+TOOL_TOKEN_BUDGET = int(os.getenv("TOOL_TOKEN_BUDGET", "1000"))
+
+# Encoding used by the gpt-4.1 / gpt-4o model family
+TIKTOKEN_ENCODING = "o200k_base"
+
+_current_report = contextvars.ContextVar("output_shaping_report", default=None)
+
+
+# --------------------------------
+# Token counting
+# --------------------------------
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding(TIKTOKEN_ENCODING)
+    except Exception:
+        # Not installed, or the encoding file cannot be downloaded
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """
+    Prompt tokens for a piece of text (tiktoken, or ~4 characters per token)
+    """
+    encoding = _encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_budget(text: str, budget: int) -> str:
+    """
+    Cut text to at most `budget` tokens, preferring a line boundary, and say how much was dropped
+    """
+    total = count_tokens(text)
+    if total <= budget:
+        return text
+    encoding = _encoding()
+    if encoding is None:
+        kept = text[:budget * 4]
+    else:
+        kept = encoding.decode(encoding.encode(text, disallowed_special=())[:budget])
+    # Drop a partial last line unless that would drop most of the text
+    if "\n" in kept and kept.rfind("\n") > len(kept) // 2:
+        kept = kept[:kept.rfind("\n")]
+    return f"{kept}\n… [truncated {total - count_tokens(kept)} of {total} tokens]"
+
+
+# --------------------------------
+# Tabular results
+# --------------------------------
+def _parse_rows(text: str) -> tuple:
+    """
+    (columns, rows) from the text of a SQLDatabase.run result, or None when
+    the text is not a list of tuples/dicts
+    """
+    try:
+        value = ast.literal_eval(text.strip())
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        return None
+    if not isinstance(value, list) or not value:
+        return None
+    if all(isinstance(row, dict) for row in value):
+        columns = list(value[0])
+        return columns, [tuple(row.get(column) for column in columns) for row in value]
+    if all(isinstance(row, tuple) for row in value):
+        return None, value
+    return None
+
+
+def _numeric_summary(columns: list, rows: list) -> str:
+    """
+    One line per numeric column: min / max / mean over all rows
+    """
+    width = max(len(row) for row in rows)
+    names = columns or [f"col{i + 1}" for i in range(width)]
+    lines = []
+    for index, name in enumerate(names):
+        values = [row[index] for row in rows
+                  if index < len(row) and isinstance(row[index], (int, float)) and not isinstance(row[index], bool)]
+        if values:
+            lines.append(f"{name}: min={min(values):g}, max={max(values):g}, mean={sum(values) / len(values):.4g}")
+    return "; ".join(lines)
+
+
+def rows_to_csv(rows: list, columns: list = None, max_rows: int = TOOL_MAX_ROWS) -> str:
+    """
+    Compact CSV of the first max_rows rows, plus a summary of the omitted rows
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if columns:
+        writer.writerow(columns)
+    for row in rows[:max_rows]:
+        writer.writerow(f"{value:.6g}" if isinstance(value, float) else value for value in row)
+    text = buffer.getvalue().rstrip("\n")
+    if len(rows) > max_rows:
+        text += f"\n… {len(rows) - max_rows} more rows ({len(rows)} total)"
+        summary = _numeric_summary(columns, rows)
+        if summary:
+            text += f"; all rows: {summary}"
+    return text
+
+
+# --------------------------------
+# Per-request accounting
+# --------------------------------
+class ShapingReport:
+    """
+    Tokens before/after shaping for every tool output in one request.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = []
+
+    def record(self, tool_name: str, tokens_before: int, tokens_after: int) -> None:
+        with self._lock:
+            self.calls.append({"tool": tool_name, "tokens_before": tokens_before, "tokens_after": tokens_after})
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            before = sum(call["tokens_before"] for call in self.calls)
+            after = sum(call["tokens_after"] for call in self.calls)
+            return {
+                "tool_outputs": len(self.calls),
+                "tokens_before": before,
+                "tokens_after": after,
+                "tokens_saved": before - after,
+                "calls": list(self.calls),
+            }
+
+
+def start_shaping_report() -> ShapingReport:
+    """
+    Begin accounting for a new request in the current context; tool calls in
+    threads/tasks started from this context record into the same report
+    """
+    report = ShapingReport()
+    _current_report.set(report)
+    return report
+
+
+# --------------------------------
+# Shaping
+# --------------------------------
+def shape_tool_output(tool_name: str, text: str, max_rows: int = TOOL_MAX_ROWS,
+                      budget: int = TOOL_TOKEN_BUDGET, unshaped: str = None) -> str:
+    """
+    Compact a tool result for an agent: tabular results become capped CSV,
+    everything is held to the token budget, and the saving is recorded.
+
+    Args:
+        unshaped (str): What the agent would have received without shaping,
+            when that differs from text (the baseline for the report)
+    """
+    text = str(text)
+    if unshaped is None:
+        unshaped = text
+    tokens_before = count_tokens(unshaped)
+    shaped = text
+    parsed = _parse_rows(text)
+    if parsed is not None:
+        columns, rows = parsed
+        shaped = rows_to_csv(rows, columns, max_rows)
+    shaped = truncate_to_budget(shaped, budget)
+    # Never make a small output bigger (CSV headers, truncation notes)
+    tokens_after = count_tokens(shaped)
+    if tokens_after >= tokens_before:
+        shaped, tokens_after = unshaped, tokens_before
+
+    report = _current_report.get()
+    if report is not None:
+        report.record(tool_name, tokens_before, tokens_after)
+    return shaped
+
+
+def shape_sql_database(db, max_rows: int = TOOL_MAX_ROWS, budget: int = TOOL_TOKEN_BUDGET):
+    """
+    Make a LangChain SQLDatabase return shaped results from run() (what the
+    sql_db_query tool shows the SQL agent); column names are requested so the
+    CSV has a header. Returns the same object.
+    """
+    run = db.run
+
+    def shaped_run(command, fetch="all", include_columns=False, **kwargs):
+        result = run(command, fetch, include_columns=True, **kwargs)
+        if not isinstance(result, str):
+            return result
+        unshaped = result
+        if not include_columns:
+            # The tuple rendering the caller asked for, as the report baseline
+            parsed = _parse_rows(result)
+            if parsed is not None:
+                unshaped = str(parsed[1])
+        return shape_tool_output("sql_db_query", result, max_rows, budget, unshaped=unshaped)
+
+    db.run = shaped_run
+    return db
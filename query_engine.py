@@ -0,0 +1,180 @@
+"""
+Rule-Based Query Engine
+=======================
+
+Deterministic fast path for templated statistics questions:
+
+- "how many heart disease patients are there"
+- "what is the average / max / min age of cancer patients"
+- "gender distribution for heart disease patients"
+
+Matching queries are answered with one SQL statement and zero LLM calls, or
+with a vectorized scan of an in-memory ColumnStore (columnar.py) when one is
+attached and still matches the database file.
+Anything that does not match a whole template returns None and goes to the agent.
+"""
+
+import re
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from answer_cache import normalize_query
+from db_engine import get_engine
+
+# Disease phrases → patient table
+DISEASE_PATTERNS = {
+    "heart_disease_patients": r"heart disease|heart|cardiac",
+    "cancer_patients": r"cancer",
+    "diabetes_patients": r"diabetes|diabetic",
+}
+
+# Column holding patient sex/gender in each table (diabetes has none)
+GENDER_COLUMNS = {
+    "heart_disease_patients": "sex",
+    "cancer_patients": "gender",
+}
+
+AGE_FUNCTIONS = {
+    "average": "AVG", "mean": "AVG",
+    "maximum": "MAX", "max": "MAX", "highest": "MAX", "oldest": "MAX",
+    "minimum": "MIN", "min": "MIN", "lowest": "MIN", "youngest": "MIN",
+}
+
+_DISEASE = r"(?P<disease>" + "|".join(DISEASE_PATTERNS.values()) + r")"
+_PATIENTS = r"(?: disease)?(?: patients?)?"
+_LEAD = r"(?:(?:what is|what s|whats|show me|give me|get|tell me) )?(?:the )?"
+
+TEMPLATES = [
+    ("gender_distribution", re.compile(
+        rf"how many {_DISEASE}{_PATIENTS} (?:are there |do we have )?(?:by|per) (?:gender|sex)"
+    )),
+    ("gender_distribution", re.compile(
+        rf"{_LEAD}(?:gender|sex) (?:distribution|breakdown|split) (?:of|for|among|in) (?:the )?{_DISEASE}{_PATIENTS}"
+    )),
+    ("count", re.compile(
+        rf"how many {_DISEASE}{_PATIENTS}(?: are there| do we have| are in the database| in total| total)?"
+    )),
+    ("count", re.compile(
+        rf"{_LEAD}(?:total )?(?:number|count) of {_DISEASE}{_PATIENTS}"
+    )),
+    ("age", re.compile(
+        rf"{_LEAD}(?P<function>{'|'.join(AGE_FUNCTIONS)}) age (?:of|for|among|in) (?:the )?{_DISEASE}{_PATIENTS}"
+    )),
+]
+
+
+class RuleBasedQueryEngine:
+    """
+    Answer templated statistics questions straight from SQLite (or a column store).
+    """
+
+    def __init__(self, db_path: str, column_store=None):
+        """
+        Args:
+            db_path (str): SQLite database path
+            column_store (ColumnStore): Optional columnar copy of the tables, or a
+                zero-argument function returning the current one (or None); used
+                while it is current, SQLite otherwise
+        """
+        self.db_path = db_path
+        self.column_store = column_store
+
+    def _table_for(self, disease: str) -> str:
+        for table_name, pattern in DISEASE_PATTERNS.items():
+            if re.fullmatch(pattern, disease):
+                return table_name
+        return None
+
+    def match(self, query: str) -> dict:
+        """
+        Match a query against the templates.
+
+        Returns:
+            dict: {"template", "table", "statistic", "sql", "params"} or None when
+            no template matches the whole query
+        """
+        query_norm = normalize_query(query)
+        for template, pattern in TEMPLATES:
+            found = pattern.fullmatch(query_norm)
+            if not found:
+                continue
+            table_name = self._table_for(found.group("disease"))
+            statistic = None
+
+            if template == "count":
+                sql = f"SELECT COUNT(*) FROM {table_name}"
+            elif template == "age":
+                statistic = AGE_FUNCTIONS[found.group("function")]
+                sql = f"SELECT {statistic}(age) FROM {table_name}"
+            else:
+                gender_column = GENDER_COLUMNS.get(table_name)
+                if gender_column is None:
+                    return None
+                sql = f"SELECT {gender_column}, COUNT(*) FROM {table_name} GROUP BY {gender_column} ORDER BY {gender_column}"
+
+            return {"template": template, "table": table_name, "statistic": statistic, "sql": sql, "params": ()}
+        return None
+
+    def answer(self, query: str) -> dict:
+        """
+        Answer a query without any LLM call.
+
+        Returns:
+            dict: {"response", "template", "table", "sql", "backend"} or None when the query
+            does not match a template, the database cannot be read or an age statistic
+            has no numeric value
+        """
+        matched = self.match(query)
+        if matched is None:
+            return None
+
+        rows = self._column_rows(matched)
+        backend = "columnar"
+        if rows is None:
+            backend = "sqlite"
+            try:
+                with get_engine(self.db_path).connect() as conn:
+                    rows = conn.exec_driver_sql(matched["sql"], matched["params"]).fetchall()
+            except SQLAlchemyError:
+                return None
+
+        label = matched["table"].replace("_patients", "").replace("_", " ")
+        if matched["template"] == "count":
+            response = f"There are {rows[0][0]} {label} patients in the database."
+        elif matched["template"] == "age":
+            value = rows[0][0]
+            # No ages (empty table or all NULL) or non-numeric ones: let the agent explain
+            if not isinstance(value, (int, float)):
+                return None
+            description = {"AVG": "average", "MAX": "maximum", "MIN": "minimum"}[matched["statistic"]]
+            response = f"The {description} age of {label} patients is {value:.1f} years."
+        else:
+            gender_column = GENDER_COLUMNS[matched["table"]]
+            counts = ", ".join(f"{gender_column}={value}: {count}" for value, count in rows)
+            response = f"Gender distribution for {label} patients: {counts}."
+
+        return {
+            "response": response,
+            "template": matched["template"],
+            "table": matched["table"],
+            "sql": matched["sql"],
+            "backend": backend,
+        }
+
+    def _column_rows(self, matched: dict) -> list:
+        """
+        Rows for a matched template from the column store, shaped like the
+        SQL result, or None when there is no usable store for the table
+        """
+        store = self.column_store() if callable(self.column_store) else self.column_store
+        if store is None or not store.has_table(matched["table"]) or not store.is_current():
+            return None
+        table_name = matched["table"]
+        try:
+            if matched["template"] == "count":
+                return [(store.count(table_name),)]
+            if matched["template"] == "age":
+                return [(store.aggregate(table_name, "age", matched["statistic"].lower()),)]
+            return store.group_count(table_name, GENDER_COLUMNS[table_name])
+        except KeyError:
+            return None
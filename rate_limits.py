@@ -0,0 +1,95 @@
+"""
+Backend Rate Limits
+===================
+
+One shared token-bucket limiter per backend, so bulk workloads (the batch
+endpoint and CLI) cannot flood the LLM endpoint, Tavily or SQLite however
+many queries run at once:
+
+- "llm":        every chat model call (ChatOpenAI rate_limiter)
+- "web_search": every Tavily call that is not answered from the web search cache
+- "sqlite":     every query the SQL agents run
+
+Rates are requests per second from LLM_REQUESTS_PER_SECOND,
+WEB_SEARCH_REQUESTS_PER_SECOND and SQL_QUERIES_PER_SECOND; 0 (the default)
+means unlimited. `set_rate_limit()` changes a rate at runtime, including for
+limiters already handed to a model or tool.
+"""
+
+import os
+import threading
+
+from langchain_core.rate_limiters import InMemoryRateLimiter
+
+BACKENDS = ("llm", "web_search", "sqlite")
+
+_DEFAULT_RATES = {
+    "llm": float(os.getenv("LLM_REQUESTS_PER_SECOND", "0")),
+    "web_search": float(os.getenv("WEB_SEARCH_REQUESTS_PER_SECOND", "0")),
+    "sqlite": float(os.getenv("SQL_QUERIES_PER_SECOND", "0")),
+}
+
+
+class BackendRateLimiter(InMemoryRateLimiter):
+    """
+    InMemoryRateLimiter whose rate can be changed later; a rate of 0 never blocks.
+    """
+
+    def __init__(self, requests_per_second: float = 0, max_bucket_size: float = 1):
+        super().__init__(requests_per_second=requests_per_second, check_every_n_seconds=0.01,
+                         max_bucket_size=max_bucket_size)
+
+    def set_rate(self, requests_per_second: float) -> None:
+        self.requests_per_second = requests_per_second
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        if self.requests_per_second <= 0:
+            return True
+        return super().acquire(blocking=blocking)
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        if self.requests_per_second <= 0:
+            return True
+        return await super().aacquire(blocking=blocking)
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def rate_limiter(backend: str) -> BackendRateLimiter:
+    """
+    The process-wide limiter for a backend ("llm", "web_search" or "sqlite")
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+    with _limiters_lock:
+        if backend not in _limiters:
+            _limiters[backend] = BackendRateLimiter(_DEFAULT_RATES[backend])
+        return _limiters[backend]
+
+
+def set_rate_limit(backend: str, requests_per_second: float) -> None:
+    """
+    Change a backend's rate (requests per second, 0 for unlimited)
+    """
+    rate_limiter(backend).set_rate(requests_per_second)
+
+
+def rate_limits() -> dict:
+    return {backend: rate_limiter(backend).requests_per_second for backend in BACKENDS}
+
+
+def rate_limit_sql_database(db, limiter: BackendRateLimiter = None):
+    """
+    Make a LangChain SQLDatabase wait for the limiter before each run(). Returns the same object.
+    """
+    limiter = limiter or rate_limiter("sqlite")
+    run = db.run
+
+    def limited_run(*args, **kwargs):
+        limiter.acquire()
+        return run(*args, **kwargs)
+
+    db.run = limited_run
+    return db
@@ -0,0 +1,117 @@
+"""
+Single-Flight Request Coalescing
+================================
+
+When identical searches arrive at the same time, only the first one (the
+leader) runs; the others wait for it and receive a copy of its result (or its
+exception). Backend fan-out during a burst is one agent run per distinct
+question, however many clients ask it.
+
+- SingleFlight:      for threaded callers (Flask / search_medical_query)
+- AsyncSingleFlight: for coroutines on one event loop (ASGI / asearch_medical_query)
+
+Nothing is remembered once the leader finishes; repeated questions after
+that are the answer cache's job.
+"""
+
+import asyncio
+import copy
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Thread-safe single-flight group.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.shared = 0
+
+    def do(self, key, fn) -> tuple:
+        """
+        Run fn() unless a call with the same key is already in flight.
+
+        Returns:
+            tuple: (result, shared) where shared is True for callers that
+            waited on another caller's execution (they get a deep copy)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result), True
+
+        try:
+            call.result = fn()
+            # Waiters copy the result before the leader's caller can modify it
+            shared_result, call.result = call.result, copy.deepcopy(call.result)
+            return shared_result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"in_flight": len(self._calls), "leaders": self.leaders, "shared": self.shared}
+
+
+class AsyncSingleFlight:
+    """
+    Single-flight group for coroutines; calls are tracked per event loop.
+    """
+
+    def __init__(self):
+        self._tasks = {}
+        self.leaders = 0
+        self.shared = 0
+
+    async def do(self, key, coroutine_fn) -> tuple:
+        """
+        Await coroutine_fn() unless a call with the same key is already in flight.
+
+        The execution runs as its own task, so a caller that is cancelled (a
+        client disconnecting) does not cancel it for the others.
+
+        Returns:
+            tuple: (result, shared) as in SingleFlight.do
+        """
+        task_key = (id(asyncio.get_running_loop()), key)
+        task = self._tasks.get(task_key)
+        shared = task is not None
+        if shared:
+            self.shared += 1
+        else:
+            self.leaders += 1
+            task = asyncio.ensure_future(coroutine_fn())
+            self._tasks[task_key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(task_key, None))
+
+        result = await asyncio.shield(task)
+        # Every caller gets its own copy; the task's result stays pristine
+        return copy.deepcopy(result), shared
+
+    def stats(self) -> dict:
+        return {"in_flight": len(self._tasks), "leaders": self.leaders, "shared": self.shared}
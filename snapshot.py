@@ -0,0 +1,350 @@
+"""
+Columnar Snapshot Format
+========================
+
+Compact, memory-mappable binary copy of a patient dataset (a CSV/XLSX source
+file or a SQLite table), built once and then opened with `mmap` so columns are
+read zero-copy from the OS page cache instead of being re-parsed.
+
+File layout (little-endian):
+
+    +---------------------------+
+    | magic  b"PSNAP001"        |  8 bytes
+    | header length (uint64)    |  8 bytes
+    | header (UTF-8 JSON)       |  typed column directory, source signature
+    | padding to 64 bytes       |
+    | column block 0            |  fixed-width values, 64-byte aligned
+    | column block 1            |
+    | ...                       |
+    +---------------------------+
+
+Header:
+    {"version": 1, "num_rows": N,
+     "source": {"kind": "file" | "sqlite", "path": ..., "table": ..., "signature": [...]},
+     "columns": [{"name", "dtype", "offset", "nbytes", "categories"?}, ...]}
+
+Numeric columns are stored in the smallest dtype that holds them (NULLs make a
+column float64 with NaN). Text columns are dictionary-encoded: int32 codes
+(-1 for NULL) in the block and the distinct strings in "categories".
+
+Usage:
+    snapshot = open_snapshot("data/cancer_patients.csv")   # builds on first use
+    ages = snapshot.column("Age")                           # read-only view, no copy
+"""
+
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+
+import numpy as np
+
+from db_engine import database_signature
+
+MAGIC = b"PSNAP001"
+FORMAT_VERSION = 1
+BLOCK_ALIGNMENT = 64
+
+# Snapshots of source files live next to them, in this directory
+SNAPSHOT_DIR_NAME = ".snapshots"
+SNAPSHOT_SUFFIX = ".snap"
+
+_PREFIX = struct.Struct("<8sQ")
+
+
+def compact_array(values: np.ndarray) -> np.ndarray:
+    """
+    Smallest dtype that holds a numeric column: whole-number floats without
+    NaN become integers, integers are downcast (age fits in int8)
+    """
+    if values.dtype.kind == "f" and values.size and not np.isnan(values).any() and (values % 1 == 0).all():
+        values = values.astype(np.int64)
+    if values.dtype.kind in "iu" and values.size:
+        low, high = values.min(), values.max()
+        for dtype in (np.int8, np.int16, np.int32):
+            if np.iinfo(dtype).min <= low and high <= np.iinfo(dtype).max:
+                return values.astype(dtype)
+    return values
+
+
+def file_signature(path: str) -> list:
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // BLOCK_ALIGNMENT) * BLOCK_ALIGNMENT
+
+
+# --------------------------------
+# Writing
+# --------------------------------
+def write_snapshot(path: str, columns: dict, source: dict) -> str:
+    """
+    Write {name: 1-D array} as a snapshot file (atomically replaced).
+
+    Numeric arrays are compacted; anything else is dictionary-encoded text.
+
+    Returns:
+        str: The snapshot path
+    """
+    num_rows = len(next(iter(columns.values()))) if columns else 0
+    blocks, directory = [], []
+    for name, values in columns.items():
+        values = np.asarray(values)
+        entry = {"name": name}
+        if values.dtype.kind in "iufb":
+            block = compact_array(values.astype(np.float64) if values.dtype.kind == "b" else values)
+        else:
+            missing = np.array([value is None or value != value for value in values], dtype=bool)
+            categories, codes = np.unique(values[~missing].astype(str), return_inverse=True)
+            block = np.full(len(values), -1, dtype=np.int32)
+            block[~missing] = codes
+            entry["categories"] = categories.tolist()
+        block = np.ascontiguousarray(block, dtype=block.dtype.newbyteorder("<"))
+        entry["dtype"] = block.dtype.str
+        entry["nbytes"] = block.nbytes
+        directory.append(entry)
+        blocks.append(block)
+
+    header = {"version": FORMAT_VERSION, "num_rows": num_rows, "source": source, "columns": directory}
+    # Offsets depend on the header size and the header holds the offsets:
+    # grow the reserved header size until the layout is stable
+    reserved = 0
+    while True:
+        offset = _aligned(_PREFIX.size + reserved)
+        for entry in directory:
+            entry["offset"] = offset
+            offset = _aligned(offset + entry["nbytes"])
+        header_bytes = json.dumps(header).encode("utf-8")
+        if len(header_bytes) <= reserved:
+            break
+        reserved = len(header_bytes) + 256
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, reserved))
+        f.write(header_bytes.ljust(reserved, b" "))
+        for entry, block in zip(directory, blocks):
+            f.seek(entry["offset"])
+            f.write(block.tobytes())
+        f.truncate(max(f.tell(), _aligned(_PREFIX.size + reserved)))
+    os.replace(tmp_path, path)
+    return path
+
+
+def snapshot_path_for(source_path: str) -> str:
+    """
+    Default snapshot location for a source file: <dir>/.snapshots/<file>.snap
+    """
+    source_path = os.path.abspath(source_path)
+    return os.path.join(os.path.dirname(source_path), SNAPSHOT_DIR_NAME,
+                        os.path.basename(source_path) + SNAPSHOT_SUFFIX)
+
+
+def snapshot_from_frame(source_path: str, df, signature: list, path: str = None) -> str:
+    """
+    Write the snapshot of a source file from a DataFrame already parsed from it
+
+    Args:
+        signature (list): file_signature(source_path) taken before parsing
+    """
+    source_path = os.path.abspath(source_path)
+    columns = {str(name): df[name].to_numpy() for name in df.columns}
+    return write_snapshot(path or snapshot_path_for(source_path), columns,
+                          {"kind": "file", "path": source_path, "signature": signature})
+
+
+def snapshot_from_file(source_path: str, path: str = None) -> str:
+    """
+    Parse a CSV/XLSX file once and write its snapshot
+    """
+    import pandas as pd
+
+    source_path = os.path.abspath(source_path)
+    signature = file_signature(source_path)
+    if source_path.lower().endswith((".xlsx", ".xls")):
+        df = pd.read_excel(source_path)
+    else:
+        df = pd.read_csv(source_path)
+    return snapshot_from_frame(source_path, df, signature, path)
+
+
+def read_sqlite_table(conn, table: str) -> dict:
+    """
+    {column: array} for a SQLite table, read one column at a time straight into
+    arrays (no row tuples held): float64 with NaN for numeric columns, object
+    arrays for text
+    """
+    num_rows = conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+    names = [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')]
+    columns = {}
+    for name in names:
+        query = f'SELECT "{name}" FROM "{table}" ORDER BY rowid'
+        try:
+            columns[name] = np.fromiter(
+                (np.nan if value is None else value for (value,) in conn.execute(query)),
+                dtype=np.float64, count=num_rows,
+            )
+        except (TypeError, ValueError):
+            # Text column
+            columns[name] = np.array([value for (value,) in conn.execute(query)], dtype=object)
+    return columns
+
+
+def begin_read(conn, db_path: str) -> tuple:
+    """
+    Start a read transaction on an open connection and return the database
+    signature as of that transaction (taken after the connection has created
+    any WAL files, so the data read next matches it)
+    """
+    conn.execute("BEGIN")
+    conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+    return database_signature(db_path)
+
+
+def snapshot_from_sqlite(db_path: str, table: str, path: str) -> str:
+    """
+    Write the snapshot of one SQLite table
+    """
+    db_path = os.path.abspath(db_path)
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        signature = begin_read(conn, db_path)
+        columns = read_sqlite_table(conn, table)
+    finally:
+        conn.close()
+    return write_snapshot(path, columns, sqlite_source(db_path, table, signature))
+
+
+def sqlite_source(db_path: str, table: str, signature: tuple) -> dict:
+    """
+    Header "source" entry for a table of a SQLite database
+    """
+    return {
+        "kind": "sqlite", "path": os.path.abspath(db_path), "table": table,
+        "signature": [list(part) if part else None for part in signature],
+    }
+
+
+# --------------------------------
+# Reading
+# --------------------------------
+class Snapshot:
+    """
+    Read-only, memory-mapped view of a snapshot file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, header_size = _PREFIX.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a patient snapshot")
+        self.header = json.loads(self._mmap[_PREFIX.size:_PREFIX.size + header_size])
+        if self.header["version"] != FORMAT_VERSION:
+            self._mmap.close()
+            raise ValueError(f"Unsupported snapshot version {self.header['version']} in {path}")
+        self.num_rows = self.header["num_rows"]
+        self.source = self.header["source"]
+        self._columns = {entry["name"]: entry for entry in self.header["columns"]}
+
+    @property
+    def columns(self) -> list:
+        return list(self._columns)
+
+    def resolve(self, column: str) -> str:
+        """
+        Stored name for a case/whitespace-insensitive column name (Age / age)
+        """
+        if column in self._columns:
+            return column
+        wanted = column.strip().lower()
+        for name in self._columns:
+            if name.strip().lower() == wanted:
+                return name
+        raise KeyError(f"Column '{column}' not found in {os.path.basename(self.path)} "
+                       f"(columns: {', '.join(self._columns)})")
+
+    def raw(self, column: str) -> np.ndarray:
+        """
+        The stored block as a read-only array backed by the mapping (codes for text)
+        """
+        entry = self._columns[self.resolve(column)]
+        dtype = np.dtype(entry["dtype"])
+        return np.frombuffer(self._mmap, dtype=dtype, count=entry["nbytes"] // dtype.itemsize,
+                             offset=entry["offset"])
+
+    def column(self, column: str) -> np.ndarray:
+        """
+        Column values: a zero-copy view for numeric columns, decoded strings
+        (None for NULL) for text columns
+        """
+        entry = self._columns[self.resolve(column)]
+        values = self.raw(column)
+        if "categories" not in entry:
+            return values
+        categories = np.array(entry["categories"] + [None], dtype=object)
+        return categories[values]
+
+    def is_text(self, column: str) -> bool:
+        return "categories" in self._columns[self.resolve(column)]
+
+    def is_current(self) -> bool:
+        """
+        False when the source file or database changed after the snapshot was built
+        """
+        source = self.source
+        try:
+            if source["kind"] == "sqlite":
+                current = sqlite_source(source["path"], source["table"], database_signature(source["path"]))
+                return current["signature"] == source["signature"]
+            return file_signature(source["path"]) == source["signature"]
+        except OSError:
+            return False
+
+    def to_frame(self, columns: list = None):
+        """
+        pandas DataFrame of the given (default: all) columns
+        """
+        import pandas as pd
+
+        return pd.DataFrame({self.resolve(name): self.column(name) for name in (columns or self.columns)})
+
+    def close(self) -> None:
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Column views are still alive; the mapping goes away with them
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_snapshot(source_path: str, build: bool = True) -> Snapshot:
+    """
+    Current snapshot of a CSV/XLSX source file, (re)built when missing or stale.
+
+    Returns:
+        Snapshot: or None when there is no current snapshot and build is False
+    """
+    path = snapshot_path_for(source_path)
+    try:
+        snapshot = Snapshot(path)
+        if snapshot.is_current():
+            return snapshot
+        snapshot.close()
+    except (OSError, ValueError):
+        pass
+    if not build:
+        return None
+    return Snapshot(snapshot_from_file(source_path, path))
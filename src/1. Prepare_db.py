@@ -1,7 +1,90 @@
+import hashlib
 import os
 import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import pandas as pd
-from sqlalchemy import create_engine, inspect
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.types import Float, Integer, Numeric
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from snapshot import file_signature, snapshot_from_frame, snapshot_path_for
+
+# Summary tables written by the stats-materialization stage
+STATS_TABLES = ("stats_tables", "stats_columns", "stats_distributions")
+
+# Columns with at most this many distinct values get a full value distribution
+STATS_MAX_DISTINCT_VALUES = 20
+
+# Schema + sample-row text for the SQL agents' prompts, computed at build time
+SCHEMA_CACHE_TABLE = "schema_cache"
+SCHEMA_SAMPLE_ROWS = 3
+
+# Streaming ingestion: rows per chunk / executemany batch, and rows sampled
+# to pick each column's explicit dtype
+INGEST_CHUNK_ROWS = 50_000
+INGEST_SNIFF_ROWS = 10_000
+
+# Columns indexed after loading (the filters and GROUP BYs the tools use)
+INDEX_COLUMNS = ("age", "sex", "gender", "target", "outcome", "diagnosis")
+
+# Source file hash / mtime / size / row count per table, for incremental reruns
+MANIFEST_TABLE = "ingest_manifest"
+
+# Bookkeeping tables that are not patient data
+INTERNAL_TABLES = STATS_TABLES + (SCHEMA_CACHE_TABLE, MANIFEST_TABLE)
+
+
+def _quote(identifier: str) -> str:
+    """
+    Quote a SQLite identifier (table or column name).
+    """
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+# Types tried, in order, when a value outside the sniffed sample does not fit its column's dtype
+WIDER_DTYPES = ("float64", "object")
+
+
+def _csv_read_dtypes(dtypes: dict) -> dict:
+    """
+    The sniffed dtypes that are safe to enforce while parsing: text columns hold
+    any value. Numeric and boolean columns are parsed freely and conformed per
+    chunk (_conform_dtypes), since a value past the sample could break them.
+    """
+    return {col: dtype for col, dtype in dtypes.items() if dtype == "string"}
+
+
+def _conform_dtypes(chunk: pd.DataFrame, dtypes: dict) -> pd.DataFrame:
+    """
+    Cast a parsed chunk to the sniffed dtypes, widening a column (float, then
+    object) when it holds values the sample did not show, e.g. text or a fraction
+    in an integer column. SQLite keeps such values under the column's affinity.
+    """
+    for col, dtype in dtypes.items():
+        for candidate in (dtype,) + WIDER_DTYPES:
+            try:
+                chunk[col] = chunk[col].astype(candidate)
+                break
+            except (TypeError, ValueError):
+                continue
+    return chunk
+
+
+def _sqlite_rows(chunk: pd.DataFrame) -> list:
+    """
+    Convert a DataFrame chunk to row tuples of plain Python values (None for
+    missing), column by column, which is much faster than astype(object).
+    """
+    columns = []
+    for col in chunk.columns:
+        series = chunk[col]
+        values = series.tolist()
+        if series.hasnans:
+            values = [None if missing else value for value, missing in zip(values, series.isna().tolist())]
+        columns.append(values)
+    return list(zip(*columns))
 
 
 class PrepareSQLFromTabularData:
@@ -10,15 +93,25 @@ class PrepareSQLFromTabularData:
     Each file is read into a DataFrame and stored as a SQL table inside combineddata.db.
     """
 
-    def __init__(self, files_dir: str, db_name: str = "PatientsDB.db") -> None:
+    def __init__(self, files_dir: str, db_name: str = "PatientsDB.db", streaming: bool = False,
+                 chunksize: int = INGEST_CHUNK_ROWS, workers: int = 1) -> None:
         """
         Initialize an instance of PrepareSQLFromTabularData.
 
         Args:
             files_dir (str): Directory containing the CSV/XLSX files.
             db_name (str): SQLite database file name.
+            streaming (bool): Load files in typed chunks with executemany in one
+                transaction instead of a full DataFrame + to_sql.
+            chunksize (int): Rows per chunk in streaming mode.
+            workers (int): Processes parsing files in parallel. With more than one,
+                parsed frames go to a single writer in this process (SQLite has
+                one writer) and are loaded with the typed executemany path.
         """
         self.files_directory = files_dir
+        self.streaming = streaming
+        self.chunksize = chunksize
+        self.workers = workers
         self.file_dir_list = [
             f for f in os.listdir(files_dir) if f.endswith((".csv", ".xlsx"))
         ]
@@ -32,7 +125,8 @@ class PrepareSQLFromTabularData:
         print(f"✅ Using database: {db_path}")
         print("📂 Number of files detected:", len(self.file_dir_list))
 
-    def _clean_column_names(self, df: pd.DataFrame) -> pd.DataFrame:
+    @staticmethod
+    def _clean_column_names(df: pd.DataFrame) -> pd.DataFrame:
         """
         Clean DataFrame column names to be SQL-friendly.
         - lowercase
@@ -48,34 +142,383 @@ class PrepareSQLFromTabularData:
         df.columns = clean_cols
         return df
 
-    def _prepare_db(self):
+    @staticmethod
+    def _sniff_types(sample: pd.DataFrame) -> tuple:
+        """
+        Pick an explicit read dtype and a SQLite affinity per column from a sample of rows.
+
+        Returns:
+            tuple: ({column: pandas dtype}, {column: SQLite affinity})
+        """
+        dtypes, affinities = {}, {}
+        for col in sample.columns:
+            series = sample[col]
+            if pd.api.types.is_bool_dtype(series):
+                dtypes[col], affinities[col] = "boolean", "INTEGER"
+            elif pd.api.types.is_integer_dtype(series):
+                dtypes[col], affinities[col] = "Int64", "INTEGER"
+            elif pd.api.types.is_float_dtype(series):
+                # Whole numbers with gaps (e.g. a missing age) are read as floats but
+                # stored as INTEGER; SQLite's affinity keeps any true fractions as REAL
+                non_null = series.dropna()
+                is_whole = len(non_null) > 0 and bool((non_null % 1 == 0).all())
+                dtypes[col], affinities[col] = "float64", "INTEGER" if is_whole else "REAL"
+            else:
+                dtypes[col], affinities[col] = "string", "TEXT"
+        return dtypes, affinities
+
+    def _read_chunks(self, full_file_path: str, file_extension: str) -> tuple:
+        """
+        Read a file as DataFrame chunks with cleaned column names and explicit dtypes.
+
+        Returns:
+            tuple: ({cleaned column: SQLite affinity}, iterator of DataFrame chunks)
+        """
+        if file_extension.lower() == ".csv":
+            sample = pd.read_csv(full_file_path, nrows=INGEST_SNIFF_ROWS)
+            dtypes, affinities = self._sniff_types(sample)
+            clean_names = self._clean_column_names(sample).columns
+            chunks = (
+                self._clean_column_names(_conform_dtypes(chunk, dtypes))
+                for chunk in pd.read_csv(full_file_path, dtype=_csv_read_dtypes(dtypes), chunksize=self.chunksize)
+            )
+        else:
+            # pandas has no chunked Excel reader: load once, then write in batches
+            df = pd.read_excel(full_file_path)
+            dtypes, affinities = self._sniff_types(df)
+            df = self._clean_column_names(df.astype(dtypes))
+            clean_names = df.columns
+            chunks = (df.iloc[start:start + self.chunksize] for start in range(0, len(df), self.chunksize))
+
+        return dict(zip(clean_names, affinities.values())), chunks
+
+    def _enable_wal(self):
+        """
+        Put the database in WAL journal mode (persists in the file), so the
+        read-only serving engines never block on a rebuild. Done here, where
+        the database is written anyway, rather than on the read path.
+        """
+        with self.engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA journal_mode = WAL")
+
+    def _write_table(self, table_name: str, affinities: dict, chunks) -> int:
+        """
+        Replace a table with the given chunks: one CREATE TABLE with explicit
+        affinities, then executemany per chunk, all in a single transaction.
+
+        Returns:
+            int: Number of rows written
+        """
+        table_sql = _quote(table_name)
+        columns = ", ".join(f"{_quote(col)} {affinity}" for col, affinity in affinities.items())
+        placeholders = ", ".join("?" * len(affinities))
+        insert_sql = f"INSERT INTO {table_sql} VALUES ({placeholders})"
+        row_count = 0
+        raw_conn = self.engine.raw_connection()
+        try:
+            cursor = raw_conn.cursor()
+            cursor.execute("PRAGMA synchronous = NORMAL")
+            cursor.execute("BEGIN")
+            cursor.execute(f"DROP TABLE IF EXISTS {table_sql}")
+            cursor.execute(f"CREATE TABLE {table_sql} ({columns})")
+            for chunk in chunks:
+                cursor.executemany(insert_sql, _sqlite_rows(chunk))
+                row_count += len(chunk)
+            raw_conn.commit()
+        except Exception:
+            raw_conn.rollback()
+            raise
+        finally:
+            raw_conn.close()
+        return row_count
+
+    def _create_indexes(self, table_name: str):
+        """
+        Index the commonly filtered/grouped columns and refresh planner statistics.
+        """
+        insp = inspect(self.engine)
+        column_names = {col["name"] for col in insp.get_columns(table_name)}
+        with self.engine.begin() as conn:
+            for col in INDEX_COLUMNS:
+                if col in column_names:
+                    index_name = _quote(f"idx_{table_name}_{col}")
+                    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {index_name} ON {_quote(table_name)} ({_quote(col)})"))
+            conn.execute(text(f"ANALYZE {_quote(table_name)}"))
+
+    def _file_sha256(self, full_file_path: str, length: int = None) -> str:
+        """
+        SHA-256 of a file, or of its first `length` bytes.
+        """
+        digest = hashlib.sha256()
+        remaining = length
+        with open(full_file_path, "rb") as f:
+            while remaining is None or remaining > 0:
+                block = f.read(1 << 20 if remaining is None else min(1 << 20, remaining))
+                if not block:
+                    break
+                digest.update(block)
+                if remaining is not None:
+                    remaining -= len(block)
+        return digest.hexdigest()
+
+    def _read_manifest(self) -> dict:
+        """
+        Load the ingest manifest as {file name: entry}.
+        """
+        with self.engine.begin() as conn:
+            conn.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS {MANIFEST_TABLE} (
+                    file_name TEXT PRIMARY KEY,
+                    table_name TEXT,
+                    sha256 TEXT,
+                    mtime REAL,
+                    size INTEGER,
+                    row_count INTEGER,
+                    loaded_at REAL
+                )
+            """))
+            rows = conn.execute(text(f"SELECT * FROM {MANIFEST_TABLE}")).mappings().all()
+        return {row["file_name"]: dict(row) for row in rows}
+
+    def _write_manifest(self, entry: dict):
+        with self.engine.begin() as conn:
+            conn.execute(
+                text(f"INSERT OR REPLACE INTO {MANIFEST_TABLE} VALUES "
+                     "(:file_name, :table_name, :sha256, :mtime, :size, :row_count, :loaded_at)"),
+                {**entry, "loaded_at": time.time()},
+            )
+
+    def _plan_file(self, full_file_path: str, file_extension: str, previous: dict) -> tuple:
+        """
+        Decide how to bring one source file's table up to date.
+
+        Returns:
+            tuple: (action, sha256) where action is "skip" (unchanged), "touch"
+            (same content, new mtime), "append" (CSV that only grew at the end)
+            or "rebuild"
+        """
+        stat = os.stat(full_file_path)
+        if previous is not None and previous["size"] == stat.st_size and previous["mtime"] == stat.st_mtime:
+            return "skip", previous["sha256"]
+
+        sha256 = self._file_sha256(full_file_path)
+        if previous is None:
+            return "rebuild", sha256
+        if sha256 == previous["sha256"]:
+            return "touch", sha256
+
+        # Append-only extract: the old content is an unchanged prefix ending on a line break
+        if file_extension.lower() == ".csv" and stat.st_size > previous["size"] > 0:
+            with open(full_file_path, "rb") as f:
+                f.seek(previous["size"] - 1)
+                ends_on_line = f.read(1) == b"\n"
+            if ends_on_line and self._file_sha256(full_file_path, previous["size"]) == previous["sha256"]:
+                return "append", sha256
+        return "rebuild", sha256
+
+    def _load_file(self, full_file_path: str, file_extension: str, table_name: str) -> int:
+        """
+        Replace a table with the full contents of a source file.
+
+        Returns:
+            int: Number of rows loaded
+        """
+        if self.streaming:
+            affinities, chunks = self._read_chunks(full_file_path, file_extension)
+            row_count = self._write_table(table_name, affinities, chunks)
+        else:
+            # Always parse the source: snapshot dtypes are compacted (int8 ages,
+            # None for missing text), which would change the table schema
+            signature = file_signature(full_file_path)
+            if file_extension.lower() == ".csv":
+                df = pd.read_csv(full_file_path)
+            else:
+                df = pd.read_excel(full_file_path)
+            self._write_source_snapshot(full_file_path, df, signature)
+
+            # Clean column names
+            df = self._clean_column_names(df)
+
+            # Save DataFrame to SQL
+            df.to_sql(table_name, self.engine, if_exists="replace", index=False)
+            row_count = len(df)
+        self._create_indexes(table_name)
+        return row_count
+
+    @staticmethod
+    def _write_source_snapshot(full_file_path: str, df: pd.DataFrame, signature: list):
+        """
+        Save the parsed file as its columnar snapshot for the file statistics
+        tools (which never build one themselves)
+        """
+        try:
+            snapshot_from_frame(full_file_path, df, signature)
+        except OSError as e:
+            print(f"⚠️ No snapshot for {os.path.basename(full_file_path)}: {e}")
+
+    @staticmethod
+    def _drop_source_snapshot(full_file_path: str):
+        """
+        Delete a source file's snapshot (after an append it no longer matches
+        the file, and re-parsing the whole file would defeat the append)
+        """
+        try:
+            os.remove(snapshot_path_for(full_file_path))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"⚠️ Could not remove the snapshot of {os.path.basename(full_file_path)}: {e}")
+
+    def _drop_orphans(self, manifest: dict) -> list:
+        """
+        Reconcile the manifest with the source directory: forget files that were
+        deleted, and drop their tables (with their stats and schema cache rows)
+        unless another current file still loads into the same table.
+
+        Returns:
+            list: Tables dropped
+        """
+        current_tables = {os.path.splitext(f)[0].lower().replace(" ", "_") for f in self.file_dir_list}
+        orphans = {file: entry for file, entry in manifest.items() if file not in self.file_dir_list}
+        if not orphans:
+            return []
+
+        existing = set(inspect(self.engine).get_table_names())
+        dropped = []
+        with self.engine.begin() as conn:
+            for file, entry in orphans.items():
+                conn.execute(text(f"DELETE FROM {MANIFEST_TABLE} WHERE file_name = :f"), {"f": file})
+                self._drop_source_snapshot(os.path.join(self.files_directory, file))
+                table_name = entry["table_name"]
+                if table_name in current_tables or table_name in dropped:
+                    continue
+                conn.execute(text(f"DROP TABLE IF EXISTS {_quote(table_name)}"))
+                for bookkeeping in STATS_TABLES + (SCHEMA_CACHE_TABLE,):
+                    if bookkeeping in existing:
+                        conn.execute(text(f"DELETE FROM {bookkeeping} WHERE table_name = :t"), {"t": table_name})
+                dropped.append(table_name)
+        for table_name in dropped:
+            print(f"🗑️  Dropped table: {table_name} (source file removed)")
+        return dropped
+
+    def _append_file(self, full_file_path: str, table_name: str, offset: int) -> int:
+        """
+        Insert the rows after byte `offset` of a CSV into its existing table.
+
+        Returns:
+            int: Number of rows appended
+        """
+        insp = inspect(self.engine)
+        columns = [col["name"] for col in insp.get_columns(table_name)]
+        with open(full_file_path, "rb") as f:
+            f.seek(offset)
+            tail = pd.read_csv(f, header=None, names=columns, chunksize=self.chunksize)
+            placeholders = ", ".join("?" * len(columns))
+            insert_sql = f"INSERT INTO {_quote(table_name)} VALUES ({placeholders})"
+            row_count = 0
+            raw_conn = self.engine.raw_connection()
+            try:
+                cursor = raw_conn.cursor()
+                for chunk in tail:
+                    cursor.executemany(insert_sql, _sqlite_rows(chunk))
+                    row_count += len(chunk)
+                raw_conn.commit()
+            except Exception:
+                raw_conn.rollback()
+                raise
+            finally:
+                raw_conn.close()
+        return row_count
+
+    def _load_files_parallel(self, rebuilds: list):
+        """
+        Parse source files in a process pool and write each parsed frame from
+        this process as soon as it is ready (the single SQLite writer).
+
+        Yields:
+            tuple: (table_name, manifest entry, row count) per loaded file
+        """
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(rebuilds))) as pool:
+            futures = {
+                pool.submit(_parse_source_file, full_file_path, file_extension): (table_name, entry)
+                for full_file_path, file_extension, table_name, entry in rebuilds
+            }
+            for future in as_completed(futures):
+                table_name, entry = futures[future]
+                affinities, df = future.result()
+                chunks = (df.iloc[start:start + self.chunksize] for start in range(0, len(df), self.chunksize))
+                row_count = self._write_table(table_name, affinities, chunks)
+                self._create_indexes(table_name)
+                yield table_name, entry, row_count
+
+    def _prepare_db(self, force: bool = False) -> list:
         """
         Convert CSV/XLSX files into SQL tables.
         Table name = file name (without extension).
+
+        Files recorded unchanged in the ingest manifest are skipped, CSVs that
+        only grew get their new rows appended (and their stale snapshot removed),
+        everything else is reloaded, and tables of deleted files are dropped.
+
+        Args:
+            force (bool): Reload every file regardless of the manifest.
+
+        Returns:
+            list: Tables whose contents changed
         """
+        self._enable_wal()
+        manifest = self._read_manifest()
+        self._drop_orphans(manifest)
+        changed_tables = []
+        rebuilds = []
+
         for file in self.file_dir_list:
             full_file_path = os.path.join(self.files_directory, file)
             file_name, file_extension = os.path.splitext(file)
             table_name = file_name.lower().replace(" ", "_")
 
-            # Read file
-            if file_extension.lower() == ".csv":
-                df = pd.read_csv(full_file_path)
-            elif file_extension.lower() == ".xlsx":
-                df = pd.read_excel(full_file_path)
-            else:
+            if file_extension.lower() not in (".csv", ".xlsx"):
                 print(f"⚠️ Skipping unsupported file: {file}")
                 continue
 
-            # Clean column names
-            df = self._clean_column_names(df)
+            previous = None if force else manifest.get(file)
+            action, sha256 = self._plan_file(full_file_path, file_extension, previous)
+            stat = os.stat(full_file_path)
+            entry = {"file_name": file, "table_name": table_name, "sha256": sha256,
+                     "mtime": stat.st_mtime, "size": stat.st_size}
 
-            # Save DataFrame to SQL
-            df.to_sql(table_name, self.engine, if_exists="replace", index=False)
-            print(f"📌 Saved table: {table_name} ({len(df)} rows)")
+            if action == "skip":
+                print(f"⏭️  Unchanged: {table_name}")
+            elif action == "touch":
+                self._write_manifest({**entry, "row_count": previous["row_count"]})
+                print(f"⏭️  Unchanged (touched): {table_name}")
+            elif action == "append":
+                appended = self._append_file(full_file_path, table_name, previous["size"])
+                self._drop_source_snapshot(full_file_path)
+                row_count = previous["row_count"] + appended
+                self._write_manifest({**entry, "row_count": row_count})
+                changed_tables.append(table_name)
+                print(f"➕ Appended to table: {table_name} (+{appended} rows, {row_count} total)")
+            else:
+                rebuilds.append((full_file_path, file_extension, table_name, entry))
+
+        start_time = time.perf_counter()
+        if self.workers > 1 and len(rebuilds) > 1:
+            loaded = self._load_files_parallel(rebuilds)
+        else:
+            loaded = (
+                (table_name, entry, self._load_file(full_file_path, file_extension, table_name))
+                for full_file_path, file_extension, table_name, entry in rebuilds
+            )
+        for table_name, entry, row_count in loaded:
+            self._write_manifest({**entry, "row_count": row_count})
+            changed_tables.append(table_name)
+            elapsed = time.perf_counter() - start_time
+            print(f"📌 Saved table: {table_name} ({row_count} rows, {elapsed:.2f}s elapsed)")
 
         print("==============================")
-        print("✅ All files saved into the SQL database.")
+        print(f"✅ All files saved into the SQL database ({len(changed_tables)} tables changed).")
+        return changed_tables
 
     def _validate_db(self):
         """
@@ -87,14 +530,163 @@ class PrepareSQLFromTabularData:
         print("📊 Available tables in database:", table_names)
         print("==============================")
 
-    def run_pipeline(self):
+    def _data_tables(self) -> list:
+        """
+        List the patient tables, excluding the summary tables.
+        """
+        insp = inspect(self.engine)
+        return [t for t in insp.get_table_names() if t not in INTERNAL_TABLES]
+
+    def _materialize_stats(self, tables: list = None):
+        """
+        Precompute per-table and per-column summaries into summary tables:
+        - stats_tables: row and column counts per table
+        - stats_columns: count / nulls / distinct / min / max / avg per column
+        - stats_distributions: value counts for low-cardinality columns
+          (sex, target, outcome, diagnosis, ...)
+
+        Args:
+            tables (list): Tables to refresh. Defaults to every patient table.
+        """
+        if tables is None:
+            tables = self._data_tables()
+        insp = inspect(self.engine)
+
+        with self.engine.begin() as conn:
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS stats_tables (
+                    table_name TEXT PRIMARY KEY,
+                    row_count INTEGER,
+                    column_count INTEGER,
+                    refreshed_at REAL
+                )
+            """))
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS stats_columns (
+                    table_name TEXT,
+                    column_name TEXT,
+                    non_null_count INTEGER,
+                    null_count INTEGER,
+                    distinct_count INTEGER,
+                    min_value REAL,
+                    max_value REAL,
+                    avg_value REAL,
+                    PRIMARY KEY (table_name, column_name)
+                )
+            """))
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS stats_distributions (
+                    table_name TEXT,
+                    column_name TEXT,
+                    value TEXT,
+                    count INTEGER,
+                    PRIMARY KEY (table_name, column_name, value)
+                )
+            """))
+
+            for table_name in tables:
+                columns = insp.get_columns(table_name)
+                table_sql = _quote(table_name)
+                for stats_table in STATS_TABLES:
+                    conn.execute(text(f"DELETE FROM {stats_table} WHERE table_name = :t"), {"t": table_name})
+
+                row_count = conn.execute(text(f"SELECT COUNT(*) FROM {table_sql}")).scalar()
+                conn.execute(
+                    text("INSERT INTO stats_tables VALUES (:t, :rows, :cols, :ts)"),
+                    {"t": table_name, "rows": row_count, "cols": len(columns), "ts": time.time()},
+                )
+
+                for col in columns:
+                    col_sql = _quote(col["name"])
+                    numeric = isinstance(col["type"], (Integer, Float, Numeric))
+                    avg_expr = f"AVG({col_sql})" if numeric else "NULL"
+                    non_null, distinct, min_value, max_value, avg_value = conn.execute(text(f"""
+                        SELECT COUNT({col_sql}), COUNT(DISTINCT {col_sql}),
+                               MIN({col_sql}), MAX({col_sql}), {avg_expr}
+                        FROM {table_sql}
+                    """)).one()
+                    if not numeric:
+                        min_value = max_value = None
+                    conn.execute(
+                        text("INSERT INTO stats_columns VALUES (:t, :c, :nn, :nulls, :d, :mn, :mx, :avg)"),
+                        {"t": table_name, "c": col["name"], "nn": non_null, "nulls": row_count - non_null,
+                         "d": distinct, "mn": min_value, "mx": max_value, "avg": avg_value},
+                    )
+
+                    if distinct <= STATS_MAX_DISTINCT_VALUES:
+                        conn.execute(text(f"""
+                            INSERT INTO stats_distributions
+                            SELECT :t, :c, CAST({col_sql} AS TEXT), COUNT(*)
+                            FROM {table_sql}
+                            GROUP BY {col_sql}
+                        """), {"t": table_name, "c": col["name"]})
+
+                print(f"📈 Materialized stats: {table_name} ({len(columns)} columns)")
+
+    def _cache_schema(self, tables: list = None):
         """
-        Run the pipeline: import → validate.
+        Store each table's CREATE statement and sample rows (the text the SQL
+        agents would otherwise fetch with sql_db_list_tables / sql_db_schema on
+        every question) in the schema_cache table.
+
+        Args:
+            tables (list): Tables to refresh. Defaults to every patient table.
         """
-        self._prepare_db()
+        from langchain_community.utilities import SQLDatabase
+
+        if tables is None:
+            tables = self._data_tables()
+        db = SQLDatabase(self.engine, include_tables=tables, sample_rows_in_table_info=SCHEMA_SAMPLE_ROWS)
+
+        with self.engine.begin() as conn:
+            conn.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS {SCHEMA_CACHE_TABLE} (
+                    table_name TEXT PRIMARY KEY,
+                    table_info TEXT,
+                    refreshed_at REAL
+                )
+            """))
+            for table_name in tables:
+                conn.execute(
+                    text(f"INSERT OR REPLACE INTO {SCHEMA_CACHE_TABLE} VALUES (:t, :info, :ts)"),
+                    {"t": table_name, "info": db.get_table_info([table_name]), "ts": time.time()},
+                )
+                print(f"🗂️  Cached schema: {table_name}")
+
+    def run_pipeline(self, force: bool = False):
+        """
+        Run the pipeline: import → materialize stats → cache schema → validate.
+
+        Only tables whose source files changed are reloaded and re-summarized;
+        force=True rebuilds everything.
+        """
+        changed_tables = self._prepare_db(force=force)
+        if changed_tables:
+            self._materialize_stats(changed_tables)
+            self._cache_schema(changed_tables)
         self._validate_db()
 
 
+def _parse_source_file(full_file_path: str, file_extension: str) -> tuple:
+    """
+    Process-pool worker: parse one source file into a typed DataFrame with
+    cleaned column names (module level so it can be pickled).
+
+    Returns:
+        tuple: ({cleaned column: SQLite affinity}, DataFrame)
+    """
+    if file_extension.lower() == ".csv":
+        sample = pd.read_csv(full_file_path, nrows=INGEST_SNIFF_ROWS)
+        dtypes, affinities = PrepareSQLFromTabularData._sniff_types(sample)
+        df = _conform_dtypes(pd.read_csv(full_file_path, dtype=_csv_read_dtypes(dtypes)), dtypes)
+    else:
+        df = pd.read_excel(full_file_path)
+        dtypes, affinities = PrepareSQLFromTabularData._sniff_types(df)
+        df = df.astype(dtypes)
+    df = PrepareSQLFromTabularData._clean_column_names(df)
+    return dict(zip(df.columns, affinities.values())), df
+
+
 if __name__ == "__main__":
     # 👇 Update this path to where your CSV files are stored
     files_directory = r"F:\Assignment17\data\csv_xlsx"
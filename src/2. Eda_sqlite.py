@@ -1,20 +1,171 @@
 
+import os
 import sqlite3
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
 import pandas as pd
-from sqlalchemy import create_engine, inspect
+from sqlalchemy import inspect
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from db_engine import get_engine
+from sketches import HyperLogLog, QuantileSketch, RunningStats
+from snapshot import SNAPSHOT_DIR_NAME, SNAPSHOT_SUFFIX, Snapshot, snapshot_from_sqlite
+
+# Streaming EDA: rows fetched per cursor batch, and rows per parallel task
+# (a table is split into rowid ranges of this size); memory per worker is
+# bounded by one batch plus the fixed-size sketches
+EDA_CHUNK_ROWS = 50_000
+EDA_RANGE_ROWS = 1_000_000
+EDA_QUANTILES = (0.25, 0.5, 0.75)
+
+
+class ColumnProfile:
+    """
+    Single-pass, mergeable summary of one column: null count, running
+    moments, quantile sketch and distinct-count sketch.
+
+    Whether the column is numeric is fixed up front (see _numeric_columns), so
+    every chunk and rowid range of a column is summarised the same way.
+    """
+
+    def __init__(self, numeric: bool = True):
+        self.numeric = numeric
+        self.count = 0
+        self.nulls = 0
+        self.stats = RunningStats()
+        self.quantiles = QuantileSketch()
+        self.distinct = HyperLogLog()
+
+    def update(self, values) -> None:
+        items = np.array(values, dtype=object)
+        present = items[np.array([value is not None for value in values], dtype=bool)]
+        self.count += present.size
+        self.nulls += len(values) - present.size
+        if not self.numeric:
+            self.distinct.update(present)
+            return
+        try:
+            numbers = present.astype(np.float64)
+        except (TypeError, ValueError):
+            # Stray text in a numeric column is counted but left out of the moments
+            numbers = pd.to_numeric(pd.Series(present), errors="coerce").to_numpy(dtype=np.float64)
+            numbers = numbers[~np.isnan(numbers)]
+        self.stats.update(numbers)
+        self.quantiles.update(numbers)
+        self.distinct.update(numbers)
+
+    def merge(self, other: "ColumnProfile") -> None:
+        if other.numeric != self.numeric:
+            raise ValueError("Cannot merge numeric and text profiles of a column")
+        self.count += other.count
+        self.nulls += other.nulls
+        self.stats.merge(other.stats)
+        self.quantiles.merge(other.quantiles)
+        self.distinct.merge(other.distinct)
+
+    def summary(self) -> dict:
+        summary = {
+            "count": self.count, "nulls": self.nulls, "distinct~": self.distinct.estimate(),
+            "mean": self.stats.mean if self.stats.count else None, "std": self.stats.std, "min": self.stats.min,
+        }
+        for q, value in zip(EDA_QUANTILES, self.quantiles.quantiles(EDA_QUANTILES)):
+            summary[f"{q:.0%}~"] = value
+        summary["max"] = self.stats.max
+        return summary
+
+
+def _numeric_affinity(declared_type: str):
+    """
+    SQLite column affinity of a declared type: True for INTEGER, REAL and
+    NUMERIC, False for TEXT, None for BLOB (no declared type)
+    """
+    declared_type = (declared_type or "").upper()
+    if "INT" in declared_type:
+        return True
+    if any(word in declared_type for word in ("CHAR", "CLOB", "TEXT")):
+        return False
+    if "BLOB" in declared_type or not declared_type:
+        return None
+    return True
+
+
+def _numeric_columns(conn, table_name: str) -> dict:
+    """
+    {column: numeric?} for a table, from the declared affinity; untyped columns
+    follow the type of their first stored value
+    """
+    numeric = {}
+    for _, name, declared_type, *_ in conn.execute(f'PRAGMA table_info("{table_name}")').fetchall():
+        affinity = _numeric_affinity(declared_type)
+        if affinity is None:
+            first = conn.execute(
+                f'SELECT typeof("{name}") FROM "{table_name}" WHERE "{name}" IS NOT NULL LIMIT 1').fetchone()
+            affinity = first is not None and first[0] in ("integer", "real")
+        numeric[name] = affinity
+    return numeric
+
+
+def _profile_range(db_path: str, table_name: str, low: int, high: int, chunk_rows: int,
+                   numeric: dict) -> tuple:
+    """
+    Process-pool worker: profile rows low..high (rowid) of a table through a
+    chunked cursor, never holding more than chunk_rows rows. numeric maps
+    each column to the mode chosen once for the whole table.
+
+    Returns:
+        tuple: (table name, {column: ColumnProfile})
+    """
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        cursor = conn.execute(f'SELECT * FROM "{table_name}" WHERE rowid BETWEEN ? AND ?', (low, high))
+        names = [description[0] for description in cursor.description]
+        profiles = {name: ColumnProfile(numeric=numeric.get(name, True)) for name in names}
+        while True:
+            rows = cursor.fetchmany(chunk_rows)
+            if not rows:
+                break
+            for name, values in zip(names, zip(*rows)):
+                profiles[name].update(values)
+    finally:
+        conn.close()
+    return table_name, profiles
 
 class SQLiteEDA:
     """
     Perform Exploratory Data Analysis (EDA) on an existing SQLite database.
     """
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, use_snapshots: bool = True):
         self.db_path = db_path
-        self.engine = create_engine(f"sqlite:///{db_path}")
-        self.conn = sqlite3.connect(db_path)
+        # Shared read-only engine: pooled connections, WAL and mmap page cache
+        self.engine = get_engine(db_path)
         self.inspector = inspect(self.engine)
+        # Columnar table snapshots next to the database (see snapshot.py)
+        self.snapshot_dir = os.path.join(os.path.dirname(os.path.abspath(db_path)), SNAPSHOT_DIR_NAME) \
+            if use_snapshots else None
         print(f"✅ Connected to database: {db_path}")
 
+    def _table_snapshot(self, table_name: str):
+        """
+        Memory-mapped snapshot of a table, rebuilt when the database changed;
+        None when snapshots are disabled or cannot be written
+        """
+        if self.snapshot_dir is None:
+            return None
+        path = os.path.join(self.snapshot_dir, table_name + SNAPSHOT_SUFFIX)
+        try:
+            snapshot = Snapshot(path)
+            if snapshot.is_current():
+                return snapshot
+            snapshot.close()
+        except (OSError, ValueError):
+            pass
+        try:
+            return Snapshot(snapshot_from_sqlite(self.db_path, table_name, path))
+        except OSError:
+            return None
+
     def list_tables(self):
         """
         List all tables in the database.
@@ -37,7 +188,7 @@ class SQLiteEDA:
             print(f"     - {col['name']} ({col['type']})")
 
         # Row count
-        count = pd.read_sql(f"SELECT COUNT(*) as count FROM {table_name}", self.conn)
+        count = pd.read_sql(f"SELECT COUNT(*) as count FROM {table_name}", self.engine)
         print(f"   Total rows: {count['count'][0]}")
 
     def sample_data(self, table_name: str, n: int = 5):
@@ -45,7 +196,7 @@ class SQLiteEDA:
         Show first n rows from the table.
         """
         print(f"\n🔍 Sample rows from {table_name}:")
-        df = pd.read_sql(f"SELECT * FROM {table_name} LIMIT {n}", self.conn)
+        df = pd.read_sql(f"SELECT * FROM {table_name} LIMIT {n}", self.engine)
         print(df)
 
     def basic_statistics(self, table_name: str):
@@ -53,18 +204,102 @@ class SQLiteEDA:
         Generate basic descriptive statistics for numeric columns.
         """
         print(f"\n📈 Basic stats for {table_name}:")
-        df = pd.read_sql(f"SELECT * FROM {table_name}", self.conn)
+        snapshot = self._table_snapshot(table_name)
+        if snapshot is not None:
+            # Column blocks mapped from the snapshot instead of SELECT * through pandas
+            df = snapshot.to_frame()
+            snapshot.close()
+        else:
+            df = pd.read_sql(f"SELECT * FROM {table_name}", self.engine)
         print(df.describe(include="all"))
 
-    def run_eda(self):
+    def _row_ranges(self, table_name: str, range_rows: int) -> list:
+        """
+        Split a table into rowid ranges of about range_rows rows (pushed-down MIN/MAX)
+        """
+        with self.engine.connect() as conn:
+            # Separate subqueries: SQLite only uses the b-tree ends for a lone MIN/MAX
+            low, high = conn.exec_driver_sql(
+                f'SELECT (SELECT MIN(rowid) FROM "{table_name}"), (SELECT MAX(rowid) FROM "{table_name}")'
+            ).fetchone()
+        if low is None:
+            return [(0, -1)]
+        return [(start, min(start + range_rows - 1, high)) for start in range(low, high + 1, range_rows)]
+
+    def profile_tables(self, tables: list, workers: int = 1, chunk_rows: int = EDA_CHUNK_ROWS,
+                       range_rows: int = EDA_RANGE_ROWS) -> dict:
+        """
+        Streaming statistics for several tables in one pass each: every table
+        is split into rowid ranges, ranges are profiled in parallel processes
+        and their sketches merged per table.
+
+        Returns:
+            dict: {table: DataFrame of per-column statistics (columns as columns)}
+        """
+        db_path = os.path.abspath(self.db_path)
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            numeric = {table_name: _numeric_columns(conn, table_name) for table_name in tables}
+        finally:
+            conn.close()
+        tasks = [(table_name, low, high) for table_name in tables
+                 for low, high in self._row_ranges(table_name, range_rows)]
+        merged = {}
+
+        def collect(table_name, profiles):
+            if table_name not in merged:
+                merged[table_name] = profiles
+                return
+            for name, profile in profiles.items():
+                merged[table_name][name].merge(profile)
+
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(_profile_range, db_path, table_name, low, high, chunk_rows,
+                                           numeric[table_name])
+                           for table_name, low, high in tasks]
+                for future in as_completed(futures):
+                    collect(*future.result())
+        else:
+            for table_name, low, high in tasks:
+                collect(*_profile_range(db_path, table_name, low, high, chunk_rows, numeric[table_name]))
+
+        return {
+            table_name: pd.DataFrame({name: profile.summary() for name, profile in merged[table_name].items()})
+            for table_name in tables
+        }
+
+    def streaming_statistics(self, table_name: str, workers: int = 1) -> pd.DataFrame:
+        """
+        Descriptive statistics without loading the table: count, nulls,
+        approximate distinct count, mean, std, min, approximate quartiles, max.
+        """
+        print(f"\n📈 Streaming stats for {table_name}:")
+        stats = self.profile_tables([table_name], workers=workers)[table_name]
+        print(stats)
+        return stats
+
+    def run_eda(self, streaming: bool = True, workers: int = None):
         """
         Run full EDA on all tables in the DB.
+
+        Args:
+            streaming (bool): Sketch-based statistics in fixed memory (all tables
+                profiled in parallel) instead of loading each table into pandas
+            workers (int): Profiling processes (default: CPU count)
         """
         tables = self.list_tables()
+        profiles = {}
+        if streaming:
+            profiles = self.profile_tables(tables, workers=workers or os.cpu_count() or 1)
         for t in tables:
             self.table_info(t)
             self.sample_data(t, n=5)
-            self.basic_statistics(t)
+            if streaming:
+                print(f"\n📈 Streaming stats for {t}:")
+                print(profiles[t])
+            else:
+                self.basic_statistics(t)
             print("=" * 60)
 
 
@@ -6,11 +6,16 @@ This script creates database-specific tools for medical data analysis.
 """
 
 import os
+import sys
 from pyprojroot import here
 
 from langchain_core.tools import tool
-from langchain_community.utilities import SQLDatabase
 from langchain_community.agent_toolkits import create_sql_agent
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from db_engine import get_sql_database
+from columnar import ColumnStore
+from index_advisor import install_query_recorder
 from langchain_openai import ChatOpenAI
 
 print("🛠️  Database-Specific Agent Tools")
@@ -20,7 +25,17 @@ print("=" * 35)
 # Database & LLM Setup
 # -------------------------------
 db_path = os.path.join(str(here("/assignment17/src/databases")), "PatientsDB.db")
-db = SQLDatabase.from_uri(f"sqlite:///{db_path}")
+db = get_sql_database(db_path)  # shared read-only engine and connection pool
+install_query_recorder()  # log the tools' SQL for the index advisor
+# ANALYTICS_BACKEND=columnar: age/gender helpers scan NumPy columns instead of SQLite
+column_store = ColumnStore.from_sqlite(db_path) if os.getenv("ANALYTICS_BACKEND") == "columnar" else None
+
+def current_column_store():
+    """The column store, reloaded from SQLite once the database changed (None on the sqlite backend)."""
+    global column_store
+    if column_store is not None and not column_store.is_current():
+        column_store = ColumnStore.from_sqlite(db_path)
+    return column_store
 
 token = os.getenv("GITHUB_API_TOKEN", "your_github_token_here")
 endpoint = "https://models.github.ai/inference"
@@ -63,6 +78,10 @@ def count_patients_by_disease(disease_type: str) -> str:
 def get_age_statistics(disease_type: str) -> str:
     """Get age statistics for a specific disease type."""
     try:
+        store = current_column_store()
+        if store is not None:
+            stats = store.age_statistics(f"{disease_type}_patients")
+            return f"Age statistics for {disease_type}:\n{[tuple(stats.values())]}"
         result = db.run(f"""
             SELECT 
                 MIN(Age) as min_age,
@@ -79,6 +98,10 @@ def get_age_statistics(disease_type: str) -> str:
 def get_gender_distribution(disease_type: str) -> str:
     """Get gender distribution for a specific disease type."""
     try:
+        store = current_column_store()
+        if store is not None:
+            result = store.group_count(f"{disease_type}_patients", "Sex")
+            return f"Gender distribution for {disease_type}:\n{result}"
         result = db.run(f"""
             SELECT Sex, COUNT(*) as count
             FROM {disease_type}_patients
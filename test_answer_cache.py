@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test Script for the Answer Cache
+================================
+
+Checks query normalization, TTL/LRU eviction and database invalidation
+without calling any LLM or web search API.
+"""
+
+import sys
+import os
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from answer_cache import AnswerCache, normalize_query
+
+def test_normalize_query():
+    """
+    Trivially different phrasings normalize to the same text
+    """
+    assert normalize_query("Symptoms of Diabetes?") == "symptoms of diabetes"
+    assert normalize_query("  please, symptoms   of diabetes!! ") == "symptoms of diabetes"
+    assert AnswerCache.make_key("How many heart disease patients?", "database", ["b", "a"]) == \
+        AnswerCache.make_key("how many heart disease patients", "database", ["a", "b"])
+    assert AnswerCache.make_key("q", "database", ["a"], "fast") != AnswerCache.make_key("q", "database", ["a"], "full")
+
+def test_ttl_and_lru_eviction():
+    """
+    Entries expire after their TTL and the least recently used entry is evicted first
+    """
+    cache = AnswerCache(max_entries=2, web_ttl=0.05)
+    cache.set(("a",), {"response": "A"}, "web")
+    time.sleep(0.1)
+    assert cache.get(("a",)) is None
+
+    cache.web_ttl = 60
+    cache.set(("a",), {"response": "A"}, "web")
+    cache.set(("b",), {"response": "B"}, "web")
+    cache.get(("a",))
+    cache.set(("c",), {"response": "C"}, "web")
+    assert cache.get(("b",)) is None
+    assert cache.get(("a",))[0] == {"response": "A"}
+    assert cache.get(("c",))[0] == {"response": "C"}
+
+def test_database_change_invalidates_db_answers():
+    """
+    Rewriting the database drops database answers but keeps web answers
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_file = os.path.join(tmp_dir, "PatientsDB.db")
+        with open(db_file, "w") as f:
+            f.write("v1")
+
+        cache = AnswerCache(db_path=db_file)
+        cache.set(("db",), {"response": "42 patients"}, "database")
+        cache.set(("web",), {"response": "definition"}, "web")
+        assert cache.get(("db",)) is not None
+
+        with open(db_file, "w") as f:
+            f.write("version 2")
+        assert cache.get(("db",)) is None
+        assert cache.get(("web",)) is not None
+
+class FixedRuleEngine:
+    """
+    Rule engine stand-in that answers every query
+    """
+
+    def answer(self, query: str) -> dict:
+        return {"response": "rule engine answer", "template": "count", "table": "cancer_patients"}
+
+def test_routing_modes_are_cached_separately():
+    """
+    A fast-mode rule engine answer is not served to a full-mode request
+    """
+    from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+    from langchain_core.messages import AIMessage
+
+    import main
+    from conversation_memory import BoundedMemorySaver
+
+    class ScriptedChatModel(GenericFakeChatModel):
+        def bind_tools(self, tools, **kwargs):
+            return self
+
+    analysis = '{"intent": "database", "confidence": 0.9, "reasoning": "fake", "recommended_tools": []}'
+    llm = ScriptedChatModel(messages=iter([AIMessage(content=analysis), AIMessage(content="agent answer")]))
+    agent = main.MedicalRoutingAgent(llm, BoundedMemorySaver(), rule_engine=FixedRuleEngine())
+    main.components._instances["intelligent_medical_agent"] = agent
+    try:
+        main.answer_cache.clear()
+        query = "How many cancer patients are there?"
+        assert main.search_medical_query(query, routing_mode="fast")["response"] == "rule engine answer"
+        full = main.search_medical_query(query, routing_mode="full")
+        assert full["response"] == "agent answer" and not full["cache"]["hit"]
+        assert main.search_medical_query(query, routing_mode="fast")["cache"]["hit"]
+    finally:
+        main.components.reset("intelligent_medical_agent")
+        main.answer_cache.clear()
+
+def test_entries_are_tagged_with_the_executed_intent():
+    """
+    A keyword-"web" query answered by the database agent (LLM override in fast
+    mode, every tool in full mode) is stored as a database-dependent entry
+    """
+    from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+    from langchain_core.messages import AIMessage
+
+    import main
+    from conversation_memory import BoundedMemorySaver
+
+    class ScriptedChatModel(GenericFakeChatModel):
+        def bind_tools(self, tools, **kwargs):
+            return self
+
+    analysis = '{"intent": "database", "confidence": 0.9, "reasoning": "fake", "recommended_tools": []}'
+    llm = ScriptedChatModel(messages=iter([AIMessage(content=analysis), AIMessage(content="fast answer"),
+                                           AIMessage(content=analysis), AIMessage(content="full answer")]))
+    agent = main.MedicalRoutingAgent(llm, BoundedMemorySaver())
+    main.components._instances["intelligent_medical_agent"] = agent
+    # Web keywords outweigh database ones, but both sides match: the analysis runs
+    query = "Symptoms and treatment of diabetes in our patients"
+    assert agent._fallback_routing(query)["intent"] == "web"
+    try:
+        main.answer_cache.clear()
+        for routing_mode in ("fast", "full"):
+            main.search_medical_query(query, routing_mode=routing_mode)
+            key, _ = main._answer_cache_key(query, None, True, routing_mode)
+            entry = main.answer_cache._entries[key]
+            assert entry["db_signature"] is not None, routing_mode
+            assert entry["expires_at"] - entry["created_at"] <= main.answer_cache.db_ttl
+    finally:
+        main.components.reset("intelligent_medical_agent")
+        main.answer_cache.clear()
+
+if __name__ == "__main__":
+    print("🗄️  Answer Cache Test Suite")
+    print("=" * 60)
+
+    for test in (test_normalize_query, test_ttl_and_lru_eviction, test_database_change_invalidates_db_answers,
+                 test_routing_modes_are_cached_separately, test_entries_are_tagged_with_the_executed_intent):
+        test()
+        print(f"✅ PASS: {test.__name__}")
+
+    print("\n✅ Test Suite Completed!")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test Script for Batch Search Input and Backend Rate Limits
+==========================================================
+
+Checks JSONL / plain-text batch parsing and that the shared per-backend
+limiters pace calls (and never block when unlimited).
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from batch_search import _normalize_item, parse_query_lines
+from rate_limits import BackendRateLimiter, rate_limit_sql_database, rate_limiter, set_rate_limit
+
+def test_parse_query_lines():
+    """
+    JSONL strings and objects, plain text and blank lines
+    """
+    items = parse_query_lines([
+        '"What are the symptoms of diabetes?"\n',
+        '{"query": "How many cancer patients?", "tools": ["cancer_query"], "use_intelligent_routing": false}\n',
+        "\n",
+        "How is heart disease treated?\n",
+        "42\n",
+    ])
+    assert items == [
+        "What are the symptoms of diabetes?",
+        {"query": "How many cancer patients?", "tools": ["cancer_query"], "use_intelligent_routing": False},
+        "How is heart disease treated?",
+        "42",
+    ]
+    options = _normalize_item(items[1], {"routing_mode": "full", "use_intelligent_routing": True})
+    assert options == {"query": "How many cancer patients?", "tools": ["cancer_query"],
+                       "use_intelligent_routing": False, "routing_mode": "full"}
+    assert _normalize_item("q", {})["query"] == "q"
+
+def test_rate_limiter_paces_calls():
+    """
+    20 requests/second: 5 calls take about 0.2s; unlimited calls never wait
+    """
+    limiter = BackendRateLimiter(requests_per_second=20)
+    start_time = time.perf_counter()
+    for _ in range(5):
+        limiter.acquire()
+    assert 0.15 <= time.perf_counter() - start_time < 1.0
+
+    limiter.set_rate(0)
+    start_time = time.perf_counter()
+    for _ in range(1000):
+        limiter.acquire()
+    assert time.perf_counter() - start_time < 0.1
+
+def test_sql_database_is_rate_limited():
+    """
+    SQL agent queries wait for the shared "sqlite" limiter
+    """
+    from langchain_community.utilities import SQLDatabase
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_file = os.path.join(tmp_dir, "PatientsDB.db")
+        conn = sqlite3.connect(db_file)
+        conn.execute("CREATE TABLE cancer_patients (age INTEGER)")
+        conn.commit()
+        conn.close()
+
+        db = rate_limit_sql_database(SQLDatabase.from_uri(f"sqlite:///{db_file}"))
+        assert db.run("SELECT COUNT(*) FROM cancer_patients") == "[(0,)]"
+        set_rate_limit("sqlite", 10)
+        try:
+            start_time = time.perf_counter()
+            for _ in range(3):
+                db.run("SELECT COUNT(*) FROM cancer_patients")
+            assert time.perf_counter() - start_time >= 0.15
+        finally:
+            set_rate_limit("sqlite", 0)
+        assert rate_limiter("sqlite").requests_per_second == 0
+
+if __name__ == "__main__":
+    test_parse_query_lines()
+    test_rate_limiter_paces_calls()
+    test_sql_database_is_rate_limited()
+    print("✅ Batch search tests passed")
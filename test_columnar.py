@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Test Script for the Columnar Analytics Backend
+==============================================
+
+Checks that ColumnStore aggregates match SQLite on a tiny patient database,
+that a saved store memory-maps back, that the rule engine uses the store
+only while it matches the database file, and that the served store is
+rebuilt once the file changes.
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from columnar import ColumnStore
+from query_engine import RuleBasedQueryEngine
+
+def _build_test_db(db_file: str):
+    conn = sqlite3.connect(db_file)
+    conn.execute("CREATE TABLE heart_disease_patients (age INTEGER, sex INTEGER, chol REAL, target INTEGER)")
+    conn.executemany("INSERT INTO heart_disease_patients VALUES (?, ?, ?, ?)",
+                     [(40, 1, 200.0, 1), (60, 0, None, 0), (50, 1, 250.0, 1), (70, 0, 300.0, 1)])
+    conn.execute("CREATE TABLE cancer_patients (Age INTEGER, Gender INTEGER, Diagnosis TEXT)")
+    conn.executemany("INSERT INTO cancer_patients VALUES (?, ?, ?)", [(30, 0, "benign"), (70, 1, "malignant")])
+    conn.commit()
+    conn.close()
+
+def test_aggregates_match_sqlite():
+    """
+    Filters, aggregates and group-bys give the same answers as SQL
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_file = os.path.join(tmp_dir, "PatientsDB.db")
+        _build_test_db(db_file)
+        store = ColumnStore.from_sqlite(db_file)
+
+        assert set(store.tables) == {"heart_disease_patients", "cancer_patients"}
+        assert store.tables["heart_disease_patients"]["age"].dtype == np.int8
+        assert store.tables["cancer_patients"]["Diagnosis"].dtype == object
+
+        table = "heart_disease_patients"
+        assert store.count(table) == 4
+        assert store.count(table, where=[("age", ">=", 50), ("target", "=", 1)]) == 2
+        assert store.aggregate(table, "chol", "avg") == 250.0  # NULL ignored, as in SQL
+        assert store.aggregate(table, "chol", "count") == 3
+        assert store.aggregate(table, "age", "max", where=[("sex", "=", 1)]) == 50
+        assert store.group_count(table, "sex") == [(0, 2), (1, 2)]
+        assert store.group_aggregate(table, "sex", "age", "avg") == [(0, 65.0), (1, 45.0)]
+        assert store.group_aggregate(table, "target", "chol", "min") == [(0, None), (1, 200.0)]
+        # Age / age spelling differences are tolerated
+        assert store.age_statistics("cancer_patients") == {
+            "min_age": 30, "max_age": 70, "avg_age": 50.0, "total_patients": 2
+        }
+
+def test_saved_store_is_memory_mapped():
+    """
+    save() / load() round-trips, numeric columns come back as read-only memory maps
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_file = os.path.join(tmp_dir, "PatientsDB.db")
+        _build_test_db(db_file)
+        ColumnStore.from_sqlite(db_file).save(os.path.join(tmp_dir, "columnar"))
+
+        store = ColumnStore.load(os.path.join(tmp_dir, "columnar"))
+        ages = store.tables["heart_disease_patients"]["age"]
+        assert not ages.flags.owndata and not ages.flags.writeable
+        assert list(store.tables["cancer_patients"]["Diagnosis"]) == ["benign", "malignant"]
+        assert store.is_current()
+        assert store.count("heart_disease_patients", where=[("target", "=", 1)]) == 3
+
+def test_rule_engine_uses_current_store_only():
+    """
+    The rule engine answers from the store, and from SQLite once the database changed
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_file = os.path.join(tmp_dir, "PatientsDB.db")
+        _build_test_db(db_file)
+        engine = RuleBasedQueryEngine(db_file, column_store=ColumnStore.from_sqlite(db_file))
+
+        answer = engine.answer("How many heart disease patients are there by sex?")
+        assert answer["backend"] == "columnar"
+        assert answer["response"] == "Gender distribution for heart disease patients: sex=0: 2, sex=1: 2."
+        assert engine.answer("average age of cancer patients")["response"] == \
+            "The average age of cancer patients is 50.0 years."
+
+        conn = sqlite3.connect(db_file)
+        conn.execute("INSERT INTO heart_disease_patients VALUES (45, 1, 180.0, 0)")
+        conn.commit()
+        conn.close()
+        os.utime(db_file, ns=(0, 0))  # force a new signature even within mtime granularity
+
+        answer = engine.answer("How many heart disease patients are there?")
+        assert answer["backend"] == "sqlite"
+        assert answer["response"] == "There are 5 heart disease patients in the database."
+
+def test_served_store_is_rebuilt_after_a_database_change():
+    """
+    main's rule engine rebuilds its memoized store once the database signature changes
+    """
+    import main
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_file = os.path.join(tmp_dir, "PatientsDB.db")
+        _build_test_db(db_file)
+        conn = sqlite3.connect(db_file)
+        conn.execute("CREATE TABLE diabetes_patients (Age INTEGER, Outcome INTEGER)")
+        conn.commit()
+        conn.close()
+
+        saved = (main.db_path, main.COLUMN_STORE_DIR, main.ANALYTICS_BACKEND)
+        main.db_path, main.COLUMN_STORE_DIR = db_file, os.path.join(tmp_dir, "columnar")
+        main.ANALYTICS_BACKEND = "columnar"
+        main.components.reset("column_store")
+        main.components.reset("rule_engine")
+        try:
+            engine = main.components.get("rule_engine")
+            first_store = main.components.get("column_store")
+            assert engine.answer("How many heart disease patients are there?")["backend"] == "columnar"
+
+            conn = sqlite3.connect(db_file)
+            conn.execute("INSERT INTO heart_disease_patients VALUES (45, 1, 180.0, 0)")
+            conn.commit()
+            conn.close()
+            os.utime(db_file, ns=(0, 0))
+
+            answer = engine.answer("How many heart disease patients are there?")
+            assert answer["backend"] == "columnar"
+            assert answer["response"] == "There are 5 heart disease patients in the database."
+            assert main.components.get("column_store") is not first_store
+            assert ColumnStore.load(main.COLUMN_STORE_DIR).is_current()
+        finally:
+            main.db_path, main.COLUMN_STORE_DIR, main.ANALYTICS_BACKEND = saved
+            main.components.reset("column_store")
+            main.components.reset("rule_engine")
+
+def test_store_built_on_a_wal_database_is_current():
+    """
+    Opening a WAL database creates an empty -wal file; a fresh store and snapshot still match it
+    """
+    from snapshot import Snapshot, snapshot_from_sqlite
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_file = os.path.join(tmp_dir, "PatientsDB.db")
+        _build_test_db(db_file)
+        conn = sqlite3.connect(db_file)
+        assert conn.execute("PRAGMA journal_mode = WAL").fetchone()[0] == "wal"
+        conn.close()
+        assert not os.path.exists(db_file + "-wal")
+
+        store = ColumnStore.from_sqlite(db_file)
+        assert store.is_current()
+        snapshot = Snapshot(snapshot_from_sqlite(db_file, "cancer_patients", os.path.join(tmp_dir, "cancer.snap")))
+        assert tuple(tuple(part) if part else None for part in snapshot.source["signature"]) == \
+            store.source_signature
+        snapshot.close()
+
+        conn = sqlite3.connect(db_file)
+        conn.execute("INSERT INTO cancer_patients VALUES (55, 0, 'benign')")
+        conn.commit()
+        assert not store.is_current()
+        conn.close()
+
+if __name__ == "__main__":
+    test_aggregates_match_sqlite()
+    test_saved_store_is_memory_mapped()
+    test_rule_engine_uses_current_store_only()
+    test_served_store_is_rebuilt_after_a_database_change()
+    test_store_built_on_a_wal_database_is_current()
+    print("✅ Columnar backend tests passed")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test Script for the Lazy Component Registry
+===========================================
+
+Checks that components are built once on first use (also under concurrent
+first requests), that a failed build is retried on the next use, and that
+reset() drops one or all memoized components.
+"""
+
+import sys
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from component_registry import ComponentRegistry
+
+def test_components_are_built_once_on_first_use():
+    """
+    Nothing is built at registration; concurrent first requests share one build
+    """
+    registry = ComponentRegistry()
+    builds = []
+
+    @registry.component("llm")
+    def build_llm():
+        builds.append(threading.get_ident())
+        time.sleep(0.1)
+        return object()
+
+    assert "llm" in registry and not registry.is_built("llm")
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        instances = list(pool.map(lambda _: registry.get("llm"), range(4)))
+    assert len(builds) == 1 and all(instance is instances[0] for instance in instances)
+    assert registry.is_built("llm") and registry.build_times()["llm"] >= 0.1
+
+    try:
+        registry.register("llm", object)
+        assert False, "duplicate registration accepted"
+    except ValueError:
+        pass
+    try:
+        registry.get("missing")
+        assert False, "unknown component built"
+    except KeyError:
+        pass
+
+def test_failed_build_is_retried():
+    """
+    A factory that raises is not memoized: the next get() builds it again
+    """
+    registry = ComponentRegistry()
+    attempts = []
+
+    @registry.component("web_search")
+    def build_web_search():
+        attempts.append(len(attempts))
+        if len(attempts) == 1:
+            raise ConnectionError("search API unreachable")
+        return "web search tool"
+
+    try:
+        registry.get("web_search")
+        assert False, "failed build was not raised"
+    except ConnectionError:
+        pass
+    assert not registry.is_built("web_search") and "web_search" not in registry.build_times()
+    assert registry.get("web_search") == "web search tool" and attempts == [0, 1]
+    assert registry.get("web_search") == "web search tool" and attempts == [0, 1]
+
+def test_reset_rebuilds_on_next_use():
+    """
+    reset(name) drops one component, reset() all of them; both are rebuilt on next use
+    """
+    registry = ComponentRegistry()
+    builds = {"llm": 0, "agent": 0}
+
+    def counting_factory(name):
+        def build():
+            builds[name] += 1
+            return object()
+        return build
+
+    for name in builds:
+        registry.register(name, counting_factory(name))
+
+    assert set(registry.build_all()) == {"llm", "agent"}
+    llm, agent = registry.get("llm"), registry.get("agent")
+
+    registry.reset("llm")
+    assert not registry.is_built("llm") and registry.is_built("agent")
+    assert registry.get("llm") is not llm and registry.get("agent") is agent
+    assert builds == {"llm": 2, "agent": 1}
+
+    registry.reset()
+    assert not registry.is_built("llm") and not registry.is_built("agent") and registry.build_times() == {}
+    registry.get("agent")
+    assert builds == {"llm": 2, "agent": 2}
+    # Resetting a component that was never built is a no-op
+    registry.reset("llm")
+    registry.reset("llm")
+
+if __name__ == "__main__":
+    test_components_are_built_once_on_first_use()
+    test_failed_build_is_retried()
+    test_reset_rebuilds_on_next_use()
+    print("✅ Component registry tests passed")
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Test Script for Bounded Conversation Memory
+===========================================
+
+Checks the per-turn history window, that a session's prompt stays flat over
+many turns, that idle and surplus threads are evicted, and that pruning
+stays within the thread being saved.
+"""
+
+import sys
+import os
+import time
+from collections import defaultdict
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langgraph.prebuilt import create_react_agent
+
+from conversation_memory import BoundedMemorySaver, is_ephemeral, make_history_hook, session_config, trim_history
+
+def test_trim_history_keeps_whole_turns():
+    """
+    Earlier turns are dropped oldest first; the current turn and system prompt always stay
+    """
+    messages = [SystemMessage(content="You are a medical assistant.")]
+    for turn in range(5):
+        messages += [
+            HumanMessage(content=f"question {turn} " * 20),
+            AIMessage(content="", tool_calls=[{"name": "cancer_query", "args": {}, "id": f"call_{turn}"}]),
+            ToolMessage(content="count=1500 " * 20, tool_call_id=f"call_{turn}"),
+            AIMessage(content=f"answer {turn} " * 20),
+        ]
+    kept = trim_history(messages, max_tokens=300)
+    assert isinstance(kept[0], SystemMessage)
+    assert isinstance(kept[1], HumanMessage) and len(kept) < len(messages)
+    assert kept[-4:] == messages[-4:]
+    assert trim_history(messages, max_tokens=100_000) == messages
+    # A single oversized turn is never cut
+    assert trim_history(messages[:5], max_tokens=1) == messages[:5]
+
+def test_session_prompt_stays_flat():
+    """
+    A long session keeps a bounded history and a single checkpoint
+    """
+    saver = BoundedMemorySaver()
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content=f"answer {i} " * 25) for i in range(30)]))
+    agent = create_react_agent(llm, tools=[], checkpointer=saver, pre_model_hook=make_history_hook(200))
+    config = session_config("user-1")
+    assert not is_ephemeral(config) and is_ephemeral(session_config())
+
+    sizes = []
+    for turn in range(30):
+        response = agent.invoke({"messages": [{"role": "user", "content": f"question {turn} " * 10}]}, config)
+        sizes.append(len(response["messages"]))
+    assert max(sizes[10:]) == sizes[-1] <= 6
+    assert response["messages"][-1].content.startswith("answer 29")
+    assert saver.stats()["checkpoints"] == 1
+
+def test_idle_and_surplus_threads_are_evicted():
+    """
+    Threads idle past idle_seconds go first, then the least recently used over max_threads
+    """
+    saver = BoundedMemorySaver(idle_seconds=0.05, max_threads=2)
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content=f"answer {i}") for i in range(10)]))
+    agent = create_react_agent(llm, tools=[], checkpointer=saver)
+
+    for session_id in ("a", "b", "c"):
+        agent.invoke({"messages": [{"role": "user", "content": "hi"}]}, session_config(session_id))
+    assert set(saver.storage) == {"session-b", "session-c"}
+
+    time.sleep(0.1)
+    agent.invoke({"messages": [{"role": "user", "content": "hi"}]}, session_config("d"))
+    assert set(saver.storage) == {"session-d"}
+    assert saver.stats()["evictions"] == 3
+
+class NoScanDict(defaultdict):
+    """
+    Storage dict that fails if a checkpointer call walks every thread's entries
+    """
+
+    def __iter__(self):
+        raise AssertionError("scanned every thread")
+
+    def keys(self):
+        raise AssertionError("scanned every thread")
+
+def test_pruning_touches_only_the_current_thread():
+    """
+    Saving a turn never walks other threads' blobs or writes, and leaves them intact
+    """
+    saver = BoundedMemorySaver()
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content=f"answer {i}") for i in range(20)]))
+    agent = create_react_agent(llm, tools=[], checkpointer=saver)
+    saver.blobs, saver.writes = NoScanDict(None), NoScanDict(dict)
+
+    for session_id in ("a", "b", "c"):
+        agent.invoke({"messages": [{"role": "user", "content": "hi"}]}, session_config(session_id))
+    others = {key: value for key, value in dict.items(saver.blobs) if key[0] != "session-a"}
+    for _ in range(5):
+        response = agent.invoke({"messages": [{"role": "user", "content": "again"}]}, session_config("a"))
+    assert len(response["messages"]) == 12
+    assert {key: value for key, value in dict.items(saver.blobs) if key[0] != "session-a"} == others
+    assert saver.stats()["checkpoints"] == 3
+
+    saver.delete_thread("session-a")
+    assert all(key[0] != "session-a" for key in dict.keys(saver.blobs))
+    assert all(key[0] != "session-a" for key in dict.keys(saver.writes))
+
+class MultiplyingChatModel(BaseChatModel):
+    """
+    Calls `multiply` once per question, then answers with its result
+    """
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    @property
+    def _llm_type(self) -> str:
+        return "multiplying-fake"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        last = messages[-1]
+        if isinstance(last, ToolMessage):
+            message = AIMessage(content=f"The product is {last.content}. " + "detail " * 10)
+        else:
+            message = AIMessage(content="", tool_calls=[{"name": "multiply", "args": {"a": 6, "b": 7},
+                                                         "id": f"call_{time.perf_counter_ns()}"}])
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+def test_stream_reports_only_this_turns_tool_calls():
+    """
+    With history trimmed, the pre_model_hook update must not replay earlier tool calls
+    """
+    import main
+    from conversation_memory import make_history_hook
+
+    build_hook = main._history_hook
+    main._history_hook = lambda: make_history_hook(150)
+    try:
+        agent = main.MedicalRoutingAgent(MultiplyingChatModel(), BoundedMemorySaver())
+    finally:
+        main._history_hook = build_hook
+
+    config = session_config("stream-user")
+    for turn in range(3):
+        events = list(agent.stream_route_and_execute(f"Multiply 6 by 7, please ({turn})", config,
+                                                     routing_mode="fast"))
+        names = [event for event, _ in events]
+        assert names.count("tool_call") == 1 and names.count("tool_result") == 1
+        result = events[-1][1]
+        assert result["tools_used"] == ["multiply"] and result["response"].startswith("The product is 42")
+        invoked = agent.route_and_execute(f"Multiply 6 by 7 again ({turn})", config, routing_mode="fast")
+        assert invoked["tools_used"] == ["multiply"]
+
+class HistoryEchoChatModel(BaseChatModel):
+    """
+    Answers with the number of user messages it was shown (routing analysis: "database")
+    """
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    @property
+    def _llm_type(self) -> str:
+        return "history-echo-fake"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if "Analyze this medical query" in str(messages[-1].content):
+            content = '{"intent": "database", "confidence": 0.9, "reasoning": "fake", "recommended_tools": []}'
+        else:
+            content = f"user messages seen: {sum(isinstance(m, HumanMessage) for m in messages)}"
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+def test_session_answers_are_not_shared():
+    """
+    The same follow-up in two sessions is answered from each session's own history
+    """
+    import main
+
+    agent = main.MedicalRoutingAgent(HistoryEchoChatModel(), BoundedMemorySaver())
+    main.components._instances["intelligent_medical_agent"] = agent
+    try:
+        main.answer_cache.clear()
+        follow_up = "And what about the ones over sixty?"
+        first = main.search_medical_query(follow_up, session_id="session-a")
+        assert first["response"] == "user messages seen: 1"
+
+        main.search_medical_query("Tell me about the heart patients in the records", session_id="session-b")
+        second = main.search_medical_query(follow_up, session_id="session-b")
+        assert second["response"] == "user messages seen: 2"
+        assert len(agent.memory.storage["session-session-b"]) == 1
+        state = agent.routing_agent.get_state(session_config("session-b")).values
+        assert [m.content for m in state["messages"] if isinstance(m, HumanMessage)][-1] == follow_up
+    finally:
+        main.components.reset("intelligent_medical_agent")
+        main.answer_cache.clear()
+
+class SlowHistoryEchoChatModel(HistoryEchoChatModel):
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(0.2)
+        return super()._generate(messages, stop, run_manager, **kwargs)
+
+def test_concurrent_follow_ups_are_not_coalesced():
+    """
+    The same follow-up sent at once from two sessions with history runs once per session thread
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    import main
+
+    agent = main.MedicalRoutingAgent(SlowHistoryEchoChatModel(), BoundedMemorySaver())
+    main.components._instances["intelligent_medical_agent"] = agent
+    try:
+        main.answer_cache.clear()
+        for session_id in ("session-c", "session-d"):
+            main.search_medical_query(f"Tell me about the heart patients in {session_id}", session_id=session_id)
+        query = "And what about the ones over seventy?"
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(lambda session_id: main.search_medical_query(query, session_id=session_id),
+                                    ["session-c", "session-d"]))
+        assert [result["coalesced"] for result in results] == [False, False]
+        assert [result["response"] for result in results] == ["user messages seen: 2"] * 2
+        for session_id in ("session-c", "session-d"):
+            state = agent.routing_agent.get_state(session_config(session_id)).values
+            assert [m.content for m in state["messages"] if isinstance(m, HumanMessage)][-1] == query
+    finally:
+        main.components.reset("intelligent_medical_agent")
+        main.answer_cache.clear()
+
+def test_first_turns_are_shared_and_recorded():
+    """
+    A session's first turn is history-free: it is coalesced and cached across sessions,
+    and written into each session's thread so follow-ups still see it
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    import main
+
+    agent = main.MedicalRoutingAgent(SlowHistoryEchoChatModel(), BoundedMemorySaver())
+    main.components._instances["intelligent_medical_agent"] = agent
+    try:
+        main.answer_cache.clear()
+        query = "How are the heart patients in the records doing?"
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(lambda session_id: main.search_medical_query(query, session_id=session_id),
+                                    ["session-e", "session-f"]))
+        assert sorted(result["coalesced"] for result in results) == [False, True]
+        assert main.search_medical_query(query, session_id="session-g")["cache"]["hit"]
+
+        for session_id in ("session-e", "session-f", "session-g"):
+            state = agent.routing_agent.get_state(session_config(session_id)).values
+            assert [m.content for m in state["messages"] if isinstance(m, HumanMessage)] == [query]
+            follow_up = main.search_medical_query("And the ones over seventy?", session_id=session_id)
+            assert follow_up["response"] == "user messages seen: 2" and "cache" not in follow_up
+    finally:
+        main.components.reset("intelligent_medical_agent")
+        main.answer_cache.clear()
+
+if __name__ == "__main__":
+    test_trim_history_keeps_whole_turns()
+    test_session_prompt_stays_flat()
+    test_idle_and_surplus_threads_are_evicted()
+    test_pruning_touches_only_the_current_thread()
+    test_stream_reports_only_this_turns_tool_calls()
+    test_session_answers_are_not_shared()
+    test_concurrent_follow_ups_are_not_coalesced()
+    test_first_turns_are_shared_and_recorded()
+    print("✅ Conversation memory tests passed")
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test Script for the Shared SQLite Engine
+========================================
+
+Checks that the read-only engine never writes to the database file (so the
+answer cache and column store signatures stay put) and that paths with URI
+special characters open correctly.
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy.exc import OperationalError
+
+from db_engine import database_signature, dispose_engines, get_engine
+
+def test_read_path_leaves_the_file_untouched():
+    """
+    Opening and querying the engine keeps the journal mode and the signature;
+    "?", "#" and "%" in the path are escaped in the URI
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_dir = os.path.join(tmp_dir, "extract #3 ?v=1 100%")
+        os.makedirs(db_dir)
+        db_file = os.path.join(db_dir, "PatientsDB.db")
+        conn = sqlite3.connect(db_file)
+        conn.execute("CREATE TABLE cancer_patients (age INTEGER)")
+        conn.executemany("INSERT INTO cancer_patients VALUES (?)", [(40,), (60,)])
+        conn.commit()
+        conn.close()
+
+        signature = database_signature(db_file)
+        try:
+            with get_engine(db_file).connect() as conn:
+                assert conn.exec_driver_sql("SELECT COUNT(*) FROM cancer_patients").scalar() == 2
+                try:
+                    conn.exec_driver_sql("DELETE FROM cancer_patients")
+                    assert False, "the engine must be read-only"
+                except OperationalError:
+                    pass
+        finally:
+            dispose_engines()
+
+        assert database_signature(db_file) == signature
+        conn = sqlite3.connect(db_file)
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+        conn.close()
+
+if __name__ == "__main__":
+    test_read_path_leaves_the_file_untouched()
+    print("✅ DB engine tests passed")
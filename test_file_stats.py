@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test Script for the File Statistics Service
+===========================================
+
+Checks column resolution across the Age/age spellings, the statistics, and
+that repeated questions are served from the cache until the file changes.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from file_stats import FileStatsService
+from snapshot import SNAPSHOT_DIR_NAME, snapshot_from_file
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+def test_age_column_in_every_extract():
+    """
+    "age" resolves to Age (cancer, diabetes) and age (heart disease)
+    """
+    service = FileStatsService()
+    for file_name in ("cancer_patients.csv", "diabetes_patients.csv", "heart_disease_patients.csv"):
+        path = os.path.join(DATA_DIR, file_name)
+        assert service.maximum(path, "age") == service.maximum(path, "AGE") > 0
+    assert service.resolve_column(os.path.join(DATA_DIR, "cancer_patients.csv"), "age") == "Age"
+
+def test_statistics_and_cache():
+    """
+    Statistics are computed from one read, which is reused until the file changes
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "patients.csv")
+        with open(path, "w") as f:
+            f.write("Name,Age,BMI\na,40,20.5\nb,60,\nc,50,30.5\nd,70,25.0\n")
+
+        service = FileStatsService()
+        stats = service.summary(path, "bmi", percentiles=(50,))
+        assert stats == {"count": 3, "min": 20.5, "max": 30.5, "mean": 25.333333333333332, "p50": 25.0}
+        assert service.percentile(path, "age", 50) == 55.0
+        assert service.mean(path, "Age") == 55.0
+        assert service.minimum(path, "age") == 40
+        assert service.cache_stats() == {"entries": 2, "hits": 2, "misses": 2}
+
+        with open(path, "a") as f:
+            f.write("e,90,22.0\n")
+        assert service.maximum(path, "age") == 90
+        assert service.cache_stats()["misses"] == 3
+
+        try:
+            service.maximum(path, "height")
+            assert False, "unknown column should raise"
+        except KeyError:
+            pass
+
+def test_tools_never_write_snapshots():
+    """
+    Without a snapshot only the column is parsed and nothing is written next to
+    the file; a snapshot written at ingest is read when present
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "patients.csv")
+        with open(path, "w") as f:
+            f.write("Name,Age\na,40\nb,60\n")
+
+        assert FileStatsService().maximum(path, "age") == 60
+        assert os.listdir(tmp_dir) == ["patients.csv"]
+
+        snapshot_from_file(path)
+        assert os.path.isdir(os.path.join(tmp_dir, SNAPSHOT_DIR_NAME))
+        assert FileStatsService().summary(path, "age", percentiles=()) == \
+            {"count": 2, "min": 40.0, "max": 60.0, "mean": 50.0}
+
+def test_maximum_age_of_an_empty_column():
+    """
+    get_maximum_age reports a column without numeric ages instead of failing on None
+    """
+    from main import get_maximum_age
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "cancer_patients.csv")
+        with open(path, "w") as f:
+            f.write("Age,Diagnosis\n,benign\nunknown,malignant\n")
+        try:
+            get_maximum_age.invoke({"file_path": path})
+            assert False, "an empty age column must raise"
+        except ValueError as e:
+            assert "No numeric age values in cancer_patients.csv" in str(e)
+
+        with open(path, "w") as f:
+            f.write("Age,Diagnosis\n61.0,benign\n,malignant\n")
+        assert get_maximum_age.invoke({"file_path": path}) == 61
+
+if __name__ == "__main__":
+    test_age_column_in_every_extract()
+    test_statistics_and_cache()
+    test_tools_never_write_snapshots()
+    test_maximum_age_of_an_empty_column()
+    print("✅ File statistics tests passed")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test Script for the Index Advisor
+=================================
+
+Checks index proposals from recorded queries and that the created indexes
+are used, on a tiny patient database, and that the query log is opt-in,
+buffered and rotated by size.
+"""
+
+import sys
+import os
+import json
+import sqlite3
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from index_advisor import IndexAdvisor, QueryLogWriter, install_query_recorder, load_query_log
+
+def _build_test_db(db_file: str):
+    conn = sqlite3.connect(db_file)
+    conn.execute("CREATE TABLE heart_disease_patients (age INTEGER, sex INTEGER, chol INTEGER, target INTEGER)")
+    conn.executemany("INSERT INTO heart_disease_patients VALUES (?, ?, ?, ?)",
+                     [(40 + i % 30, i % 2, 200 + i, i % 3 == 0) for i in range(200)])
+    conn.execute("CREATE INDEX idx_heart_disease_patients_sex ON heart_disease_patients (sex)")
+    conn.commit()
+    conn.close()
+
+def test_covering_index_columns():
+    """
+    Equality filters come first, then range filters, group-by and selected columns
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_file = os.path.join(tmp_dir, "PatientsDB.db")
+        _build_test_db(db_file)
+        advisor = IndexAdvisor(db_file)
+        columns = advisor.table_columns()
+
+        assert advisor.index_for(
+            "SELECT AVG(chol) FROM heart_disease_patients WHERE age > 50 AND target = 1", columns
+        ) == ("heart_disease_patients", ("target", "age", "chol"))
+        assert advisor.index_for(
+            'SELECT "Sex", COUNT(*) FROM heart_disease_patients GROUP BY "Sex"', columns
+        ) == ("heart_disease_patients", ("sex",))
+        # No filter, grouping or ordering: nothing to index
+        assert advisor.index_for("SELECT COUNT(*) FROM heart_disease_patients", columns) is None
+
+def test_propose_and_apply():
+    """
+    Proposals are ranked by use, skip existing indexes and are used once created
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_file = os.path.join(tmp_dir, "PatientsDB.db")
+        log_file = os.path.join(tmp_dir, "sql_queries.jsonl")
+        _build_test_db(db_file)
+        queries = ["SELECT COUNT(*) FROM heart_disease_patients WHERE target = 1 AND age > 60"] * 3 + \
+                  ["SELECT sex, COUNT(*) FROM heart_disease_patients GROUP BY sex"]
+        with open(log_file, "w") as f:
+            for sql in queries:
+                f.write(json.dumps({"ts": 0, "sql": sql, "seconds": 0.01, "ok": True}) + "\n")
+            f.write(json.dumps({"ts": 0, "sql": "SELECT broken", "seconds": 0.01, "ok": False}) + "\n")
+
+        assert load_query_log(log_file) == queries
+        advisor = IndexAdvisor(db_file)
+        proposals = advisor.propose(load_query_log(log_file))
+        # The GROUP BY sex query is already served by the existing index
+        assert [(p["columns"], p["hits"]) for p in proposals] == [(("target", "age"), 3)]
+
+        advisor.apply(proposals)
+        assert "COVERING INDEX idx_advisor_heart_disease_patients_target_age" in advisor.query_plan(queries[0])
+        assert advisor.propose(queries) == []
+
+def test_query_log_is_buffered_and_rotated():
+    """
+    Entries reach the file in batches, rotated files stay bounded and are still read
+    """
+    assert install_query_recorder(enabled=False) is False
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log_file = os.path.join(tmp_dir, "logs", "sql_queries.jsonl")
+        writer = QueryLogWriter(log_file, max_bytes=2000, backups=2, batch=10, flush_seconds=60)
+        entry = lambda i: {"ts": 0, "sql": f"SELECT {i} FROM cancer_patients", "seconds": 0.01, "ok": True}
+
+        for i in range(9):
+            writer.append(entry(i))
+        assert not os.path.exists(log_file)
+        writer.append(entry(9))
+        with open(log_file) as f:
+            assert len(f.readlines()) == 10
+
+        for i in range(10, 200):
+            writer.append(entry(i))
+        writer.flush()
+        assert sorted(os.listdir(os.path.dirname(log_file))) == \
+            ["sql_queries.jsonl", "sql_queries.jsonl.1", "sql_queries.jsonl.2"]
+        assert all(os.path.getsize(os.path.join(tmp_dir, "logs", name)) <= 2000
+                   for name in os.listdir(os.path.dirname(log_file)))
+        queries = load_query_log(log_file, backups=2)
+        assert queries[-1] == "SELECT 199 FROM cancer_patients"
+        assert queries == sorted(queries, key=lambda sql: int(sql.split()[1]))
+
+if __name__ == "__main__":
+    print("🗂️  Index Advisor Test Suite")
+    print("=" * 60)
+
+    for test in (test_covering_index_columns, test_propose_and_apply, test_query_log_is_buffered_and_rotated):
+        test()
+        print(f"✅ PASS: {test.__name__}")
+
+    print("\n✅ Test Suite Completed!")
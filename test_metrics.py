@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test Script for Latency and Token Metrics
+=========================================
+
+Checks the Prometheus text rendering, per-request traces of search stages,
+and that LLM and tool calls are timed and counted without passing callbacks.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.tools import tool
+
+from metrics import (LLM_CALLS, LLM_TOKENS, TOOL_SECONDS, MetricsRegistry, install_langchain_metrics,
+                     stage, start_trace)
+
+def test_histogram_render():
+    """
+    Cumulative buckets, +Inf, _sum and _count per label set
+    """
+    registry = MetricsRegistry()
+    histogram = registry.histogram("search_seconds", "Search latency", ("routing",), buckets=(0.1, 1.0))
+    counter = registry.counter("searches_total", "Searches", ("routing",))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value, routing="manual")
+    counter.inc(routing='say "hi"')
+
+    text = registry.render()
+    assert "# TYPE search_seconds histogram" in text
+    assert 'search_seconds_bucket{routing="manual",le="0.1"} 1' in text
+    assert 'search_seconds_bucket{routing="manual",le="1"} 2' in text
+    assert 'search_seconds_bucket{routing="manual",le="+Inf"} 3' in text
+    assert 'search_seconds_sum{routing="manual"} 5.55' in text
+    assert 'search_seconds_count{routing="manual"} 3' in text
+    assert 'searches_total{routing="say \\"hi\\""} 1' in text
+    assert histogram.count(routing="manual") == 3 and histogram.count(routing="fast") == 0
+
+def test_trace_collects_llm_tool_and_stage_spans():
+    """
+    Stages, LLM calls (with estimated tokens) and tool calls land in the current trace
+    """
+    install_langchain_metrics()
+
+    @tool
+    def cancer_query(question: str) -> str:
+        """Count cancer patients."""
+        return "42"
+
+    model = GenericFakeChatModel(messages=iter([AIMessage(content="Diabetes is a chronic disease.")]))
+    calls_before = LLM_CALLS.value(model="GenericFakeChatModel", status="success")
+    tokens_before = LLM_TOKENS.value(model="GenericFakeChatModel", type="completion")
+    tools_before = TOOL_SECONDS.count(tool="cancer_query", status="success")
+
+    trace = start_trace()
+    with stage("agent"):
+        model.invoke("What is diabetes?")
+        cancer_query.invoke({"question": "How many?"})
+    timings = trace.as_dict()
+
+    assert [span["kind"] for span in timings["spans"]] == ["stage", "llm", "tool"]
+    assert set(timings["totals"]) == {"stage:agent", "llm:GenericFakeChatModel", "tool:cancer_query"}
+    assert timings["llm_calls"] == 1 and timings["completion_tokens"] > 0
+    assert timings["spans"][1]["estimated_tokens"]
+    assert LLM_CALLS.value(model="GenericFakeChatModel", status="success") == calls_before + 1
+    assert LLM_TOKENS.value(model="GenericFakeChatModel", type="completion") > tokens_before
+    assert TOOL_SECONDS.count(tool="cancer_query", status="success") == tools_before + 1
+
+if __name__ == "__main__":
+    test_histogram_render()
+    test_trace_collects_llm_tool_and_stage_spans()
+    print("✅ Metrics tests passed")
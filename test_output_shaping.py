@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test Script for Tool Output Shaping
+===================================
+
+Checks row capping, compact CSV rendering, the token budget and the
+per-request tokens-saved report, without any LLM call.
+"""
+
+import sys
+import os
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import output_shaping
+from output_shaping import count_tokens, rows_to_csv, shape_tool_output, start_shaping_report, truncate_to_budget
+
+def test_row_dumps_become_capped_csv():
+    """
+    A SQLDatabase.run dump is re-rendered as CSV with a summary of the omitted rows
+    """
+    dump = str([{"age": age, "sex": age % 2, "chol": 200.0 + age} for age in range(30, 80)])
+    shaped = shape_tool_output("sql_db_query", dump, max_rows=3)
+    lines = shaped.splitlines()
+    assert lines[:4] == ["age,sex,chol", "30,0,230", "31,1,231", "32,0,232"]
+    assert lines[4].startswith("… 47 more rows (50 total); all rows: age: min=30, max=79, mean=54.5")
+    assert count_tokens(shaped) < count_tokens(dump)
+
+    assert rows_to_csv([(1, "a"), (2, None)]) == "1,a\n2,"
+
+def test_token_budget_and_small_outputs():
+    """
+    Long text is cut to the budget; short answers pass through unchanged
+    """
+    text = "\n".join(f"Patient {i} has a very long description of symptoms" for i in range(500))
+    shaped = truncate_to_budget(text, 100)
+    assert count_tokens(shaped) <= 120 and "[truncated" in shaped
+    assert shape_tool_output("cancer_query", "There are 1500 cancer patients.") == "There are 1500 cancer patients."
+    assert shape_tool_output("cancer_query", "[(1500,)]") == "1500"
+
+def test_report_counts_saved_tokens_per_request():
+    """
+    Shaping in worker threads started from the request context is reported once per request
+    """
+    import contextvars
+
+    report = start_shaping_report()
+    dump = str([(i, i * 2) for i in range(1_000)])
+    worker = threading.Thread(target=contextvars.copy_context().run,
+                              args=(shape_tool_output, "heart_disease_query", dump))
+    worker.start()
+    worker.join()
+    shape_tool_output("diabetes_query", "Average age is 33.2")
+
+    summary = report.as_dict()
+    assert summary["tool_outputs"] == 2
+    assert summary["tokens_before"] == count_tokens(dump) + count_tokens("Average age is 33.2")
+    assert summary["tokens_saved"] > 0.8 * count_tokens(dump)
+
+    # A new request starts from zero
+    assert start_shaping_report().as_dict()["tokens_saved"] == 0
+    assert output_shaping.TOOL_TOKEN_BUDGET > 0
+
+if __name__ == "__main__":
+    test_row_dumps_become_capped_csv()
+    test_token_budget_and_small_outputs()
+    test_report_counts_saved_tokens_per_request()
+    print("✅ Output shaping tests passed")
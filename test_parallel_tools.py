@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test Script for Parallel Tool Execution
+=======================================
+
+Checks that manually selected tools run concurrently, that results come back
+in selection order while on_result sees them as they finish, that tools
+missing the deadline are reported with status "timeout", and that the API
+rejects a non-boolean "parallel".
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import main
+
+class SleepingTool:
+    """
+    Tool stand-in that answers after a fixed delay
+    """
+
+    def __init__(self, name: str, delay: float):
+        self.description = f"{name} tool"
+        self.name = name
+        self.delay = delay
+
+    def invoke(self, query: str) -> str:
+        time.sleep(self.delay)
+        return f"{self.name}: {query}"
+
+def test_results_keep_selection_order():
+    """
+    The slowest tool is listed first; on_result sees completion order, the result list selection order
+    """
+    tools = [(name, SleepingTool(name, delay)) for name, delay in (("slow", 0.3), ("medium", 0.15), ("fast", 0.0))]
+    seen = []
+    start = time.perf_counter()
+    results = main._run_tools_parallel("question", tools, timeout=5, on_result=lambda item: seen.append(item["tool_name"]))
+    elapsed = time.perf_counter() - start
+
+    assert [result["tool_name"] for result in results] == ["slow", "medium", "fast"]
+    assert seen == ["fast", "medium", "slow"]
+    assert all(result["status"] == "success" for result in results)
+    assert results[0]["result"] == "slow: question" and results[0]["tool_description"] == "slow tool"
+    # Concurrent, so about the slowest tool rather than the sum
+    assert elapsed < 0.4
+
+def test_stragglers_are_reported_as_timeouts():
+    """
+    Tools that miss the deadline keep their slot with status "timeout"; the others succeed
+    """
+    tools = [(name, SleepingTool(name, delay)) for name, delay in (("stuck", 1.0), ("quick", 0.0))]
+    seen = []
+    start = time.perf_counter()
+    results = main._run_tools_parallel("question", tools, timeout=0.2, on_result=lambda item: seen.append(item["status"]))
+
+    assert time.perf_counter() - start < 0.6
+    assert [(result["tool_name"], result["status"]) for result in results] == [("stuck", "timeout"), ("quick", "success")]
+    assert results[0]["result"] == "Error: stuck did not finish within 0.2 seconds"
+    assert seen == ["success", "timeout"]
+
+def test_parallel_must_be_a_boolean():
+    """
+    The request parser rejects a non-boolean "parallel" like the other flags and defaults it to true
+    """
+    from app import parse_search_request
+
+    params, error = parse_search_request({"query": "diabetes", "tools": ["cancer_query"]})
+    assert error is None and params["parallel"] is True
+    params, error = parse_search_request({"query": "diabetes", "parallel": False})
+    assert error is None and params["parallel"] is False
+    for value in ("false", 0, None):
+        params, error = parse_search_request({"query": "diabetes", "parallel": value})
+        assert params is None and error == ({"error": "parallel must be true or false", "status": "error"}, 400)
+
+if __name__ == "__main__":
+    test_results_keep_selection_order()
+    test_stragglers_are_reported_as_timeouts()
+    test_parallel_must_be_a_boolean()
+    print("✅ Parallel tool tests passed")
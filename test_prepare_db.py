@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test Script for Building the Patient Database
+=============================================
+
+Runs PrepareSQLFromTabularData on small extracts in a temporary directory and
+checks that the table schema does not depend on cached snapshots, that
+streaming ingestion survives values its type sniffing did not see, and that
+appends and deleted source files are reconciled.
+"""
+
+import sys
+import os
+import importlib.util
+import sqlite3
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from snapshot import open_snapshot, snapshot_path_for
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def _load_prepare_module():
+    path = os.path.join(ROOT_DIR, "src", "1. Prepare_db.py")
+    spec = importlib.util.spec_from_file_location("prepare_db", path)
+    module = importlib.util.module_from_spec(spec)
+    # Registered so the process-pool worker function can be pickled by name
+    sys.modules["prepare_db"] = module
+    spec.loader.exec_module(module)
+    return module
+
+def _build(files_dir: str, force: bool = True, **kwargs) -> str:
+    """
+    Run the pipeline with the working directory in files_dir's parent; returns the DB path
+    """
+    prepare_db = _load_prepare_module()
+    work_dir = os.path.dirname(files_dir)
+    cwd = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        prepare_db.PrepareSQLFromTabularData(files_dir, **kwargs).run_pipeline(force=force)
+    finally:
+        os.chdir(cwd)
+    return os.path.join(work_dir, "databases", "PatientsDB.db")
+
+def _schema(db_file: str, table: str) -> tuple:
+    conn = sqlite3.connect(db_file)
+    try:
+        columns = conn.execute(f"PRAGMA table_info({table})").fetchall()
+        types = conn.execute(f"SELECT typeof(age), typeof(diagnosis) FROM {table}").fetchall()
+        return columns, types
+    finally:
+        conn.close()
+
+def test_schema_is_the_same_with_and_without_a_snapshot():
+    """
+    The first build writes the source snapshot; a rebuild with it present creates the same table
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        files_dir = os.path.join(tmp_dir, "files")
+        os.makedirs(files_dir)
+        source = os.path.join(files_dir, "cancer_patients.csv")
+        with open(source, "w") as f:
+            f.write("Age,Diagnosis\n40,benign\n61,\n75,malignant\n")
+
+        db_file = _build(files_dir)
+        without_snapshot = _schema(db_file, "cancer_patients")
+        snapshot = open_snapshot(source, build=False)
+        assert snapshot is not None and snapshot.column("age").dtype.name == "int8"
+        snapshot.close()
+
+        assert _schema(_build(files_dir), "cancer_patients") == without_snapshot
+        assert [column[2] for column in without_snapshot[0]] == ["BIGINT", "TEXT"]
+        assert without_snapshot[1][1] == ("integer", "null")
+
+def test_values_past_the_sniffed_rows_do_not_abort_ingestion():
+    """
+    Row 10001 breaks the integer type sniffed from the first 10000 rows
+    """
+    prepare_db = _load_prepare_module()
+    sniff_rows = prepare_db.INGEST_SNIFF_ROWS
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        files_dir = os.path.join(tmp_dir, "files")
+        os.makedirs(files_dir)
+        # Two extracts, so workers=2 takes the parallel parsing path
+        tables = ("heart_disease_patients", "cancer_patients")
+        for table in tables:
+            with open(os.path.join(files_dir, f"{table}.csv"), "w") as f:
+                f.write("age,chol,target\n")
+                for i in range(sniff_rows):
+                    f.write(f"{40 + i % 40},{200 + i % 50},{i % 2}\n")
+                f.write("unknown,210.5,\n")
+                f.write("55,,1\n")
+
+        for workers in (1, 2):
+            db_file = _build(files_dir, streaming=True, chunksize=4000, workers=workers)
+            conn = sqlite3.connect(db_file)
+            try:
+                for table in tables:
+                    assert conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] == sniff_rows + 2
+                    tail = conn.execute(f"SELECT age, chol, target FROM {table} LIMIT 2 OFFSET {sniff_rows}").fetchall()
+                    assert tail == [("unknown", 210.5, None), (55, None, 1)]
+            finally:
+                conn.close()
+
+def test_appends_and_deleted_sources_are_reconciled():
+    """
+    An append removes the stale snapshot; a deleted source loses its table and bookkeeping rows
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        files_dir = os.path.join(tmp_dir, "files")
+        os.makedirs(files_dir)
+        cancer = os.path.join(files_dir, "cancer_patients.csv")
+        diabetes = os.path.join(files_dir, "diabetes_patients.csv")
+        with open(cancer, "w") as f:
+            f.write("Age,Diagnosis\n40,benign\n61,malignant\n")
+        with open(diabetes, "w") as f:
+            f.write("Age,Outcome\n30,1\n")
+
+        db_file = _build(files_dir, force=False)
+        assert os.path.exists(snapshot_path_for(cancer))
+
+        with open(cancer, "a") as f:
+            f.write("75,malignant\n")
+        os.remove(diabetes)
+        _build(files_dir, force=False)
+
+        assert not os.path.exists(snapshot_path_for(cancer))
+        assert not os.path.exists(snapshot_path_for(diabetes))
+        conn = sqlite3.connect(db_file)
+        try:
+            assert conn.execute("SELECT COUNT(*) FROM cancer_patients").fetchone()[0] == 3
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            assert "diabetes_patients" not in tables
+            assert conn.execute("SELECT file_name FROM ingest_manifest").fetchall() == [("cancer_patients.csv",)]
+            for bookkeeping in ("stats_tables", "stats_columns", "schema_cache"):
+                assert conn.execute(f"SELECT COUNT(*) FROM {bookkeeping} WHERE table_name = 'diabetes_patients'"
+                                    ).fetchone()[0] == 0
+        finally:
+            conn.close()
+
+if __name__ == "__main__":
+    test_schema_is_the_same_with_and_without_a_snapshot()
+    test_values_past_the_sniffed_rows_do_not_abort_ingestion()
+    test_appends_and_deleted_sources_are_reconciled()
+    print("✅ Prepare database tests passed")
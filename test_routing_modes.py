@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test Script for the Fast and Full Routing Modes
+===============================================
+
+Checks that "fast" mode skips the LLM intent analysis for decisive
+single-sided keyword queries, and runs it for ambiguous ones and in "full" mode.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+import main
+from conversation_memory import BoundedMemorySaver
+
+class CountingChatModel(BaseChatModel):
+    """
+    Answers the intent analysis with "web" and everything else with a fixed answer, counting calls
+    """
+    calls: list = []
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    @property
+    def _llm_type(self) -> str:
+        return "counting-fake"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if "Analyze this medical query" in str(messages[-1].content):
+            self.calls.append("analysis")
+            content = '{"intent": "web", "confidence": 0.9, "reasoning": "fake", "recommended_tools": []}'
+        else:
+            self.calls.append("agent")
+            content = "answer"
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+def _route(query: str, routing_mode: str) -> tuple:
+    llm = CountingChatModel(calls=[])
+    agent = main.MedicalRoutingAgent(llm, BoundedMemorySaver())
+    result = agent.route_and_execute(query, routing_mode=routing_mode)
+    return result, llm.calls
+
+def test_decisive_queries_skip_the_analysis():
+    """
+    A single web or database keyword is enough for fast mode to skip the analysis
+    """
+    for query, intent in (("What are the symptoms of diabetes?", "web"),
+                          ("List the diabetes records", "database")):
+        result, calls = _route(query, "fast")
+        assert result["timing"]["analysis_skipped"], query
+        assert result["analysis"]["intent"] == intent
+        assert calls == ["agent"]
+
+def test_ambiguous_queries_and_full_mode_run_the_analysis():
+    """
+    Keywords on both sides (or none) and "full" mode pay for the LLM analysis
+    """
+    result, calls = _route("Symptoms and treatment of diabetes in our patients", "fast")
+    assert not result["timing"]["analysis_skipped"] and calls == ["analysis", "agent"]
+    result, calls = _route("Diabetes?", "fast")
+    assert not result["timing"]["analysis_skipped"] and calls == ["analysis", "agent"]
+    result, calls = _route("What are the symptoms of diabetes?", "full")
+    assert not result["timing"]["analysis_skipped"] and calls == ["analysis", "agent"]
+
+if __name__ == "__main__":
+    test_decisive_queries_skip_the_analysis()
+    test_ambiguous_queries_and_full_mode_run_the_analysis()
+    print("✅ Routing mode tests passed")
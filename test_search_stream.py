@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test Script for the Streaming Search Endpoint
+=============================================
+
+Checks the Server-Sent Event sequence of /api/search/stream: the routing
+decision first, then the agent's tool calls and results, the answer tokens
+and one final event; a cached repeat, a failed search and an invalid
+request.
+"""
+
+import sys
+import os
+import json
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+import main
+from app import app
+from conversation_memory import BoundedMemorySaver
+
+class MultiplyThenAnswerChatModel(BaseChatModel):
+    """
+    Calls `multiply` once, then answers with its result (routing analysis: "database")
+    """
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    @property
+    def _llm_type(self) -> str:
+        return "multiply-then-answer-fake"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        last = messages[-1]
+        if "Analyze this medical query" in str(last.content):
+            message = AIMessage(content='{"intent": "database", "confidence": 0.9, "reasoning": "fake", '
+                                        '"recommended_tools": []}')
+        elif isinstance(last, ToolMessage):
+            message = AIMessage(content=f"The product is {last.content}.")
+        else:
+            message = AIMessage(content="", tool_calls=[{"name": "multiply", "args": {"a": 6, "b": 7},
+                                                         "id": f"call_{time.perf_counter_ns()}"}])
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+class FailingChatModel(MultiplyThenAnswerChatModel):
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        raise RuntimeError("model unavailable")
+
+def _stream(client, payload: dict) -> list:
+    """
+    POST to /api/search/stream and decode the events as (event, data) pairs
+    """
+    response = client.post("/api/search/stream", json=payload)
+    assert response.status_code == 200 and response.mimetype == "text/event-stream"
+    events = []
+    for block in response.get_data(as_text=True).strip().split("\n\n"):
+        event_line, data_line = block.split("\n")
+        events.append((event_line[len("event: "):], json.loads(data_line[len("data: "):])))
+    return events
+
+def _with_agent(llm, check) -> None:
+    main.components._instances["intelligent_medical_agent"] = main.MedicalRoutingAgent(llm, BoundedMemorySaver())
+    main.answer_cache.clear()
+    try:
+        check(app.test_client())
+    finally:
+        main.components.reset("intelligent_medical_agent")
+        main.answer_cache.clear()
+
+def test_event_sequence():
+    """
+    routing → tool_call → tool_result → token(s) → final, then a cache hit replays routing → token → final
+    """
+    def check(client):
+        events = _stream(client, {"query": "Multiply 6 by 7 for the patients", "routing_mode": "full"})
+        names = [event for event, _ in events]
+        assert names[:3] == ["routing", "tool_call", "tool_result"] and names[-1] == "final"
+        assert set(names[3:-1]) == {"token"}
+        assert events[0][1]["intent"] == "database"
+        assert events[1][1] == {"name": "multiply", "args": {"a": 6, "b": 7}}
+        assert events[2][1]["name"] == "multiply" and events[2][1]["result"] == "42"
+        final = events[-1][1]
+        assert "".join(data["text"] for _, data in events[3:-1]) == final["response"] == "The product is 42."
+        assert final["tools_used"] == ["multiply"] and final["cache"] == {"hit": False}
+
+        repeat = _stream(client, {"query": "Multiply 6 by 7 for the patients", "routing_mode": "full"})
+        assert [event for event, _ in repeat] == ["routing", "token", "final"]
+        assert repeat[1][1]["text"] == "The product is 42." and repeat[-1][1]["cache"]["hit"]
+
+    _with_agent(MultiplyThenAnswerChatModel(), check)
+
+def test_failed_search_ends_with_a_final_error():
+    """
+    A search that fails still closes the stream with one final event carrying the error
+    """
+    def check(client):
+        events = _stream(client, {"query": "Multiply 6 by 7 for the patients", "routing_mode": "full"})
+        assert [event for event, _ in events][-1] == "final"
+        assert [event for event, _ in events].count("final") == 1
+        assert "model unavailable" in json.dumps(events[-1][1])
+
+    _with_agent(FailingChatModel(), check)
+
+def test_invalid_request_is_rejected_before_streaming():
+    """
+    Validation errors are plain JSON responses, not an event stream
+    """
+    response = app.test_client().post("/api/search/stream", json={"query": "  "})
+    assert response.status_code == 400 and response.get_json()["error"] == "Query cannot be empty"
+    response = app.test_client().get("/api/search/stream?query=diabetes&routing_mode=slow")
+    assert response.status_code == 400 and response.get_json()["valid_routing_modes"] == ["fast", "full"]
+
+if __name__ == "__main__":
+    test_event_sequence()
+    test_failed_search_ends_with_a_final_error()
+    test_invalid_request_is_rejected_before_streaming()
+    print("✅ Search stream tests passed")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test Script for Single-Flight Request Coalescing
+================================================
+
+Checks that concurrent identical calls share one execution (threads and
+coroutines), that each caller gets its own copy, and that errors propagate.
+"""
+
+import sys
+import os
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from single_flight import AsyncSingleFlight, SingleFlight
+
+def test_threads_share_one_execution():
+    """
+    Ten concurrent callers, one execution, independent result copies
+    """
+    flights = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def slow_search():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return {"response": "answer", "results": []}
+
+    def leader():
+        return flights.do("what is diabetes", slow_search)
+
+    def follower():
+        started.wait()
+        return flights.do("what is diabetes", slow_search)
+
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        futures = [pool.submit(leader)] + [pool.submit(follower) for _ in range(9)]
+        outcomes = [future.result() for future in futures]
+
+    assert len(calls) == 1
+    assert [shared for _, shared in outcomes].count(False) == 1
+    results = [result for result, _ in outcomes]
+    assert all(result == {"response": "answer", "results": []} for result in results)
+    results[0]["results"].append("mutated")
+    assert all(result["results"] == [] for result in results[1:])
+    assert flights.stats() == {"in_flight": 0, "leaders": 1, "shared": 9}
+
+    # Once finished, the next call runs again
+    flights.do("what is diabetes", slow_search)
+    assert len(calls) == 2
+
+def test_errors_reach_every_waiter():
+    """
+    A failing leader fails its waiters with the same exception
+    """
+    flights = SingleFlight()
+    started = threading.Event()
+
+    def failing_search():
+        started.set()
+        time.sleep(0.1)
+        raise RuntimeError("LLM unavailable")
+
+    def call(wait):
+        if wait:
+            started.wait()
+        try:
+            flights.do("q", failing_search)
+        except RuntimeError as e:
+            return str(e)
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        errors = list(pool.map(call, [False, True, True]))
+    assert errors == ["LLM unavailable"] * 3
+
+def test_coroutines_share_one_execution():
+    """
+    Concurrent coroutines share one task, which survives a cancelled caller
+    """
+    flights = AsyncSingleFlight()
+    calls = []
+
+    async def slow_search():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return {"response": "answer"}
+
+    async def run():
+        cancelled = asyncio.ensure_future(flights.do("q", slow_search))
+        await asyncio.sleep(0)
+        others = [asyncio.ensure_future(flights.do("q", slow_search)) for _ in range(4)]
+        cancelled.cancel()
+        return await asyncio.gather(*others)
+
+    outcomes = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(result == {"response": "answer"} and shared for result, shared in outcomes)
+    assert flights.stats() == {"in_flight": 0, "leaders": 1, "shared": 4}
+
+if __name__ == "__main__":
+    test_threads_share_one_execution()
+    test_errors_reach_every_waiter()
+    test_coroutines_share_one_execution()
+    print("✅ Single-flight tests passed")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test Script for the Streaming Sketches and Streaming EDA
+========================================================
+
+Checks that the mergeable sketches match exact statistics (within their
+error bounds) and that the streaming EDA agrees with pandas on a table that
+is profiled in several parallel rowid ranges.
+"""
+
+import sys
+import os
+import importlib.util
+import sqlite3
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from sketches import HyperLogLog, QuantileSketch, RunningStats
+
+def _load_eda_module():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "2. Eda_sqlite.py")
+    spec = importlib.util.spec_from_file_location("eda_sqlite", path)
+    module = importlib.util.module_from_spec(spec)
+    # Registered so the process-pool worker function can be pickled by name
+    sys.modules["eda_sqlite"] = module
+    spec.loader.exec_module(module)
+    return module
+
+def test_merged_sketches_match_exact_statistics():
+    """
+    Two halves sketched separately and merged agree with the whole data
+    """
+    rng = np.random.default_rng(0)
+    values = rng.normal(50, 10, 200_000)
+    labels = rng.integers(0, 5_000, 200_000)
+
+    stats, quantiles, distinct = RunningStats(), QuantileSketch(k=512, seed=0), HyperLogLog()
+    for half in (slice(0, 100_000), slice(100_000, None)):
+        part_stats, part_quantiles, part_distinct = RunningStats(), QuantileSketch(k=512, seed=1), HyperLogLog()
+        for start in range(half.start or 0, half.stop or values.size, 10_000):
+            part_stats.update(values[start:start + 10_000])
+            part_quantiles.update(values[start:start + 10_000])
+            part_distinct.update(labels[start:start + 10_000])
+        stats.merge(part_stats)
+        quantiles.merge(part_quantiles)
+        distinct.merge(part_distinct)
+
+    assert stats.count == values.size
+    assert np.isclose(stats.mean, values.mean()) and np.isclose(stats.std, values.std(ddof=1))
+    assert stats.min == values.min() and stats.max == values.max()
+    # Rank error well under 1% at k=512
+    for q, estimate in zip((0.1, 0.5, 0.9), quantiles.quantiles((0.1, 0.5, 0.9))):
+        assert abs((values < estimate).mean() - q) < 0.01
+    assert sum(level.size for level in quantiles.levels) < 512 * len(quantiles.levels)
+    assert abs(distinct.estimate() - np.unique(labels).size) / np.unique(labels).size < 0.03
+
+    small = HyperLogLog()
+    small.update(np.array([1, 2, 3, 1.0]))
+    assert small.estimate() == 3
+
+def test_streaming_eda_matches_pandas():
+    """
+    Chunked, range-parallel profiling gives the same statistics as describe()
+    """
+    eda_module = _load_eda_module()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_file = os.path.join(tmp_dir, "PatientsDB.db")
+        rng = np.random.default_rng(1)
+        df = pd.DataFrame({
+            "age": rng.integers(20, 80, 5_000).astype(float),
+            "diagnosis": rng.choice(["benign", "malignant"], 5_000),
+        })
+        df.loc[::10, "age"] = np.nan
+        conn = sqlite3.connect(db_file)
+        df.to_sql("cancer_patients", conn, index=False)
+        conn.close()
+
+        eda = eda_module.SQLiteEDA(db_file, use_snapshots=False)
+        stats = eda.profile_tables(["cancer_patients"], workers=2, chunk_rows=700, range_rows=1_000)["cancer_patients"]
+        age = df["age"]
+        assert stats["age"]["count"] == age.count() and stats["age"]["nulls"] == 500
+        assert np.isclose(stats["age"]["mean"], age.mean()) and np.isclose(stats["age"]["std"], age.std())
+        assert stats["age"]["min"] == age.min() and stats["age"]["max"] == age.max()
+        assert abs(stats["age"]["50%~"] - age.median()) <= 1
+        assert stats["age"]["distinct~"] == age.nunique()
+        assert stats["diagnosis"]["count"] == 5_000 and stats["diagnosis"]["distinct~"] == 2
+
+def test_mixed_text_column_is_profiled_the_same_in_every_range():
+    """
+    A TEXT column whose first rows look numeric stays text in every chunk and range
+    """
+    eda_module = _load_eda_module()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_file = os.path.join(tmp_dir, "PatientsDB.db")
+        conn = sqlite3.connect(db_file)
+        conn.execute("CREATE TABLE visits (code TEXT, score NUMERIC, note)")
+        rows = [(str(i % 50), i if i % 100 else "n/a", i) for i in range(1_000)]
+        rows += [(f"code-{i % 30}", i, None) for i in range(1_000)]
+        conn.executemany("INSERT INTO visits VALUES (?, ?, ?)", rows)
+        conn.commit()
+        conn.close()
+
+        eda = eda_module.SQLiteEDA(db_file, use_snapshots=False)
+        profiles = [eda.profile_tables(["visits"], chunk_rows=chunk_rows, range_rows=range_rows)["visits"]
+                    for chunk_rows, range_rows in ((100, 500), (2_000, 2_000))]
+        for stats in profiles:
+            assert stats["code"]["count"] == 2_000 and stats["code"]["distinct~"] == 80
+            assert pd.isna(stats["code"]["mean"])
+            assert stats["score"]["count"] == 2_000 and stats["score"]["max"] == 999
+            assert stats["note"]["nulls"] == 1_000 and stats["note"]["mean"] == 499.5
+        assert profiles[0].equals(profiles[1])
+
+if __name__ == "__main__":
+    test_merged_sketches_match_exact_statistics()
+    test_streaming_eda_matches_pandas()
+    test_mixed_text_column_is_profiled_the_same_in_every_range()
+    print("✅ Sketch and streaming EDA tests passed")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test Script for the Columnar Snapshot Format
+============================================
+
+Round-trips numeric, nullable and text columns through a snapshot file and
+checks zero-copy access, staleness detection and automatic rebuilds.
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from snapshot import MAGIC, BLOCK_ALIGNMENT, Snapshot, open_snapshot, snapshot_from_sqlite, write_snapshot
+
+def test_round_trip():
+    """
+    Typed, aligned blocks come back unchanged; text is dictionary-encoded
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "patients.snap")
+        write_snapshot(path, {
+            "age": np.array([40, 60, 50]),
+            "bmi": np.array([20.5, np.nan, 30.0]),
+            "diagnosis": np.array(["benign", None, "malignant"], dtype=object),
+        }, {"kind": "memory", "signature": None})
+
+        with open(path, "rb") as f:
+            assert f.read(len(MAGIC)) == MAGIC
+        snapshot = Snapshot(path)
+        assert snapshot.num_rows == 3 and snapshot.columns == ["age", "bmi", "diagnosis"]
+        assert all(entry["offset"] % BLOCK_ALIGNMENT == 0 for entry in snapshot.header["columns"])
+
+        ages = snapshot.column("Age")
+        assert ages.dtype == np.int8 and ages.tolist() == [40, 60, 50]
+        assert not ages.flags.owndata and not ages.flags.writeable
+        assert np.isnan(snapshot.column("bmi")[1])
+        assert snapshot.column("diagnosis").tolist() == ["benign", None, "malignant"]
+        assert snapshot.to_frame(["age", "diagnosis"]).shape == (3, 2)
+
+def test_file_snapshot_is_rebuilt_when_stale():
+    """
+    open_snapshot builds once, reuses the file, and rebuilds after the source changes
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source = os.path.join(tmp_dir, "patients.csv")
+        with open(source, "w") as f:
+            f.write("Age,Gender\n40,1\n60,0\n")
+        assert open_snapshot(source, build=False) is None
+
+        snapshot = open_snapshot(source)
+        assert snapshot.is_current() and snapshot.column("age").tolist() == [40, 60]
+        assert open_snapshot(source, build=False) is not None
+
+        with open(source, "a") as f:
+            f.write("70,1\n")
+        assert not snapshot.is_current()
+        assert open_snapshot(source).column("age").tolist() == [40, 60, 70]
+
+def test_sqlite_table_snapshot():
+    """
+    Table snapshots track the database signature
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_file = os.path.join(tmp_dir, "PatientsDB.db")
+        conn = sqlite3.connect(db_file)
+        conn.execute("CREATE TABLE cancer_patients (age INTEGER, gender INTEGER)")
+        conn.executemany("INSERT INTO cancer_patients VALUES (?, ?)", [(30, 0), (70, None)])
+        conn.commit()
+        conn.close()
+
+        snapshot = Snapshot(snapshot_from_sqlite(db_file, "cancer_patients", os.path.join(tmp_dir, "t.snap")))
+        assert snapshot.is_current()
+        assert snapshot.column("age").tolist() == [30, 70]
+        assert np.isnan(snapshot.column("gender")[1])
+
+        conn = sqlite3.connect(db_file)
+        conn.execute("DELETE FROM cancer_patients")
+        conn.commit()
+        conn.close()
+        os.utime(db_file, ns=(0, 0))
+        assert not snapshot.is_current()
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_file_snapshot_is_rebuilt_when_stale()
+    test_sqlite_table_snapshot()
+    print("✅ Snapshot tests passed")
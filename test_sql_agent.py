@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test Script for the Table-Restricted SQL Agents
+===============================================
+
+Checks that build_db_agent inlines the cached schema into the prompt and
+drops the list/schema tools when the schema_cache table has the table, and
+falls back to schema discovery for databases built without it.
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.prompts import ChatPromptTemplate
+
+import main
+
+TABLE_INFO = 'CREATE TABLE "cancer_patients" (age REAL, diagnosis TEXT)\n/*\n1 row from cancer_patients table:\nage\tdiagnosis\n54.0\tbenign\n*/'
+
+class ToolFreeChatModel(GenericFakeChatModel):
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+def _build_agent(db_file: str):
+    """
+    build_db_agent("cancer_patients") against db_file with a fake LLM
+    """
+    saved_db_path = main.db_path
+    main.db_path = db_file
+    main.components._instances["llm"] = ToolFreeChatModel(messages=iter([AIMessage(content="unused")]))
+    try:
+        return main.build_db_agent("cancer_patients")
+    finally:
+        main.db_path = saved_db_path
+        main.components.reset("llm")
+
+def _create_database(db_file: str, schema_cache: bool) -> None:
+    conn = sqlite3.connect(db_file)
+    conn.execute("CREATE TABLE cancer_patients (age REAL, diagnosis TEXT)")
+    conn.execute("INSERT INTO cancer_patients VALUES (54.0, 'benign')")
+    if schema_cache:
+        conn.execute("CREATE TABLE schema_cache (table_name TEXT PRIMARY KEY, table_info TEXT)")
+        conn.execute("INSERT INTO schema_cache VALUES (?, ?)", ("cancer_patients", TABLE_INFO))
+    conn.commit()
+    conn.close()
+
+def test_cached_schema_drops_the_discovery_tools():
+    """
+    With a schema_cache row the agent only gets the query tools and the schema is in its prompt
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_file = os.path.join(tmp_dir, "PatientsDB.db")
+        _create_database(db_file, schema_cache=True)
+        agent = _build_agent(db_file)
+
+        tool_names = {tool.name for tool in agent.tools}
+        assert "sql_db_query" in tool_names
+        assert not tool_names & {"sql_db_list_tables", "sql_db_schema"}
+        prompt = next(step for step in agent.agent.runnable.steps if isinstance(step, ChatPromptTemplate))
+        system = prompt.format_messages(input="How many patients?", agent_scratchpad=[])[0].content
+        assert "The only table is cancer_patients" in system and TABLE_INFO in system
+
+def test_without_schema_cache_the_agent_discovers_the_schema():
+    """
+    Databases built before the schema cache keep the list/schema tools
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_file = os.path.join(tmp_dir, "PatientsDB.db")
+        _create_database(db_file, schema_cache=False)
+        agent = _build_agent(db_file)
+
+        tool_names = {tool.name for tool in agent.tools}
+        assert {"sql_db_query", "sql_db_list_tables", "sql_db_schema"} <= tool_names
+
+if __name__ == "__main__":
+    test_cached_schema_drops_the_discovery_tools()
+    test_without_schema_cache_the_agent_discovers_the_schema()
+    print("✅ SQL agent tests passed")
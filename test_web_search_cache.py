@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test Script for the Web Search Cache
+====================================
+
+Checks that repeated web searches are served from memory and from the
+SQLite store across restarts, that keys include the search options, and
+that replay mode never calls the wrapped search tool.
+"""
+
+import sys
+import os
+import asyncio
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from langchain_core.tools import BaseTool, ToolException
+
+from web_search_cache import CachedWebSearchTool, WebSearchCache
+
+class CountingSearch(BaseTool):
+    """
+    Tavily-shaped search results that count how often the backend was called
+    """
+    name: str = "MedicalWebSearchTool"
+    description: str = "Use this tool for general medical knowledge (definitions, symptoms, cures)."
+    max_results: int = 5
+    topic: str = "general"
+    calls: int = 0
+
+    def _run(self, query: str, topic: str = None) -> dict:
+        self.calls += 1
+        return {"query": query, "results": [{"title": f"About {query}", "url": "https://example.org", "content": "..."}]}
+
+    async def _arun(self, query: str, topic: str = None) -> dict:
+        return self._run(query, topic)
+
+def test_memory_and_disk_hits():
+    """
+    Normalized repeats hit memory; a new process (new cache object) hits disk
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "web_search.db")
+        backend = CountingSearch()
+        tool = CachedWebSearchTool.wrap(backend, WebSearchCache(path=path))
+        assert tool.name == "MedicalWebSearchTool"
+
+        first = tool.invoke("What are the symptoms of diabetes?")
+        assert tool.invoke("what are the symptoms of diabetes") == first
+        assert asyncio.run(tool.ainvoke("What are the symptoms of diabetes?")) == first
+        assert backend.calls == 1
+        assert tool.invoke({"query": "What are the symptoms of diabetes?", "topic": "news"}) != {}
+        assert backend.calls == 2
+
+        restarted = CachedWebSearchTool.wrap(backend, WebSearchCache(path=path))
+        assert restarted.invoke("What are the symptoms of diabetes?") == first
+        assert backend.calls == 2
+        stats = restarted.cache.stats()
+        assert stats["disk_hits"] == 1 and stats["hit_rate"] == 1.0 and stats["mean_hit_ms"] is not None
+
+def test_ttl_expiry():
+    """
+    Expired entries are searched again
+    """
+    backend = CountingSearch()
+    tool = CachedWebSearchTool.wrap(backend, WebSearchCache(path="", ttl=0))
+    tool.invoke("what causes heart disease")
+    tool.invoke("what causes heart disease")
+    assert backend.calls == 2 and tool.cache.stats()["misses"] == 2
+
+def test_replay_mode_is_offline():
+    """
+    Replay serves recorded results regardless of age and fails on anything else
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "web_search.db")
+        CachedWebSearchTool.wrap(CountingSearch(), WebSearchCache(path=path)).invoke("how is cancer treated")
+
+        backend = CountingSearch()
+        replay = CachedWebSearchTool.wrap(backend, WebSearchCache(path=path, ttl=0, mode="replay"))
+        assert replay.invoke("How is cancer treated?")["results"]
+        try:
+            replay.invoke("what is asthma")
+            assert False, "replay mode must not search"
+        except ToolException:
+            pass
+        assert backend.calls == 0
+
+if __name__ == "__main__":
+    test_memory_and_disk_hits()
+    test_ttl_expiry()
+    test_replay_mode_is_offline()
+    print("✅ Web search cache tests passed")
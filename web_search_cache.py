@@ -0,0 +1,246 @@
+"""
+Web Search Cache
+================
+
+Caching wrapper around the Tavily web search tool. Definitions, symptoms and
+treatments of common conditions barely change, so repeated web-intent
+queries are served locally instead of making a remote call each time.
+
+- Keys are the normalized query text + max_results + topic (+ any other
+  search options the agent passed)
+- An in-memory LRU sits in front of a persistent SQLite store
+  (`WEB_SEARCH_CACHE`, default .cache/web_search.db; set it to "" to keep the
+  cache in memory only), so answers survive restarts
+- Entries expire after `WEB_SEARCH_CACHE_TTL` seconds (default 7 days)
+- `WEB_SEARCH_CACHE_MODE`:
+    live    serve from the cache, search and store on a miss (default)
+    replay  serve everything from the cache and never call Tavily, ignoring
+            TTLs; a miss is a tool error. Lets tests run offline against
+            results recorded in live mode
+    off     no caching
+- `stats()` reports hits (memory / disk), misses, hit rate and mean latency
+  of hits and misses
+"""
+
+import copy
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from langchain_core.tools import BaseTool, ToolException
+
+from answer_cache import normalize_query
+
+DEFAULT_WEB_SEARCH_CACHE = os.getenv(
+    "WEB_SEARCH_CACHE", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "web_search.db")
+)
+WEB_SEARCH_CACHE_TTL = float(os.getenv("WEB_SEARCH_CACHE_TTL", str(7 * 24 * 60 * 60)))
+WEB_SEARCH_CACHE_MODE = os.getenv("WEB_SEARCH_CACHE_MODE", "live").lower()
+
+CACHE_MODES = ("live", "replay", "off")
+
+# Name of the wrapped tool's runs, so callbacks can tell the remote search from the wrapper
+TAVILY_RUN_NAME = "tavily_search"
+
+
+class WebSearchCache:
+    """
+    Thread-safe LRU in front of an optional SQLite store, with hit/miss metrics.
+    """
+
+    def __init__(self, path: str = DEFAULT_WEB_SEARCH_CACHE, ttl: float = WEB_SEARCH_CACHE_TTL,
+                 max_entries: int = 512, mode: str = WEB_SEARCH_CACHE_MODE):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown web search cache mode '{mode}', expected one of {CACHE_MODES}")
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.mode = mode
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS web_search ("
+                "key TEXT PRIMARY KEY, query TEXT, response TEXT, created_at REAL)"
+            )
+            self._conn.commit()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._hit_seconds = 0.0
+        self._miss_seconds = 0.0
+
+    @staticmethod
+    def make_key(query: str, max_results: int, topic: str, options: dict = None) -> str:
+        """
+        Cache key from the normalized query, max_results, topic and other search options
+        """
+        options = {name: value for name, value in (options or {}).items() if value is not None}
+        return json.dumps([normalize_query(query), max_results, topic, options], sort_keys=True, default=str)
+
+    def _fresh(self, created_at: float) -> bool:
+        return self.mode == "replay" or time.time() - created_at < self.ttl
+
+    def _remember(self, key: str, value, created_at: float) -> None:
+        self._entries[key] = (value, created_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str):
+        """
+        The cached search response, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._fresh(entry[1]):
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return copy.deepcopy(entry[0])
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT response, created_at FROM web_search WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and self._fresh(row[1]):
+                    value = json.loads(row[0])
+                    self._remember(key, copy.deepcopy(value), row[1])
+                    self.disk_hits += 1
+                    return value
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+
+    def set(self, key: str, query: str, value) -> None:
+        now = time.time()
+        with self._lock:
+            self._remember(key, copy.deepcopy(value), now)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO web_search (key, query, response, created_at) VALUES (?, ?, ?, ?)",
+                    (key, query, json.dumps(value, default=str), now),
+                )
+                self._conn.commit()
+
+    def record_latency(self, seconds: float, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self._hit_seconds += seconds
+            else:
+                self._miss_seconds += seconds
+
+    def clear(self) -> None:
+        """
+        Drop every cached response, in memory and on disk
+        """
+        with self._lock:
+            self._entries.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM web_search")
+                self._conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            total = hits + self.misses
+            return {
+                "mode": self.mode,
+                "entries": len(self._entries),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / total if total else 0.0,
+                "mean_hit_ms": round(1000 * self._hit_seconds / hits, 3) if hits else None,
+                "mean_miss_ms": round(1000 * self._miss_seconds / self.misses, 3) if self.misses else None,
+            }
+
+
+class CachedWebSearchTool(BaseTool):
+    """
+    Web search tool that answers from a WebSearchCache before calling the wrapped tool.
+
+    Takes the wrapped tool's name, description and arguments, so agents see
+    the same tool. An optional rate limiter (a LangChain BaseRateLimiter) is
+    acquired before each call that reaches the wrapped tool; cache hits are
+    never throttled.
+    """
+
+    search_tool: BaseTool
+    cache: Any
+    rate_limiter: Any = None
+
+    @classmethod
+    def wrap(cls, search_tool: BaseTool, cache: WebSearchCache = None,
+             rate_limiter=None) -> "CachedWebSearchTool":
+        return cls(
+            name=search_tool.name,
+            description=search_tool.description,
+            args_schema=search_tool.args_schema or search_tool.get_input_schema(),
+            handle_tool_error=search_tool.handle_tool_error,
+            search_tool=search_tool,
+            cache=cache if cache is not None else WebSearchCache(),
+            rate_limiter=rate_limiter,
+        )
+
+    def _key(self, query: str, kwargs: dict) -> str:
+        options = dict(kwargs)
+        topic = options.pop("topic", None) or getattr(self.search_tool, "topic", None)
+        return self.cache.make_key(query, getattr(self.search_tool, "max_results", None), topic, options)
+
+    def _lookup(self, query: str, kwargs: dict) -> tuple:
+        """
+        (key, cached response or None); raises in replay mode when nothing is cached
+        """
+        key = self._key(query, kwargs)
+        cached = self.cache.get(key)
+        if cached is None and self.cache.mode == "replay":
+            raise ToolException(f"No cached web search results for '{query}' (replay mode)")
+        return key, cached
+
+    def _store(self, key: str, query: str, response) -> None:
+        # Only real result sets; errors and empty searches are retried next time
+        if isinstance(response, dict) and response.get("results") and "error" not in response:
+            self.cache.set(key, query, response)
+
+    def _search(self, query: str, kwargs: dict) -> Any:
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        return self.search_tool.invoke({"query": query, **kwargs}, {"run_name": TAVILY_RUN_NAME})
+
+    async def _asearch(self, query: str, kwargs: dict) -> Any:
+        if self.rate_limiter is not None:
+            await self.rate_limiter.aacquire()
+        return await self.search_tool.ainvoke({"query": query, **kwargs}, {"run_name": TAVILY_RUN_NAME})
+
+    def _run(self, query: str, **kwargs) -> Any:
+        if self.cache.mode == "off":
+            return self._search(query, kwargs)
+        start_time = time.perf_counter()
+        key, cached = self._lookup(query, kwargs)
+        if cached is None:
+            cached = self._search(query, kwargs)
+            self._store(key, query, cached)
+            self.cache.record_latency(time.perf_counter() - start_time, hit=False)
+        else:
+            self.cache.record_latency(time.perf_counter() - start_time, hit=True)
+        return cached
+
+    async def _arun(self, query: str, **kwargs) -> Any:
+        if self.cache.mode == "off":
+            return await self._asearch(query, kwargs)
+        start_time = time.perf_counter()
+        key, cached = self._lookup(query, kwargs)
+        if cached is None:
+            cached = await self._asearch(query, kwargs)
+            self._store(key, query, cached)
+            self.cache.record_latency(time.perf_counter() - start_time, hit=False)
+        else:
+            self.cache.record_latency(time.perf_counter() - start_time, hit=True)
+        return cached